@@ -0,0 +1,109 @@
+"""
+Role and ownership checks for SmartCater views.
+A caterer's profile id is looked up once and kept in the session, so
+ownership checks compare foreign key ids instead of loading profiles.
+"""
+
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.shortcuts import redirect
+from .models import CatererProfile
+
+
+PROFILE_SESSION_KEY = '_caterer_profile_id'
+
+# Role name -> User method that checks it
+ROLE_CHECKS = {
+    'customer': 'is_customer',
+    'caterer': 'is_caterer',
+    'admin': 'is_admin_user',
+}
+
+
+def has_role(user, role):
+    return user.is_authenticated and getattr(user, ROLE_CHECKS[role])()
+
+
+def _load_caterer_profile_id(request):
+    user = request.user
+    if not has_role(user, 'caterer'):
+        return None
+    
+    # Keyed by user, in case the session outlives an account switch
+    cached = request.session.get(PROFILE_SESSION_KEY)
+    if cached and cached[0] == user.pk:
+        return cached[1]
+    
+    profile_id = CatererProfile.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+    if profile_id is not None:
+        request.session[PROFILE_SESSION_KEY] = [user.pk, profile_id]
+    return profile_id
+
+
+def caterer_profile_id(request):
+    """
+    Return the signed-in caterer's profile id, or None.
+    Queries at most once per session.
+    """
+    if not hasattr(request, '_caterer_profile_id'):
+        request._caterer_profile_id = _load_caterer_profile_id(request)
+    return request._caterer_profile_id
+
+
+def owns(request, obj):
+    """True if obj's caterer foreign key is the signed-in caterer's profile."""
+    profile_id = caterer_profile_id(request)
+    return profile_id is not None and obj.caterer_id == profile_id
+
+
+def can_view_booking(request, booking):
+    """Admins, the booking's customer and its caterer may view a booking."""
+    user = request.user
+    return (
+        has_role(user, 'admin') or
+        (has_role(user, 'customer') and booking.customer_id == user.pk) or
+        owns(request, booking)
+    )
+
+
+def _refusal(request, role, message):
+    """Return the response refusing a request, or None to let the view run."""
+    if not request.user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    if not has_role(request.user, role):
+        messages.error(request, message)
+        return redirect('home')
+    if role == 'caterer':
+        request.caterer_profile_id = caterer_profile_id(request)
+        if request.caterer_profile_id is None:
+            messages.error(request, "Please complete your caterer profile first.")
+            return redirect('caterer_profile_edit')
+    return None
+
+
+def role_required(role, message="Access denied."):
+    """
+    Let signed-in users with role ('customer', 'caterer' or 'admin') into a
+    view; others are sent to login or home. Caterers must also have a
+    profile, whose id is then available as request.caterer_profile_id.
+    Works for sync and async views.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_view(request, *args, **kwargs):
+                refusal = await sync_to_async(_refusal)(request, role, message)
+                if refusal is not None:
+                    return refusal
+                return await view_func(request, *args, **kwargs)
+        else:
+            @wraps(view_func)
+            def _wrapped_view(request, *args, **kwargs):
+                refusal = _refusal(request, role, message)
+                if refusal is not None:
+                    return refusal
+                return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
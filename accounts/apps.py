@@ -0,0 +1,18 @@
+"""
+App Configuration for Accounts Application.
+Registers background tasks on startup.
+"""
+
+from django.apps import AppConfig
+
+
+class AccountsConfig(AppConfig):
+    """
+    Accounts App Config.
+    """
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'accounts'
+    
+    def ready(self):
+        # Register background tasks with the job queue
+        from . import tasks  # noqa: F401
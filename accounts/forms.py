@@ -4,9 +4,10 @@ Handles user registration, login, and profile editing.
 """
 
 from django import forms
-from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, UserChangeForm
+from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, UserChangeForm, PasswordResetForm
 from django.core.exceptions import ValidationError
 from .models import User, CatererProfile
+from .tasks import send_password_reset
 
 
 class UserRegistrationForm(UserCreationForm):
@@ -123,10 +124,47 @@ class CatererProfileForm(forms.ModelForm):
     
     class Meta:
         model = CatererProfile
-        fields = ('company_name', 'description', 'license_number', 'service_area')
+        fields = (
+            'company_name', 'description', 'license_number', 'service_area',
+            'latitude', 'longitude', 'service_radius_km',
+            'max_events_per_day', 'max_guests_per_day'
+        )
         widgets = {
             'company_name': forms.TextInput(attrs={'class': 'form-control'}),
             'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 4}),
             'license_number': forms.TextInput(attrs={'class': 'form-control'}),
             'service_area': forms.TextInput(attrs={'class': 'form-control'}),
+            'latitude': forms.NumberInput(attrs={'class': 'form-control', 'step': 'any'}),
+            'longitude': forms.NumberInput(attrs={'class': 'form-control', 'step': 'any'}),
+            'service_radius_km': forms.NumberInput(attrs={'class': 'form-control', 'min': '1'}),
+            'max_events_per_day': forms.NumberInput(attrs={'class': 'form-control', 'min': '1'}),
+            'max_guests_per_day': forms.NumberInput(attrs={'class': 'form-control', 'min': '1'}),
         }
+    
+    def clean(self):
+        """Require latitude and longitude together."""
+        cleaned_data = super().clean()
+        if (cleaned_data.get('latitude') is None) != (cleaned_data.get('longitude') is None):
+            raise ValidationError("Enter both latitude and longitude, or neither.")
+        return cleaned_data
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """
+    Password reset form that sends its email from the job queue.
+    Only the user, address and link settings are queued; the worker makes
+    the token and renders the message, so no reset link is stored.
+    """
+    
+    def send_mail(self, subject_template_name, email_template_name, context,
+                  from_email, to_email, html_email_template_name=None):
+        send_password_reset.enqueue(
+            user_id=context['user'].pk,
+            email=to_email,
+            domain=context['domain'],
+            site_name=context['site_name'],
+            use_https=context['protocol'] == 'https',
+            subject_template_name=subject_template_name,
+            email_template_name=email_template_name,
+            html_email_template_name=html_email_template_name
+        )
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_catererprofile_created_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='catererprofile',
+            index=models.Index(fields=['-total_bookings', 'is_verified'], name='caterer_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='catererprofile',
+            index=models.Index(fields=['-created_at', '-id'], name='caterer_created_idx'),
+        ),
+    ]
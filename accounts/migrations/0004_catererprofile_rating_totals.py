@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:34
+
+from django.db import migrations, models
+
+
+def backfill_rating_totals(apps, schema_editor):
+    """Populate rating_sum/rating_count (and rating) from existing reviews."""
+    from decimal import Decimal, ROUND_HALF_UP
+    from django.db.models import Count, Sum
+
+    CatererProfile = apps.get_model('accounts', 'CatererProfile')
+    Review = apps.get_model('catering', 'Review')
+
+    totals = Review.objects.values('caterer_id').annotate(total=Sum('rating'), count=Count('id')).order_by()
+    for row in totals:
+        rating = (Decimal(row['total']) / row['count']).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        CatererProfile.objects.filter(id=row['caterer_id']).update(
+            rating_sum=row['total'], rating_count=row['count'], rating=rating
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_catererprofile_indexes'),
+        ('catering', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catererprofile',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='catererprofile',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_totals, migrations.RunPython.noop),
+    ]
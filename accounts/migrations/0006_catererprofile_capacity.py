@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_profile_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catererprofile',
+            name='max_events_per_day',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum events per day. Leave empty for no limit.', null=True),
+        ),
+        migrations.AddField(
+            model_name='catererprofile',
+            name='max_guests_per_day',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum guests across all events per day. Leave empty for no limit.', null=True),
+        ),
+    ]
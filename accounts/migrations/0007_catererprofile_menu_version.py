@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_catererprofile_capacity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catererprofile',
+            name='menu_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
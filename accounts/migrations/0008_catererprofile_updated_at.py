@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_catererprofile_menu_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catererprofile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:55
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_catererprofile_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catererprofile',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='catererprofile',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddField(
+            model_name='catererprofile',
+            name='service_radius_km',
+            field=models.PositiveIntegerField(default=25, help_text='How far from your location you serve events, in km.', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(500)]),
+        ),
+    ]
@@ -4,6 +4,7 @@ Handles user profiles and role-based access control.
 """
 
 from django.contrib.auth.models import AbstractUser
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils import timezone
 
@@ -21,10 +22,15 @@ class User(AbstractUser):
         ('admin', 'Admin'),
     ]
     
+    # Loaded values kept so saves can tell what changed (rollups, images)
+    TRACKED_FIELDS = ('role', 'profile_image')
+    
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='customer')
     phone = models.CharField(max_length=15, blank=True, null=True)
     address = models.TextField(blank=True, null=True)
     profile_image = models.ImageField(upload_to='profile_images/', default='default.png', blank=True)
+    # Resized variants of profile_image, maintained by catering.images
+    profile_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -36,6 +42,25 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded role and profile image so saves can tell if they changed."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.TRACKED_FIELDS
+        }
+        return instance
+    
+    def remember_saved_values(self):
+        """Make the current tracked values the baseline for the next change."""
+        # Deferred fields would need a query, so they stay unknown. Keep the
+        # image's name: its FieldFile changes in place on profile_image.save()
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            name: getattr(getattr(self, name), 'name', getattr(self, name))
+            for name in self.TRACKED_FIELDS if name not in deferred
+        }
+    
     def is_customer(self):
         """Check if user is a customer."""
         return self.role == 'customer'
@@ -59,13 +84,54 @@ class CatererProfile(models.Model):
     description = models.TextField(blank=True)
     license_number = models.CharField(max_length=100, blank=True)
     service_area = models.CharField(max_length=200, blank=True)
+    # Base location and travel distance, indexed for radius search by catering.geo
+    latitude = models.FloatField(
+        null=True, 
+        blank=True, 
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude = models.FloatField(
+        null=True, 
+        blank=True, 
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    service_radius_km = models.PositiveIntegerField(
+        default=25, 
+        validators=[MinValueValidator(1), MaxValueValidator(500)],
+        help_text="How far from your location you serve events, in km."
+    )
     is_verified = models.BooleanField(default=False)
     rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
+    # Running totals behind rating, maintained by catering.ratings
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
     total_bookings = models.IntegerField(default=0)
+    # Bumped whenever a menu item changes; keys the cached menu (catering.cache)
+    menu_version = models.PositiveIntegerField(default=1)
+    # Daily capacity enforced by catering.availability; empty means unlimited
+    max_events_per_day = models.PositiveIntegerField(
+        null=True, 
+        blank=True, 
+        help_text="Maximum events per day. Leave empty for no limit."
+    )
+    max_guests_per_day = models.PositiveIntegerField(
+        null=True, 
+        blank=True, 
+        help_text="Maximum guests across all events per day. Leave empty for no limit."
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    # Only advances on save(); counters updated with F() expressions leave it alone
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name = 'Caterer Profile'
         verbose_name_plural = 'Caterer Profiles'
+        indexes = [
+            # home: featured caterers, read in total_bookings order until six verified match
+            models.Index(fields=['-total_bookings', 'is_verified'], name='caterer_featured_idx'),
+            # caterer_list: newest-first keyset pages
+            models.Index(fields=['-created_at', '-id'], name='caterer_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.company_name} - {self.user.username}"
@@ -0,0 +1,38 @@
+"""
+Background tasks for the Accounts Application.
+Run by `manage.py run_workers` like catering.tasks.
+"""
+
+from django.contrib.auth.forms import PasswordResetForm
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from catering.jobs import task
+from .models import User
+
+
+@task('accounts.send_password_reset')
+def send_password_reset(user_id, email, domain, site_name, use_https,
+                        subject_template_name, email_template_name, html_email_template_name=None):
+    """
+    Render and send a password reset email. The token is made here, so it
+    is never stored in the job payload.
+    """
+    user = User.objects.filter(id=user_id, email__iexact=email, is_active=True).first()
+    if user is None or not user.has_usable_password():
+        return
+    
+    context = {
+        'email': email,
+        'domain': domain,
+        'site_name': site_name,
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'user': user,
+        'token': default_token_generator.make_token(user),
+        'protocol': 'https' if use_https else 'http',
+    }
+    # Sends synchronously and raises on failure, so the job is retried
+    PasswordResetForm().send_mail(
+        subject_template_name, email_template_name, context, None, email,
+        html_email_template_name=html_email_template_name
+    )
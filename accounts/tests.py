@@ -0,0 +1,36 @@
+"""
+Tests for the Accounts Application.
+Run with `python manage.py test accounts`.
+"""
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from catering.jobs import run_job
+from catering.models import Job
+from .models import User
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class QueuedPasswordResetTests(TestCase):
+    
+    def setUp(self):
+        self.user = User.objects.create_user('reset_user', email='reset@example.com', password='old-password')
+    
+    def test_reset_link_is_made_by_the_worker(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/accounts/password-reset/', {'email': 'reset@example.com'})
+        
+        job = Job.objects.get(name='accounts.send_password_reset')
+        # The payload identifies the user; no token or rendered message is stored
+        self.assertEqual(job.payload['user_id'], self.user.pk)
+        self.assertNotIn('token', job.payload)
+        self.assertEqual(len(mail.outbox), 0)
+        
+        job.attempts = 1
+        self.assertTrue(run_job(job))
+        self.assertEqual(len(mail.outbox), 1)
+        link = next(word for word in mail.outbox[0].body.split() if '/password-reset-confirm/' in word)
+        response = self.client.get(link.split('testserver', 1)[1])
+        # A valid token redirects to the set-password form
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.url.endswith('/set-password/'))
@@ -6,6 +6,7 @@ Maps authentication URLs to views.
 from django.urls import path
 from django.contrib.auth import views as auth_views
 from . import views
+from .forms import QueuedPasswordResetForm
 
 urlpatterns = [
     # Authentication URLs
@@ -20,7 +21,10 @@ urlpatterns = [
     
     # Password Reset URLs
     path('password-reset/', 
-         auth_views.PasswordResetView.as_view(template_name='accounts/password_reset.html'),
+         auth_views.PasswordResetView.as_view(
+             template_name='accounts/password_reset.html',
+             form_class=QueuedPasswordResetForm
+         ),
          name='password_reset'),
     path('password-reset/done/',
          auth_views.PasswordResetDoneView.as_view(template_name='accounts/password_reset_done.html'),
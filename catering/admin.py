@@ -4,7 +4,11 @@ Registers models to Django admin panel.
 """
 
 from django.contrib import admin
-from .models import MenuCategory, MenuItem, Booking, BookingItem, Review
+from .models import (
+    MenuCategory, MenuItem, Booking, BookingItem, Review, SearchToken, CatererStats,
+    DailyBookingRollup, DailyUserRollup, CatererAvailability, CatererGeoCell, MenuFacetCount, Job,
+    DataVersion
+)
 
 
 @admin.register(MenuCategory)
@@ -63,3 +67,94 @@ class ReviewAdmin(admin.ModelAdmin):
     list_filter = ('rating', 'created_at')
     search_fields = ('customer__username', 'caterer__company_name', 'comment')
     raw_id_fields = ('booking', 'customer', 'caterer')
+
+
+@admin.register(SearchToken)
+class SearchTokenAdmin(admin.ModelAdmin):
+    """
+    Search Token Admin (read-only view of the search index).
+    """
+    list_display = ('token', 'field', 'caterer', 'weight')
+    list_filter = ('field',)
+    search_fields = ('token',)
+    raw_id_fields = ('caterer',)
+
+
+@admin.register(CatererStats)
+class CatererStatsAdmin(admin.ModelAdmin):
+    """
+    Caterer Stats Admin.
+    """
+    list_display = ('caterer', 'pending_count', 'confirmed_count', 'completed_count', 'cancelled_count', 'total_revenue', 'updated_at')
+    raw_id_fields = ('caterer',)
+    readonly_fields = ('updated_at',)
+
+
+@admin.register(DailyBookingRollup)
+class DailyBookingRollupAdmin(admin.ModelAdmin):
+    """
+    Daily Booking Rollup Admin.
+    """
+    list_display = ('day', 'caterer', 'status', 'booking_count', 'revenue')
+    list_filter = ('status',)
+    raw_id_fields = ('caterer',)
+    date_hierarchy = 'day'
+
+
+@admin.register(DailyUserRollup)
+class DailyUserRollupAdmin(admin.ModelAdmin):
+    """
+    Daily User Rollup Admin.
+    """
+    list_display = ('day', 'role', 'new_users')
+    list_filter = ('role',)
+    date_hierarchy = 'day'
+
+
+@admin.register(CatererAvailability)
+class CatererAvailabilityAdmin(admin.ModelAdmin):
+    """
+    Caterer Availability Admin.
+    """
+    list_display = ('caterer', 'day', 'event_count', 'guest_count')
+    raw_id_fields = ('caterer',)
+    date_hierarchy = 'day'
+
+
+@admin.register(CatererGeoCell)
+class CatererGeoCellAdmin(admin.ModelAdmin):
+    """
+    Caterer Geo Cell Admin.
+    """
+    list_display = ('caterer', 'cell_lat', 'cell_lng', 'latitude', 'longitude', 'service_radius_km')
+    raw_id_fields = ('caterer',)
+
+
+@admin.register(MenuFacetCount)
+class MenuFacetCountAdmin(admin.ModelAdmin):
+    """
+    Menu Facet Count Admin.
+    """
+    list_display = ('caterer', 'category_key', 'meal_type', 'dietary', 'price_bucket', 'item_count')
+    list_filter = ('meal_type', 'price_bucket')
+    raw_id_fields = ('caterer',)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """
+    Background Job Admin.
+    """
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_after', 'locked_by', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
+    readonly_fields = ('name', 'payload', 'created_at', 'started_at', 'finished_at', 'locked_by', 'last_error')
+
+
+@admin.register(DataVersion)
+class DataVersionAdmin(admin.ModelAdmin):
+    """
+    Data Version Admin.
+    """
+    list_display = ('name', 'version')
+    readonly_fields = ('name', 'version')
@@ -0,0 +1,26 @@
+"""
+App Configuration for Catering Application.
+Connects model signal handlers on startup.
+"""
+
+from django.apps import AppConfig
+
+
+class CateringConfig(AppConfig):
+    """
+    Catering App Config.
+    """
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'catering'
+    
+    def ready(self):
+        # Register signal handlers and background tasks
+        from . import signals, tasks  # noqa: F401
+        
+        # Expose cache counters and job queue stats on the metrics endpoint
+        from smartcater.metrics import register_collector
+        from .cache import home_cache_metrics, menu_cache_metrics
+        from .jobs import job_queue_metrics
+        register_collector(home_cache_metrics)
+        register_collector(menu_cache_metrics)
+        register_collector(job_queue_metrics)
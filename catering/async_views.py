@@ -0,0 +1,135 @@
+"""
+Async views for the Catering Application.
+Native async versions of the read-heavy views in views.py, served when
+CATERING_ASYNC_VIEWS is enabled (see smartcater/urls_async.py).
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.shortcuts import render
+from .models import Booking, Review
+from .cache import get_home_data, get_menu
+from .conditional import conditional_page, home_state, caterer_list_state, caterer_detail_state
+from .geo import DEFAULT_SEARCH_RADIUS_KM, SEARCH_RADIUS_CHOICES
+from .search import rank_caterer_search
+from .pagination import apaginate_queryset, apaginate_ranked
+from accounts.access import role_required
+from accounts.models import CatererProfile
+from smartcater.metrics import query_budget
+
+
+# Templates touch lazy relations and the session-backed user, so rendering
+# stays synchronous and runs in the thread-sensitive executor
+arender = sync_to_async(render)
+
+
+async def _alist(queryset):
+    """Evaluate a queryset from async code."""
+    return [obj async for obj in queryset]
+
+
+@query_budget(5)
+@conditional_page(home_state)
+async def home(request):
+    """
+    Home page view.
+    Displays featured caterers and welcome message.
+    """
+    context = await sync_to_async(get_home_data)(getattr(request, 'home_version', None))
+    
+    return await arender(request, 'catering/home.html', context)
+
+
+@query_budget(6)
+@conditional_page(caterer_list_state)
+async def caterer_list(request):
+    """
+    View to list all caterers.
+    Allows filtering by search and service area.
+    """
+    caterers = CatererProfile.objects.filter(
+        user__is_active=True
+    ).select_related('user')
+    
+    search_query = request.GET.get('search', '')
+    area_query = request.GET.get('area', '')
+    
+    # Ranked by relevance (or distance); distances only when searching near a point
+    scores, distances, point = await sync_to_async(rank_caterer_search)(request)
+    if scores is not None:
+        page = await apaginate_ranked(request, scores, caterers)
+    else:
+        page = await apaginate_queryset(request, caterers)
+    
+    if distances is not None:
+        for caterer in page:
+            caterer.distance_km = distances.get(caterer.id)
+    
+    context = {
+        'caterers': page,
+        'page': page,
+        'search_query': search_query,
+        'area_query': area_query,
+        'point': point,
+        'radius': point[2] if point else DEFAULT_SEARCH_RADIUS_KM,
+        'radius_choices': SEARCH_RADIUS_CHOICES,
+    }
+    
+    return await arender(request, 'catering/caterer_list.html', context)
+
+
+@query_budget(8)
+@conditional_page(caterer_detail_state)
+async def caterer_detail(request, caterer_id):
+    """
+    View to display caterer details and menu.
+    """
+    # ORM calls run one at a time on the thread-sensitive executor, so
+    # gathering them wouldn't overlap anything; look the profile up first
+    caterer = await CatererProfile.objects.select_related('user').filter(id=caterer_id).afirst()
+    if caterer is None:
+        raise Http404("No caterer matches the given query.")
+    reviews = await _alist(Review.objects.filter(caterer_id=caterer_id).select_related('customer')[:5])
+    
+    # Menu grouped by meal type, cached per caterer menu version
+    menu = await sync_to_async(get_menu)(caterer)
+    menu_by_meal = menu['by_meal']
+    
+    # Average rating is maintained on the profile as reviews change
+    avg_rating = caterer.rating if caterer.rating_count else None
+    
+    context = {
+        'caterer': caterer,
+        'menu_by_meal': menu_by_meal,
+        'reviews': reviews,
+        'avg_rating': avg_rating,
+    }
+    
+    return await arender(request, 'catering/caterer_detail.html', context)
+
+
+@query_budget(8)
+@role_required('customer')
+async def my_bookings(request):
+    """
+    View to display customer's bookings.
+    """
+    # role_required resolved the lazy user outside the event loop
+    bookings = Booking.objects.filter(
+        customer_id=request.user.pk
+    ).select_related('caterer', 'review').prefetch_related('items')
+    
+    # Filter by status
+    status_filter = request.GET.get('status')
+    if status_filter:
+        bookings = bookings.filter(status=status_filter)
+    
+    page = await apaginate_queryset(request, bookings)
+    
+    context = {
+        'bookings': page,
+        'page': page,
+        'status_filter': status_filter,
+    }
+    
+    return await arender(request, 'catering/my_bookings.html', context)
@@ -0,0 +1,189 @@
+"""
+Caterer availability calendar for the Catering Application.
+Keeps per-day event and guest totals for active bookings so capacity
+checks and month views read one row per day instead of counting bookings.
+"""
+
+import calendar
+from datetime import date
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, FilteredRelation, Q, Sum
+from django.utils import timezone
+from accounts.models import CatererProfile
+from .counters import increment
+from .models import Booking, CatererAvailability
+
+
+# Bookings in these statuses hold capacity on their event day
+ACTIVE_STATUSES = ('pending', 'confirmed', 'completed')
+
+
+def _booking_slot(values):
+    """Return (bucket key, guests) for booking values, or None if they hold no capacity."""
+    if values.get('status') not in ACTIVE_STATUSES:
+        return None
+    key = {'caterer_id': values['caterer_id'], 'day': values['event_date']}
+    return key, values['number_of_guests'] or 0
+
+
+def _current_values(booking):
+    return {
+        'caterer_id': booking.caterer_id,
+        'event_date': booking.event_date,
+        'status': booking.status,
+        'number_of_guests': booking.number_of_guests,
+    }
+
+
+def _loaded_values(booking):
+    """Values the booking had when loaded, or None if unknown."""
+    values = getattr(booking, '_loaded_values', None)
+    if values is None or not {'caterer_id', 'event_date', 'status', 'number_of_guests'} <= values.keys():
+        return None
+    return values
+
+
+def booking_saved(booking, created):
+    """Move a saved booking's capacity between calendar days."""
+    new = _booking_slot(_current_values(booking))
+    old = None
+    if not created:
+        values = _loaded_values(booking)
+        if values is None:
+            # Previous values unknown (deferred load); rebuild_availability repairs this
+            return
+        old = _booking_slot(values)
+    
+    if old == new:
+        return
+    if old is not None:
+        increment(CatererAvailability, old[0], event_count=-1, guest_count=-old[1], create=False)
+    if new is not None:
+        increment(CatererAvailability, new[0], event_count=1, guest_count=new[1])
+
+
+def booking_deleted(booking):
+    """Release a deleted booking's capacity."""
+    slot = _booking_slot(_loaded_values(booking) or _current_values(booking))
+    if slot is not None:
+        # Never create rows here: the caterer may be mid-cascade delete
+        increment(CatererAvailability, slot[0], event_count=-1, guest_count=-slot[1], create=False)
+
+
+def remaining_capacity(caterer, event_count, guest_count):
+    """Return (events left, guests left) for a day; None means unlimited."""
+    events = None
+    if caterer.max_events_per_day is not None:
+        events = max(0, caterer.max_events_per_day - event_count)
+    guests = None
+    if caterer.max_guests_per_day is not None:
+        guests = max(0, caterer.max_guests_per_day - guest_count)
+    return events, guests
+
+
+def reserve(caterer, day, guests):
+    """
+    Check that caterer can take an event of guests on day, locking the day.
+    Must run inside transaction.atomic() together with saving the booking,
+    so concurrent requests for the same day queue behind the row lock.
+    Raises ValidationError when the day is full.
+    """
+    if caterer.max_events_per_day is None and caterer.max_guests_per_day is None:
+        return
+    
+    # Make sure there is a row to lock, then lock it for the rest of the transaction
+    CatererAvailability.objects.get_or_create(caterer_id=caterer.id, day=day)
+    slot = CatererAvailability.objects.select_for_update().get(caterer_id=caterer.id, day=day)
+    
+    events_left, guests_left = remaining_capacity(caterer, slot.event_count, slot.guest_count)
+    if events_left == 0:
+        raise ValidationError(f"{caterer.company_name} is fully booked on {day:%B %d, %Y}.")
+    if guests_left is not None and guests > guests_left:
+        raise ValidationError(
+            f"{caterer.company_name} can only serve {guests_left} more guests on {day:%B %d, %Y}."
+        )
+
+
+def month_bounds(year, month):
+    """Return the first and last day of a month."""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def month_calendar(caterer_id, year, month):
+    """
+    Return a caterer's availability for every day of a month, or None if
+    the caterer doesn't exist. Capacity and usage are read in one query.
+    """
+    first, last = month_bounds(year, month)
+    rows = list(
+        CatererProfile.objects.filter(id=caterer_id).annotate(
+            month_days=FilteredRelation('availability', condition=Q(availability__day__range=(first, last)))
+        ).values(
+            'company_name', 'max_events_per_day', 'max_guests_per_day',
+            'month_days__day', 'month_days__event_count', 'month_days__guest_count'
+        )
+    )
+    if not rows:
+        return None
+    
+    caterer = CatererProfile(
+        id=caterer_id,
+        company_name=rows[0]['company_name'],
+        max_events_per_day=rows[0]['max_events_per_day'],
+        max_guests_per_day=rows[0]['max_guests_per_day'],
+    )
+    used = {
+        row['month_days__day']: (row['month_days__event_count'], row['month_days__guest_count'])
+        for row in rows if row['month_days__day'] is not None
+    }
+    
+    today = timezone.localdate()
+    days = []
+    for day_number in range(1, last.day + 1):
+        day = date(year, month, day_number)
+        event_count, guest_count = used.get(day, (0, 0))
+        events_left, guests_left = remaining_capacity(caterer, event_count, guest_count)
+        days.append({
+            'date': day.isoformat(),
+            'events': event_count,
+            'guests': guest_count,
+            'remaining_events': events_left,
+            'remaining_guests': guests_left,
+            'available': day >= today and events_left != 0 and guests_left != 0,
+        })
+    
+    return {
+        'caterer_id': caterer_id,
+        'month': f"{year:04d}-{month:02d}",
+        'max_events_per_day': caterer.max_events_per_day,
+        'max_guests_per_day': caterer.max_guests_per_day,
+        'days': days,
+    }
+
+
+@transaction.atomic
+def rebuild_availability():
+    """
+    Rebuild every calendar row from active bookings.
+    Returns the number of rows written.
+    """
+    CatererAvailability.objects.all().delete()
+    totals = (
+        Booking.objects
+        .filter(status__in=ACTIVE_STATUSES)
+        .values('caterer_id', 'event_date')
+        .annotate(events=Count('id'), guests=Sum('number_of_guests'))
+        .order_by()
+    )
+    rows = [
+        CatererAvailability(
+            caterer_id=row['caterer_id'],
+            day=row['event_date'],
+            event_count=row['events'],
+            guest_count=row['guests'] or 0,
+        )
+        for row in totals.iterator()
+    ]
+    CatererAvailability.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -0,0 +1,323 @@
+"""
+View benchmark runner for the Catering Application.
+Drives every URL in catering/urls.py and accounts/urls.py through the
+Django test client and reports latency percentiles and query counts,
+and compares per-request database work across session engines.
+"""
+
+import contextlib
+import io
+import statistics
+import time
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from accounts import urls as accounts_urls
+from accounts.models import User, CatererProfile
+from smartcater.db_router import get_replicas
+from . import urls as catering_urls
+from .models import MenuItem, Booking
+
+
+# Views that change data on GET or end the session; never benchmarked
+SKIPPED_VIEWS = {
+    'logout': 'ends the session',
+    'remove_booking_item': 'deletes on GET',
+    'confirm_booking': 'writes on GET',
+    'password_reset_confirm': 'needs a one-time token',
+}
+
+# Which user each view is requested as; unlisted views run anonymously
+VIEW_ROLES = {
+    'profile': 'customer',
+    'profile_edit': 'customer',
+    'caterer_profile_edit': 'caterer',
+    'create_booking': 'customer',
+    'select_menu': 'customer',
+    'select_menu_batch': 'customer',
+    'booking_confirmation': 'customer',
+    'my_bookings': 'customer',
+    'cancel_booking': 'customer',
+    'submit_review': 'customer',
+    'booking_detail': 'customer',
+    'caterer_dashboard': 'caterer',
+    'caterer_menu': 'caterer',
+    'add_menu_item': 'caterer',
+    'import_menu': 'caterer',
+    'export_menu': 'caterer',
+    'edit_menu_item': 'caterer',
+    'delete_menu_item': 'caterer',
+    'manage_categories': 'caterer',
+    'add_category': 'caterer',
+    'catering_bookings': 'caterer',
+    'export_bookings': 'caterer',
+    'update_booking_status': 'caterer',
+    'admin_dashboard': 'admin',
+    'admin_dashboard_trends': 'admin',
+}
+
+
+# Session engines that keep sessions in the django_session table
+DB_SESSION_ENGINES = {
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+}
+
+# Seconds to wait for read replicas to receive the benchmark clients' sessions
+REPLICA_WAIT_SECONDS = 10
+
+
+class BenchmarkError(Exception):
+    """Raised when the database lacks the data needed to benchmark."""
+
+
+def _sample_objects():
+    """
+    Pick a caterer with bookings and menu items, one of its customers, and an admin.
+    """
+    booking = Booking.objects.select_related('customer', 'caterer__user').filter(
+        caterer__menu_items__isnull=False
+    ).order_by('-id').first()
+    if booking is None:
+        raise BenchmarkError("No bookings found; run generate_synthetic_data first.")
+    
+    admin = User.objects.filter(is_superuser=True).first() or User.objects.filter(role='admin').first()
+    menu_item = MenuItem.objects.filter(caterer=booking.caterer).first()
+    
+    return {
+        'customer': booking.customer,
+        'caterer': booking.caterer.user,
+        'admin': admin,
+        'kwargs': {
+            'caterer_id': booking.caterer_id,
+            'booking_id': booking.id,
+            'item_id': menu_item.id,
+        },
+    }
+
+
+def _url_names():
+    """Return URL names from both app URLconfs, in declaration order."""
+    return [
+        pattern.name
+        for pattern in catering_urls.urlpatterns + accounts_urls.urlpatterns
+        if pattern.name
+    ]
+
+
+def _build_url(name, pattern_kwargs):
+    for pattern in catering_urls.urlpatterns + accounts_urls.urlpatterns:
+        if pattern.name == name:
+            converters = pattern.pattern.converters
+            return reverse(name, kwargs={key: pattern_kwargs[key] for key in converters})
+    raise KeyError(name)
+
+
+@contextlib.contextmanager
+def capture_queries():
+    """
+    Capture the queries run on every database alias, replicas included.
+    Yields a list that holds them once the block exits.
+    """
+    captured = []
+    with contextlib.ExitStack() as stack:
+        contexts = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+        yield captured
+    for context in contexts:
+        captured.extend(context.captured_queries)
+
+
+def _session_rows(alias, keys):
+    return dict(Session.objects.using(alias).filter(session_key__in=keys).values_list('session_key', 'session_data'))
+
+
+def sync_sessions(clients):
+    """
+    Make the clients' sessions readable, as the primary has them, on every
+    read replica. Otherwise signed-in GETs read a replica that doesn't have
+    the login yet and are redirected to the login page. SQLite stand-in
+    replicas are copied from the primary (see sync_replica); real replicas
+    are waited for.
+    """
+    replicas = get_replicas()
+    if not replicas or settings.SESSION_ENGINE not in DB_SESSION_ENGINES:
+        return
+    keys = [
+        client.cookies[settings.SESSION_COOKIE_NAME].value
+        for client in clients
+        if settings.SESSION_COOKIE_NAME in client.cookies
+    ]
+    expected = _session_rows(DEFAULT_DB_ALIAS, keys)
+    stale = [alias for alias in replicas if _session_rows(alias, keys) != expected]
+    if not stale:
+        return
+    if all(connections[alias].vendor == 'sqlite' for alias in replicas):
+        call_command('sync_replica', stdout=io.StringIO())
+        return
+    
+    deadline = time.monotonic() + REPLICA_WAIT_SECONDS
+    for alias in stale:
+        while _session_rows(alias, keys) != expected:
+            if time.monotonic() > deadline:
+                raise BenchmarkError(f"Sessions didn't reach replica '{alias}' within {REPLICA_WAIT_SECONDS} seconds.")
+            time.sleep(0.1)
+
+
+def percentile(samples, q):
+    """Return the q-th percentile (0-100) of samples by linear interpolation."""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def run_benchmark(iterations=20, warmup=2, only=None):
+    """
+    Benchmark each URL and return a JSON-serializable report.
+    Latencies are in milliseconds; query counts cover every database alias.
+    """
+    samples = _sample_objects()
+    clients = {'anonymous': Client(raise_request_exception=False)}
+    for role in ('customer', 'caterer', 'admin'):
+        client = Client(raise_request_exception=False)
+        if samples[role] is not None:
+            client.force_login(samples[role])
+        clients[role] = client
+    # Before any request: a session missing on the replica gets its cookie deleted
+    sync_sessions(clients.values())
+    
+    results = {}
+    for name in _url_names():
+        if only and name not in only:
+            continue
+        if name in SKIPPED_VIEWS:
+            results[name] = {'skipped': SKIPPED_VIEWS[name]}
+            continue
+        
+        role = VIEW_ROLES.get(name, 'anonymous')
+        if samples.get(role, True) is None:
+            results[name] = {'skipped': f'no {role} user'}
+            continue
+        
+        url = _build_url(name, samples['kwargs'])
+        client = clients[role]
+        for _ in range(warmup):
+            client.get(url)
+        # Logins and warmup session writes happened on the primary
+        sync_sessions(clients.values())
+        
+        latencies = []
+        queries = []
+        status_codes = set()
+        for _ in range(iterations):
+            with capture_queries() as captured:
+                start = time.perf_counter()
+                response = client.get(url)
+                latencies.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+            status_codes.add(response.status_code)
+        
+        results[name] = {
+            'url': url,
+            'role': role,
+            'status': sorted(status_codes),
+            'iterations': iterations,
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'mean_ms': round(statistics.mean(latencies), 3),
+            'queries': {
+                'min': min(queries),
+                'max': max(queries),
+                'mean': round(statistics.mean(queries), 2),
+            },
+        }
+    
+    return {
+        'database': connection.vendor,
+        'dataset': {
+            'caterers': CatererProfile.objects.count(),
+            'menu_items': MenuItem.objects.count(),
+            'bookings': Booking.objects.count(),
+        },
+        'views': results,
+    }
+
+
+# Authenticated views requested by the session benchmark
+SESSION_VIEWS = (
+    'my_bookings', 'booking_detail', 'profile',
+    'caterer_dashboard', 'caterer_menu', 'catering_bookings',
+)
+
+
+def _session_query_kind(sql):
+    """Return 'read' or 'write' for a query on the session table, else None."""
+    if 'django_session' not in sql:
+        return None
+    return 'read' if sql.lstrip().upper().startswith('SELECT') else 'write'
+
+
+def run_session_benchmark(engines, iterations=20, warmup=2, save_every_request=False):
+    """
+    Request SESSION_VIEWS as a signed-in customer and caterer under each
+    session engine ({name: dotted path}) and report database queries per
+    request, split into session table reads/writes and other queries.
+    Latencies are in milliseconds.
+    """
+    samples = _sample_objects()
+    results = {}
+    for name, engine in engines.items():
+        with override_settings(SESSION_ENGINE=engine, SESSION_SAVE_EVERY_REQUEST=save_every_request):
+            # Log in after switching engines, so the session lives in that store
+            clients = {}
+            for role in ('customer', 'caterer'):
+                client = Client(raise_request_exception=False)
+                client.force_login(samples[role])
+                clients[role] = client
+            sync_sessions(clients.values())
+            
+            latencies = []
+            counts = {'total': [], 'session_reads': [], 'session_writes': [], 'other': []}
+            for view in SESSION_VIEWS:
+                client = clients[VIEW_ROLES[view]]
+                url = _build_url(view, samples['kwargs'])
+                # Warmup also covers one-off session writes, e.g. caching the caterer profile id
+                for _ in range(warmup):
+                    client.get(url)
+                sync_sessions(clients.values())
+                for _ in range(iterations):
+                    with capture_queries() as captured:
+                        start = time.perf_counter()
+                        client.get(url)
+                        latencies.append((time.perf_counter() - start) * 1000)
+                    kinds = [_session_query_kind(query['sql']) for query in captured]
+                    counts['total'].append(len(kinds))
+                    counts['session_reads'].append(kinds.count('read'))
+                    counts['session_writes'].append(kinds.count('write'))
+                    counts['other'].append(kinds.count(None))
+        
+        results[name] = {
+            'engine': engine,
+            'requests': len(latencies),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'mean_ms': round(statistics.mean(latencies), 3),
+            # Mean queries per request; 'other' includes the savepoints around session writes
+            'queries': {key: round(statistics.mean(values), 2) for key, values in counts.items()},
+        }
+    
+    return {
+        'database': connection.vendor,
+        'session_cache': settings.CACHES[settings.SESSION_CACHE_ALIAS]['BACKEND'],
+        'save_every_request': save_every_request,
+        'views': list(SESSION_VIEWS),
+        'engines': results,
+    }
@@ -0,0 +1,191 @@
+"""
+Cache helpers for the Catering Application.
+Stores versioned home page data and per-caterer menus so repeat hits
+skip the database. Versions live in the database (DataVersion and
+CatererProfile.menu_version), so a bump reaches every process even with
+a per-process cache; hit/miss counters are per process, like the other
+in-process metrics.
+"""
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+from accounts.models import CatererProfile
+from .counters import increment
+from .models import DataVersion, MenuCategory, MenuItem, Booking
+
+
+HOME_VERSION = 'home'
+# Everything the caterer list shows or matches: profiles, caterer users,
+# ratings and the search and geo indexes
+CATERER_LIST_VERSION = 'caterer_list'
+HOME_DATA_KEY = 'home:data:{version}'
+HOME_HITS_KEY = 'home:hits'
+HOME_MISSES_KEY = 'home:misses'
+
+# Versioned entries are never overwritten, so a timeout only evicts stale versions
+HOME_DATA_TIMEOUT = 60 * 60 * 24
+
+MENU_DATA_KEY = 'menu:{caterer_id}:{version}'
+MENU_HITS_KEY = 'menu:hits'
+MENU_MISSES_KEY = 'menu:misses'
+MENU_DATA_TIMEOUT = 60 * 60 * 24
+
+
+def _incr(key, delta=1):
+    """Increment a cache counter, creating it if missing."""
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # Key was evicted between add() and incr()
+        cache.set(key, delta, timeout=None)
+        return delta
+
+
+def get_version(name):
+    """Return the stored version of a data group; 0 until first bumped."""
+    return DataVersion.objects.filter(name=name).values_list('version', flat=True).first() or 0
+
+
+def bump_version(name):
+    """Move a data group to a new version, with the current transaction."""
+    increment(DataVersion, {'name': name}, version=1)
+
+
+def get_home_version():
+    """Return the current home data version."""
+    return get_version(HOME_VERSION)
+
+
+def bump_home_version():
+    """Invalidate cached home data by moving to a new version."""
+    bump_version(HOME_VERSION)
+
+
+def get_caterer_list_version():
+    return get_version(CATERER_LIST_VERSION)
+
+
+def bump_caterer_list_version():
+    """Invalidate caterer list ETags."""
+    bump_version(CATERER_LIST_VERSION)
+
+
+def _build_home_data():
+    """
+    Run the home page queries and return evaluated results.
+    Reads the primary: a lagging replica could store pre-write data under
+    the new version, where it would stay until the next bump.
+    """
+    caterers = CatererProfile.objects.using(DEFAULT_DB_ALIAS)
+    featured_caterers = list(caterers.filter(is_verified=True).order_by('-total_bookings')[:6])
+    categories = list(MenuCategory.objects.using(DEFAULT_DB_ALIAS).filter(is_active=True))
+    
+    return {
+        'featured_caterers': featured_caterers,
+        'categories': categories,
+        'total_caterers': caterers.count(),
+        'total_bookings': Booking.objects.using(DEFAULT_DB_ALIAS).count(),
+    }
+
+
+def get_home_data(version=None):
+    """
+    Return featured caterers, active categories and platform counters.
+    Served from cache until a related model changes. Pass the home
+    version if it was already read for this request.
+    """
+    if version is None:
+        version = get_home_version()
+    key = HOME_DATA_KEY.format(version=version)
+    data = cache.get(key)
+    
+    if data is None:
+        _incr(HOME_MISSES_KEY)
+        data = _build_home_data()
+        cache.set(key, data, timeout=HOME_DATA_TIMEOUT)
+    else:
+        _incr(HOME_HITS_KEY)
+    
+    return data
+
+
+def get_home_cache_stats():
+    """Return hit/miss counters for the home data cache."""
+    hits = cache.get(HOME_HITS_KEY, 0)
+    misses = cache.get(HOME_MISSES_KEY, 0)
+    total = hits + misses
+    
+    return {
+        'version': get_home_version(),
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
+
+
+def home_cache_metrics():
+    """Metrics collector for smartcater.metrics."""
+    stats = get_home_cache_stats()
+    return [
+        ('smartcater_home_cache_hits_total', 'Home data cache hits.', 'counter', {None: stats['hits']}),
+        ('smartcater_home_cache_misses_total', 'Home data cache misses.', 'counter', {None: stats['misses']}),
+    ]
+
+
+def reset_home_cache_stats():
+    """Reset hit/miss counters."""
+    cache.delete_many([HOME_HITS_KEY, HOME_MISSES_KEY])
+
+
+def _build_menu(caterer_id):
+    """Load a caterer's available menu from the primary and group it by meal type."""
+    items = list(
+        MenuItem.objects.using(DEFAULT_DB_ALIAS).filter(
+            caterer_id=caterer_id,
+            is_available=True
+        ).select_related('category')
+    )
+    by_meal = {}
+    for item in items:
+        by_meal.setdefault(item.meal_type, []).append(item)
+    
+    return {
+        'items': items,
+        'by_meal': by_meal,
+    }
+
+
+def get_menu(caterer):
+    """
+    Return {'items': [...], 'by_meal': {meal_type: [...]}} for a caterer's
+    available menu items. Keyed by caterer.menu_version, so a warm cache
+    needs no menu queries and a bumped version is never served stale.
+    """
+    key = MENU_DATA_KEY.format(caterer_id=caterer.id, version=caterer.menu_version)
+    data = cache.get(key)
+    
+    if data is None:
+        _incr(MENU_MISSES_KEY)
+        data = _build_menu(caterer.id)
+        cache.set(key, data, timeout=MENU_DATA_TIMEOUT)
+    else:
+        _incr(MENU_HITS_KEY)
+    
+    return data
+
+
+def bump_menu_version(**filters):
+    """Invalidate cached menus of the caterers matching filters."""
+    return CatererProfile.objects.filter(**filters).update(menu_version=F('menu_version') + 1)
+
+
+def menu_cache_metrics():
+    """Metrics collector for smartcater.metrics."""
+    hits = cache.get(MENU_HITS_KEY, 0)
+    misses = cache.get(MENU_MISSES_KEY, 0)
+    return [
+        ('smartcater_menu_cache_hits_total', 'Caterer menu cache hits.', 'counter', {None: hits}),
+        ('smartcater_menu_cache_misses_total', 'Caterer menu cache misses.', 'counter', {None: misses}),
+    ]
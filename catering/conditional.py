@@ -0,0 +1,145 @@
+"""
+Conditional GET support for the Catering Application.
+Pages declare a cheap state function; when the client's ETag or
+Last-Modified still matches, a 304 is returned without running the view.
+"""
+
+import hashlib
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from accounts.models import CatererProfile
+from .cache import get_caterer_list_version, get_home_version
+from .models import MenuItem, Review
+
+
+def make_etag(*parts):
+    """Return a quoted ETag for a tuple of state values."""
+    return quote_etag(hashlib.sha256(repr(parts).encode()).hexdigest()[:32])
+
+
+def _latest(*values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def home_state(request):
+    """Home data is served from a versioned cache; its version is the state."""
+    # Kept on the request so the view doesn't read the version again
+    request.home_version = get_home_version()
+    return ('home', request.home_version), None
+
+
+def caterer_list_state(request):
+    """
+    The caterer list version, bumped by every change to what the cards show
+    or what searches match (including menu item names), is the state.
+    """
+    return ('caterer_list', get_caterer_list_version()), None
+
+
+def caterer_detail_state(request, caterer_id):
+    """Profile, menu and review state of one caterer in one query, or None if missing."""
+    state = CatererProfile.objects.filter(id=caterer_id).annotate(
+        menu_updated=Subquery(
+            MenuItem.objects.filter(caterer=OuterRef('pk')).order_by('-updated_at').values('updated_at')[:1]
+        ),
+        last_review=Subquery(
+            Review.objects.filter(caterer=OuterRef('pk')).order_by('-created_at').values('created_at')[:1]
+        ),
+    ).values(
+        'updated_at', 'user__updated_at', 'menu_version', 'menu_updated', 'last_review',
+        'rating_sum', 'rating_count', 'total_bookings'
+    ).first()
+    if state is None:
+        return None
+    last_modified = _latest(state['updated_at'], state['user__updated_at'], state['menu_updated'], state['last_review'])
+    return ('caterer_detail', caterer_id, *state.values()), last_modified
+
+
+def _validators(request, state_func, args, kwargs):
+    """
+    Return (etag, last-modified timestamp, public) for a request, or None to
+    always run the view. Pages for signed-in users get a per-user ETag and
+    no Last-Modified, so one user's copy never validates for another.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    # Pending messages are shown once, so the page must be rendered
+    if len(get_messages(request)):
+        return None
+    state = state_func(request, *args, **kwargs)
+    if state is None:
+        return None
+    
+    parts, last_modified = state
+    if request.user.is_authenticated:
+        return make_etag(request.user.pk, *parts), None, False
+    
+    if last_modified is not None:
+        if timezone.is_naive(last_modified):
+            last_modified = timezone.make_aware(last_modified)
+        last_modified = int(last_modified.timestamp())
+    return make_etag(*parts), last_modified, True
+
+
+def _not_modified(request, validators):
+    if validators is None:
+        return None
+    etag, last_modified, _ = validators
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def _finish(request, response, validators):
+    """Add validators and Cache-Control headers to a page response."""
+    if validators is not None and response.status_code in (200, 304):
+        etag, last_modified, public = validators
+        response.headers.setdefault('ETag', etag)
+        if last_modified is not None:
+            response.headers.setdefault('Last-Modified', http_date(last_modified))
+    else:
+        public = False
+    
+    if public:
+        # Shared caches may serve the page briefly, then revalidate with the ETag
+        patch_cache_control(
+            response, public=True, max_age=0, s_maxage=getattr(settings, 'CATERING_PUBLIC_CACHE_SECONDS', 60)
+        )
+        patch_vary_headers(response, ('Cookie',))
+    else:
+        # Browsers may keep signed-in pages, but must revalidate them every time
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_page(state_func):
+    """
+    Serve a page with conditional GET support.
+    state_func(request, *args, **kwargs) returns (state tuple, last modified
+    datetime or None), or None when the view should just run (e.g. a 404).
+    Works for sync and async views.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_view(request, *args, **kwargs):
+                validators = await sync_to_async(_validators)(request, state_func, args, kwargs)
+                response = _not_modified(request, validators)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return _finish(request, response, validators)
+        else:
+            @wraps(view_func)
+            def _wrapped_view(request, *args, **kwargs):
+                validators = _validators(request, state_func, args, kwargs)
+                response = _not_modified(request, validators)
+                if response is None:
+                    response = view_func(request, *args, **kwargs)
+                return _finish(request, response, validators)
+        return _wrapped_view
+    return decorator
@@ -0,0 +1,28 @@
+"""
+Counter rows for the Catering Application.
+Rollups, availability and facet counts all keep totals in rows keyed by a
+few columns and change them by delta.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+
+def increment(model, key, create=True, **deltas):
+    """
+    Add deltas to the row identified by key, creating it if needed.
+    Uses F() expressions so concurrent writers don't lose updates.
+    """
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+    
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    if model.objects.filter(**key).update(**updates) or not create:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **deltas)
+    except IntegrityError:
+        # Another writer created the row first
+        model.objects.filter(**key).update(**updates)
@@ -0,0 +1,112 @@
+"""
+Streaming CSV exports for the Catering Application.
+Rows are read in keyset batches and written straight to the response, so
+memory stays flat however many bookings match.
+"""
+
+import csv
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from .models import Booking, BookingItem
+from .pagination import iter_keyset
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Newest first; matches booking_caterer_created_idx when filtered by caterer
+EXPORT_ORDERING = ('-created_at', '-id')
+
+BOOKING_EXPORT_FIELDS = (
+    'booking_id', 'created_at', 'caterer', 'customer', 'customer_email',
+    'event_name', 'event_date', 'event_time', 'location', 'number_of_guests',
+    'status', 'total_amount', 'item', 'quantity', 'unit_price', 'subtotal'
+)
+
+# Spreadsheets run cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+    
+    def write(self, value):
+        return value
+
+
+def export_bookings_queryset(caterer_id=None, status=None, start=None, end=None):
+    """
+    Bookings to export, newest first, with their items prefetched.
+    Filters by caterer, status and an event date range; None means any.
+    """
+    bookings = Booking.objects.select_related('caterer', 'customer').only(
+        'id', 'created_at', 'event_name', 'event_date', 'event_time', 'location',
+        'number_of_guests', 'status', 'total_amount',
+        'caterer__company_name', 'customer__username', 'customer__email'
+    ).prefetch_related(
+        Prefetch(
+            'items',
+            queryset=BookingItem.objects.select_related('menu_item').only(
+                'booking_id', 'quantity', 'unit_price', 'subtotal', 'menu_item__name'
+            ).order_by('id')
+        )
+    )
+    if caterer_id is not None:
+        bookings = bookings.filter(caterer_id=caterer_id)
+    if status:
+        bookings = bookings.filter(status=status)
+    if start:
+        bookings = bookings.filter(event_date__gte=start)
+    if end:
+        bookings = bookings.filter(event_date__lte=end)
+    return bookings.order_by(*EXPORT_ORDERING)
+
+
+def csv_safe(value):
+    """
+    Prefix text that a spreadsheet would run as a formula with an apostrophe.
+    Names, locations and emails come from users; numbers are left alone.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_bookings_csv(bookings, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield CSV lines: a header, then one row per booking item.
+    Bookings without items get a single row with the item columns empty.
+    Bookings are read chunk_size at a time by keyset, not with iterator():
+    mysqlclient would buffer the whole result set. Items are prefetched per
+    chunk. Text cells are passed through csv_safe.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(BOOKING_EXPORT_FIELDS)
+    for booking in iter_keyset(bookings, EXPORT_ORDERING, chunk_size):
+        booking_values = [
+            booking.id,
+            booking.created_at.isoformat(),
+            csv_safe(booking.caterer.company_name),
+            csv_safe(booking.customer.username),
+            csv_safe(booking.customer.email),
+            csv_safe(booking.event_name),
+            booking.event_date.isoformat(),
+            booking.event_time.isoformat(),
+            csv_safe(booking.location),
+            booking.number_of_guests,
+            booking.status,
+            booking.total_amount,
+        ]
+        items = booking.items.all()
+        if not items:
+            yield writer.writerow(booking_values + ['', '', '', ''])
+        for item in items:
+            yield writer.writerow(
+                booking_values + [csv_safe(item.menu_item.name), item.quantity, item.unit_price, item.subtotal]
+            )
+
+
+def bookings_export_response(bookings, filename):
+    """Return a StreamingHttpResponse with bookings as a CSV attachment."""
+    response = StreamingHttpResponse(iter_bookings_csv(bookings), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
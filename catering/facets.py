@@ -0,0 +1,313 @@
+"""
+Faceted dish search for the Catering Application.
+MenuFacetCount keeps per-caterer counts of available items by category,
+meal type, dietary flags and price bucket, so facet counts are summed from
+counter rows instead of scanning MenuItem.
+"""
+
+from collections import Counter
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from .counters import increment
+from .models import MenuCategory, MenuFacetCount, MenuItem
+from .search import search_caterers, tokenize
+
+
+# (query parameter, MenuItem field, bit in MenuFacetCount.dietary, label)
+DIETARY_FLAGS = (
+    ('vegetarian', 'is_vegetarian', 1, 'Vegetarian'),
+    ('vegan', 'is_vegan', 2, 'Vegan'),
+    ('gluten_free', 'is_gluten_free', 4, 'Gluten Free'),
+)
+
+# (lower bound, upper bound) of each price bucket; the last is open-ended
+PRICE_BUCKETS = ((0, 10), (10, 25), (25, 50), (50, 100), (100, None))
+
+# Counter key columns besides the caterer
+COMBINATION_FIELDS = ('category_key', 'meal_type', 'dietary', 'price_bucket')
+
+# MenuItem fields the counter key is derived from
+KEY_FIELDS = {
+    'caterer_id', 'category_id', 'meal_type', 'is_available',
+    'is_vegetarian', 'is_vegan', 'is_gluten_free', 'price'
+}
+
+
+def price_bucket(price):
+    """Return the PRICE_BUCKETS index of a price."""
+    for index, (low, high) in enumerate(PRICE_BUCKETS):
+        if high is None or price < high:
+            return index
+
+
+def price_label(index):
+    low, high = PRICE_BUCKETS[index]
+    if high is None:
+        return f"${low}+"
+    if not low:
+        return f"Under ${high}"
+    return f"${low}-${high}"
+
+
+def dietary_mask(values):
+    """Return the dietary bit mask of item values."""
+    return sum(bit for _, field, bit, _ in DIETARY_FLAGS if values.get(field))
+
+
+def _facet_key(values):
+    """Return the counter key for item values, or None if the item isn't counted."""
+    if not values.get('is_available'):
+        return None
+    return {
+        'caterer_id': values['caterer_id'],
+        'category_key': values['category_id'] or 0,
+        'meal_type': values['meal_type'],
+        'dietary': dietary_mask(values),
+        'price_bucket': price_bucket(values['price']),
+    }
+
+
+def _current_values(item):
+    return {field: getattr(item, field) for field in KEY_FIELDS}
+
+
+def _loaded_values(item):
+    """Values the item had when loaded, or None if unknown."""
+    values = getattr(item, '_loaded_values', None)
+    if values is None or not KEY_FIELDS <= values.keys():
+        return None
+    return values
+
+
+def menu_item_saved(item, created):
+    """Move a saved item between facet counters."""
+    new = _facet_key(_current_values(item))
+    old = None
+    if not created:
+        values = _loaded_values(item)
+        if values is None:
+            # Previous values unknown (deferred load); rebuild_facets repairs this
+            return
+        old = _facet_key(values)
+    
+    if old == new:
+        return
+    if old is not None:
+        increment(MenuFacetCount, old, item_count=-1, create=False)
+    if new is not None:
+        increment(MenuFacetCount, new, item_count=1)
+
+
+def menu_item_deleted(item):
+    """Remove a deleted item from its facet counter."""
+    key = _facet_key(_loaded_values(item) or _current_values(item))
+    if key is not None:
+        # Never create rows here: the caterer may be mid-cascade delete
+        increment(MenuFacetCount, key, item_count=-1, create=False)
+
+
+def category_deleted(category):
+    """Move a category's counts to uncategorized; its items are about to be set to NULL."""
+    counters = MenuFacetCount.objects.filter(category_key=category.id)
+    for counter in counters:
+        key = {
+            'caterer_id': counter.caterer_id,
+            'category_key': 0,
+            'meal_type': counter.meal_type,
+            'dietary': counter.dietary,
+            'price_bucket': counter.price_bucket,
+        }
+        increment(MenuFacetCount, key, item_count=counter.item_count)
+    counters.delete()
+
+
+def _combinations(items, *fields):
+    """Group items by facet combination (plus fields), with item_count per group."""
+    dietary = Value(0)
+    for _, field, bit, _ in DIETARY_FLAGS:
+        dietary = dietary + Case(When(**{field: True}, then=Value(bit)), default=Value(0))
+    bucket = Case(
+        *[
+            When(price__lt=high, then=Value(index))
+            for index, (_, high) in enumerate(PRICE_BUCKETS)
+            if high is not None
+        ],
+        default=Value(len(PRICE_BUCKETS) - 1),
+        output_field=IntegerField()
+    )
+    return items.annotate(
+        category_key=Coalesce('category_id', 0),
+        dietary=dietary,
+        price_bucket=bucket,
+    ).values(*fields, *COMBINATION_FIELDS).annotate(item_count=Count('id')).order_by()
+
+
+@transaction.atomic
+def rebuild_facets(caterer_id=None, batch_size=1000):
+    """
+    Rebuild the facet counters of one caterer, or of every caterer.
+    Returns the number of counter rows written.
+    """
+    counters = MenuFacetCount.objects.all()
+    items = MenuItem.objects.filter(is_available=True)
+    if caterer_id is not None:
+        counters = counters.filter(caterer_id=caterer_id)
+        items = items.filter(caterer_id=caterer_id)
+    
+    counters.delete()
+    rows = [MenuFacetCount(**row) for row in _combinations(items, 'caterer_id').iterator()]
+    MenuFacetCount.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def _optional_int(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError(f"{name} must be a number.")
+
+
+class DishSearch:
+    """
+    A dish search across all caterers, parsed from query parameters:
+    q, caterer, category (0 for uncategorized), meal_type, price (bucket
+    index) and vegetarian/vegan/gluten_free=1. Raises ValidationError
+    for invalid values.
+    """
+    
+    def __init__(self, params):
+        self.query = params.get('q', '').strip()
+        self.terms = list(dict.fromkeys(tokenize(self.query)))
+        self.caterer = _optional_int(params, 'caterer')
+        self.category = _optional_int(params, 'category')
+        self.price = _optional_int(params, 'price')
+        if self.price is not None and not 0 <= self.price < len(PRICE_BUCKETS):
+            raise ValidationError(f"price must be a bucket between 0 and {len(PRICE_BUCKETS) - 1}.")
+        self.meal_type = params.get('meal_type') or None
+        if self.meal_type is not None and self.meal_type not in dict(MenuItem.MEAL_TYPE_CHOICES):
+            raise ValidationError(f"Unknown meal_type '{self.meal_type}'.")
+        self.dietary = sum(
+            bit for name, _, bit, _ in DIETARY_FLAGS
+            if params.get(name, '').lower() in ('1', 'true', 'yes', 'on')
+        )
+        self._scope = None
+    
+    def scope(self):
+        """Q for available items of active caterers matching caterer and text."""
+        if self._scope is not None:
+            return self._scope
+        
+        scope = Q(is_available=True, caterer__user__is_active=True)
+        if self.caterer is not None:
+            scope &= Q(caterer_id=self.caterer)
+        if self.terms:
+            # The search index narrows the scan to caterers with matching dishes
+            caterer_ids = [caterer_id for caterer_id, _ in search_caterers(self.query, fields=['menu_item'])]
+            scope &= Q(caterer_id__in=caterer_ids)
+            for term in self.terms:
+                scope &= Q(name__icontains=term)
+        self._scope = scope
+        return scope
+    
+    def _filter(self):
+        condition = Q()
+        if self.category is not None:
+            condition &= Q(category__isnull=True) if self.category == 0 else Q(category_id=self.category)
+        if self.meal_type is not None:
+            condition &= Q(meal_type=self.meal_type)
+        if self.price is not None:
+            low, high = PRICE_BUCKETS[self.price]
+            condition &= Q(price__gte=low)
+            if high is not None:
+                condition &= Q(price__lt=high)
+        for _, field, bit, _ in DIETARY_FLAGS:
+            if self.dietary & bit:
+                condition &= Q(**{field: True})
+        return condition
+    
+    def items(self):
+        """Matching menu items with their caterer and category."""
+        return MenuItem.objects.filter(self.scope() & self._filter()).select_related('caterer', 'category')
+    
+    def _combinations(self):
+        """Item counts per facet combination within the search scope."""
+        if self.terms:
+            # Text matches aren't in the counters; group the matching items instead
+            return _combinations(MenuItem.objects.filter(self.scope()))
+        counters = MenuFacetCount.objects.filter(caterer__user__is_active=True, item_count__gt=0)
+        if self.caterer is not None:
+            counters = counters.filter(caterer_id=self.caterer)
+        return counters.values(*COMBINATION_FIELDS).annotate(item_count=Sum('item_count')).order_by()
+    
+    def _misses(self, row):
+        """Return the facets whose filter a combination doesn't match."""
+        misses = []
+        if self.category is not None and row['category_key'] != self.category:
+            misses.append('category')
+        if self.meal_type is not None and row['meal_type'] != self.meal_type:
+            misses.append('meal_type')
+        if self.price is not None and row['price_bucket'] != self.price:
+            misses.append('price')
+        if row['dietary'] & self.dietary != self.dietary:
+            misses.append('dietary')
+        return misses
+    
+    def facets(self):
+        """
+        Return (matching item count, facets). Category, meal type and price
+        are counted with every filter except their own, so each value shows
+        how many items choosing it would give; dietary flags narrow the
+        current results.
+        """
+        total = 0
+        counts = {facet: Counter() for facet in ('category', 'meal_type', 'price', 'dietary')}
+        for row in self._combinations():
+            misses = self._misses(row)
+            if len(misses) > 1:
+                continue
+            count = row['item_count']
+            if not misses:
+                total += count
+                for name, _, bit, _ in DIETARY_FLAGS:
+                    if row['dietary'] & bit:
+                        counts['dietary'][name] += count
+            for facet, value in (
+                ('category', row['category_key']),
+                ('meal_type', row['meal_type']),
+                ('price', row['price_bucket']),
+            ):
+                if not misses or misses == [facet]:
+                    counts[facet][value] += count
+        return total, self._labelled(counts)
+    
+    def _labelled(self, counts):
+        """Turn facet counters into lists of {value, label, count}."""
+        category_names = dict(
+            MenuCategory.objects.filter(id__in=counts['category']).values_list('id', 'name')
+        ) if counts['category'] else {}
+        category_names[0] = 'Uncategorized'
+        labels = {
+            'category': category_names,
+            'meal_type': dict(MenuItem.MEAL_TYPE_CHOICES),
+            'price': {index: price_label(index) for index in range(len(PRICE_BUCKETS))},
+            'dietary': {name: label for name, _, _, label in DIETARY_FLAGS},
+        }
+        
+        facets = {}
+        for facet, counter in counts.items():
+            values = [
+                {'value': value, 'label': labels[facet].get(value, str(value)), 'count': count}
+                for value, count in counter.items()
+                if count > 0
+            ]
+            if facet == 'price':
+                values.sort(key=lambda entry: entry['value'])
+            else:
+                values.sort(key=lambda entry: (-entry['count'], entry['label']))
+            facets[facet] = values
+        return facets
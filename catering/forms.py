@@ -5,6 +5,7 @@ Handles menu item creation, booking, and review forms.
 
 from django import forms
 from django.core.exceptions import ValidationError
+from .lifecycle import CATERER, transitions_from
 from .models import MenuItem, MenuCategory, Booking, BookingItem, Review
 from accounts.models import CatererProfile
 
@@ -56,6 +57,73 @@ class MenuItemForm(forms.ModelForm):
         self.fields['category'].queryset = MenuCategory.objects.filter(is_active=True)
 
 
+class MenuItemImportForm(MenuItemForm):
+    """
+    Validates one row of a bulk menu import with the MenuItemForm rules.
+    Categories are given by name and resolved from a preloaded mapping,
+    so validating a row runs no queries.
+    """
+    
+    category = forms.CharField(required=False)
+    
+    class Meta(MenuItemForm.Meta):
+        fields = tuple(field for field in MenuItemForm.Meta.fields if field != 'image')
+    
+    def __init__(self, *args, categories=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Lower-cased name -> active MenuCategory
+        self.categories = categories or {}
+    
+    def clean_category(self):
+        name = (self.cleaned_data.get('category') or '').strip()
+        if not name:
+            return None
+        category = self.categories.get(name.lower())
+        if category is None:
+            raise ValidationError(f"Unknown or inactive category '{name}'.")
+        return category
+    
+    def _get_validation_exclusions(self):
+        # The category was already checked against the preloaded mapping
+        exclude = super()._get_validation_exclusions()
+        exclude.add('category')
+        return exclude
+
+
+class MenuImportForm(forms.Form):
+    """
+    Upload form for bulk menu imports.
+    """
+    
+    FORMAT_CHOICES = [
+        ('', 'Detect from file name'),
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ]
+    
+    file = forms.FileField(
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.csv,.jsonl,.json'})
+    )
+    format = forms.ChoiceField(
+        choices=FORMAT_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        upload = cleaned_data.get('file')
+        if upload and not cleaned_data.get('format'):
+            name = upload.name.lower()
+            if name.endswith('.csv'):
+                cleaned_data['format'] = 'csv'
+            elif name.endswith(('.jsonl', '.json')):
+                cleaned_data['format'] = 'jsonl'
+            else:
+                raise ValidationError("Choose a format or upload a .csv or .jsonl file.")
+        return cleaned_data
+
+
 class BookingForm(forms.ModelForm):
     """
     Form for creating bookings.
@@ -65,7 +133,7 @@ class BookingForm(forms.ModelForm):
         model = Booking
         fields = (
             'event_name', 'event_date', 'event_time', 'location',
-            'number_of_guests', 'special_requests'
+            'event_latitude', 'event_longitude', 'number_of_guests', 'special_requests'
         )
         widgets = {
             'event_name': forms.TextInput(attrs={
@@ -85,6 +153,16 @@ class BookingForm(forms.ModelForm):
                 'rows': 2,
                 'placeholder': 'Enter event location'
             }),
+            'event_latitude': forms.NumberInput(attrs={
+                'class': 'form-control',
+                'step': 'any',
+                'placeholder': 'Latitude (optional)'
+            }),
+            'event_longitude': forms.NumberInput(attrs={
+                'class': 'form-control',
+                'step': 'any',
+                'placeholder': 'Longitude (optional)'
+            }),
             'number_of_guests': forms.NumberInput(attrs={
                 'class': 'form-control',
                 'min': '1',
@@ -97,6 +175,13 @@ class BookingForm(forms.ModelForm):
             }),
         }
     
+    def clean(self):
+        """Require latitude and longitude together."""
+        cleaned_data = super().clean()
+        if (cleaned_data.get('event_latitude') is None) != (cleaned_data.get('event_longitude') is None):
+            raise ValidationError("Enter both latitude and longitude, or neither.")
+        return cleaned_data
+    
     def clean_event_date(self):
         """Validate that event date is in the future."""
         event_date = self.cleaned_data.get('event_date')
@@ -106,17 +191,23 @@ class BookingForm(forms.ModelForm):
         return event_date
 
 
-class BookingStatusForm(forms.ModelForm):
+class BookingStatusForm(forms.Form):
     """
     Form for updating booking status (for caterers).
+    Offers only the transitions allowed from the booking's current status.
     """
     
-    class Meta:
-        model = Booking
-        fields = ('status',)
-        widgets = {
-            'status': forms.Select(attrs={'class': 'form-select'}),
-        }
+    status = forms.ChoiceField(widget=forms.Select(attrs={'class': 'form-select'}))
+    # The version the caterer saw; a stale form is rejected as a conflict
+    version = forms.IntegerField(widget=forms.HiddenInput)
+    
+    def __init__(self, *args, booking, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['status'].choices = [
+            (transition.target, transition.label)
+            for transition in transitions_from(booking.status, CATERER)
+        ]
+        self.fields['version'].initial = booking.version
 
 
 class BookingItemForm(forms.ModelForm):
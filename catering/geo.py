@@ -0,0 +1,183 @@
+"""
+Geospatial caterer discovery for the Catering Application.
+Caterer locations are bucketed into a fixed lat/lng grid (CatererGeoCell);
+a radius search reads the cells overlapping the search circle through an
+index, then filters the candidates with a vectorized haversine distance.
+"""
+
+import math
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from accounts.models import CatererProfile
+from .cache import bump_caterer_list_version
+from .models import CatererGeoCell
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+# Grid cell size in degrees (about 11 km north-south). Changing it requires
+# `manage.py rebuild_geo_index`.
+CELL_DEGREES = 0.1
+
+DEFAULT_SEARCH_RADIUS_KM = 25
+MAX_SEARCH_RADIUS_KM = 500
+# Radius options offered on the caterer list
+SEARCH_RADIUS_CHOICES = (5, 10, 25, 50, 100)
+
+# CatererProfile fields mirrored in the index
+GEO_FIELDS = {'latitude', 'longitude', 'service_radius_km'}
+
+
+def cell_for(latitude, longitude):
+    """Return the (cell_lat, cell_lng) grid cell containing a point."""
+    return math.floor(latitude / CELL_DEGREES), math.floor(longitude / CELL_DEGREES)
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """
+    Great-circle distances in km from one point to arrays of points.
+    Accepts scalars or NumPy arrays for the second point.
+    """
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlng = np.radians(longitudes) - math.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _geo_cell(caterer):
+    cell_lat, cell_lng = cell_for(caterer.latitude, caterer.longitude)
+    return CatererGeoCell(
+        caterer_id=caterer.id,
+        cell_lat=cell_lat,
+        cell_lng=cell_lng,
+        latitude=caterer.latitude,
+        longitude=caterer.longitude,
+        service_radius_km=caterer.service_radius_km,
+    )
+
+
+def index_caterer(caterer):
+    """Write or remove a caterer's index row to match its profile."""
+    if caterer.latitude is None or caterer.longitude is None:
+        CatererGeoCell.objects.filter(caterer_id=caterer.id).delete()
+        return
+    cell = _geo_cell(caterer)
+    CatererGeoCell.objects.update_or_create(
+        caterer_id=caterer.id,
+        defaults={
+            'cell_lat': cell.cell_lat,
+            'cell_lng': cell.cell_lng,
+            'latitude': cell.latitude,
+            'longitude': cell.longitude,
+            'service_radius_km': cell.service_radius_km,
+        }
+    )
+
+
+def caterer_saved(caterer, update_fields=None):
+    """Keep the index in sync after a profile save."""
+    if update_fields is not None and not GEO_FIELDS & set(update_fields):
+        # e.g. recount_total_bookings saving only total_bookings
+        return
+    index_caterer(caterer)
+
+
+@transaction.atomic
+def rebuild_geo_index(batch_size=1000):
+    """
+    Rebuild the whole grid index from caterer profiles.
+    Returns the number of caterers indexed.
+    """
+    CatererGeoCell.objects.all().delete()
+    located = CatererProfile.objects.filter(
+        latitude__isnull=False, longitude__isnull=False
+    ).only('id', 'latitude', 'longitude', 'service_radius_km')
+    cells = [_geo_cell(caterer) for caterer in located.iterator()]
+    CatererGeoCell.objects.bulk_create(cells, batch_size=batch_size)
+    bump_caterer_list_version()
+    return len(cells)
+
+
+def _cell_filter(latitude, longitude, radius_km):
+    """Q matching the grid cells that overlap the search circle's bounding box."""
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = latitude - dlat, latitude + dlat
+    cell_lat_range = (math.floor(max(min_lat, -90) / CELL_DEGREES), math.floor(min(max_lat, 90) / CELL_DEGREES))
+    
+    # Near the poles every longitude is within reach
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if max_lat >= 90 or min_lat <= -90 or cos_lat * KM_PER_DEGREE_LAT * 180 <= radius_km:
+        return Q(cell_lat__range=cell_lat_range)
+    
+    dlng = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    min_lng, max_lng = longitude - dlng, longitude + dlng
+    # Split boxes that cross the antimeridian into two longitude ranges
+    lng_ranges = [(max(min_lng, -180), min(max_lng, 180))]
+    if min_lng < -180:
+        lng_ranges.append((min_lng + 360, 180))
+    if max_lng > 180:
+        lng_ranges.append((-180, max_lng - 360))
+    
+    lng_filter = Q()
+    for low, high in lng_ranges:
+        lng_filter |= Q(cell_lng__range=(math.floor(low / CELL_DEGREES), math.floor(high / CELL_DEGREES)))
+    return Q(cell_lat__range=cell_lat_range) & lng_filter
+
+
+def parse_search(params):
+    """
+    Read lat, lng and optional radius (km) from a QueryDict.
+    Returns None when no location is given; raises ValidationError when invalid.
+    """
+    if not params.get('lat') and not params.get('lng'):
+        return None
+    try:
+        latitude = float(params.get('lat', ''))
+        longitude = float(params.get('lng', ''))
+        radius_km = float(params.get('radius') or DEFAULT_SEARCH_RADIUS_KM)
+    except ValueError:
+        raise ValidationError("lat, lng and radius must be numbers.")
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValidationError("lat must be within ±90 and lng within ±180.")
+    if not 0 < radius_km <= MAX_SEARCH_RADIUS_KM:
+        raise ValidationError(f"radius must be between 0 and {MAX_SEARCH_RADIUS_KM} km.")
+    return latitude, longitude, radius_km
+
+
+def nearby_caterers(latitude, longitude, radius_km=DEFAULT_SEARCH_RADIUS_KM, serving_only=True):
+    """
+    Return [(caterer_id, distance_km)] for caterers within radius_km of a
+    point, nearest first. With serving_only, caterers whose service radius
+    doesn't reach the point are left out.
+    """
+    radius_km = min(radius_km, MAX_SEARCH_RADIUS_KM)
+    rows = list(
+        CatererGeoCell.objects.filter(_cell_filter(latitude, longitude, radius_km))
+        .values_list('caterer_id', 'latitude', 'longitude', 'service_radius_km')
+    )
+    if not rows:
+        return []
+    
+    ids, latitudes, longitudes, service_radii = (np.array(column) for column in zip(*rows))
+    distances = haversine_km(latitude, longitude, latitudes, longitudes)
+    mask = distances <= radius_km
+    if serving_only:
+        mask &= distances <= service_radii
+    
+    order = np.argsort(distances[mask], kind='stable')
+    return [
+        (int(caterer_id), round(float(distance), 2))
+        for caterer_id, distance in zip(ids[mask][order], distances[mask][order])
+    ]
+
+
+def serves(caterer, latitude, longitude):
+    """True if an event at the point is within the caterer's service radius (or either is unlocated)."""
+    if None in (caterer.latitude, caterer.longitude, latitude, longitude):
+        return True
+    return float(haversine_km(caterer.latitude, caterer.longitude, latitude, longitude)) <= caterer.service_radius_km
@@ -0,0 +1,291 @@
+"""
+Image processing pipeline for menu and profile images.
+Generates metadata-free WebP/JPEG variants at fixed widths next to the
+original upload, named by content hash so they can be cached forever.
+"""
+
+import hashlib
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from PIL import Image, ImageOps, UnidentifiedImageError
+from .jobs import enqueue
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VARIANT_WIDTHS = (160, 320, 640, 1280)
+
+# format -> (Pillow format, extension, save options)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Models with image variants: (model label, image field) -> manifest field
+IMAGE_FIELDS = {
+    ('catering.MenuItem', 'image'): 'image_variants',
+    ('accounts.User', 'profile_image'): 'profile_image_variants',
+}
+
+
+def get_variant_widths():
+    return tuple(sorted(getattr(settings, 'IMAGE_VARIANT_WIDTHS', DEFAULT_VARIANT_WIDTHS)))
+
+
+def content_hash(data):
+    """Return a short hash of the original file contents."""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def variant_name(source_name, digest, width, extension):
+    """Return the storage name of a variant, next to the source file."""
+    stem, _ = os.path.splitext(source_name)
+    return f"{stem}.{digest}.{width}w.{extension}"
+
+
+def _target_widths(original_width):
+    """Widths to generate; images are never upscaled."""
+    widths = [width for width in get_variant_widths() if width < original_width]
+    # Always keep one variant at (at most) the original size
+    widths.append(min(original_width, get_variant_widths()[-1]))
+    return sorted(set(widths))
+
+
+def _prepare(image, pillow_format):
+    """Return a copy of image suitable for saving in pillow_format."""
+    if pillow_format == 'JPEG':
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image.convert('RGBA'), mask=image.convert('RGBA').getchannel('A'))
+            return background
+        return image.convert('RGB')
+    if image.mode not in ('RGB', 'RGBA'):
+        return image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    return image
+
+
+def process_image(source_name, storage=None):
+    """
+    Generate variants for the file at source_name and return its manifest.
+    Existing variants with the same content hash are reused.
+    """
+    storage = storage or default_storage
+    with storage.open(source_name, 'rb') as f:
+        data = f.read()
+    digest = content_hash(data)
+    
+    with Image.open(io.BytesIO(data)) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+    
+    # Drop EXIF, ICC and other metadata; only transparency affects the pixels
+    transparency = image.info.get('transparency')
+    image.info = {} if transparency is None else {'transparency': transparency}
+    
+    manifest = {
+        'source': source_name,
+        'hash': digest,
+        'width': image.width,
+        'height': image.height,
+        'variants': {},
+    }
+    
+    for key, (pillow_format, extension, options) in VARIANT_FORMATS.items():
+        prepared = _prepare(image, pillow_format)
+        variants = []
+        for width in _target_widths(image.width):
+            name = variant_name(source_name, digest, width, extension)
+            if not storage.exists(name):
+                height = max(1, round(image.height * width / image.width))
+                resized = prepared.resize((width, height), Image.LANCZOS) if width != image.width else prepared
+                buffer = io.BytesIO()
+                resized.save(buffer, pillow_format, **options)
+                saved_name = storage.save(name, ContentFile(buffer.getvalue()))
+                if saved_name != name:
+                    # Storage renamed on a race with another writer; keep the first copy
+                    storage.delete(saved_name)
+            variants.append([width, name])
+        manifest['variants'][key] = variants
+    
+    return manifest
+
+
+def build_manifest(source_name, storage=None):
+    """
+    Return the manifest for source_name, or an empty one for unreadable files.
+    The source is always recorded so unreadable files aren't retried on every save.
+    """
+    if not source_name:
+        return {}
+    try:
+        return process_image(source_name, storage)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        logger.warning("Could not generate variants for %s: %s", source_name, e)
+        return {'source': source_name, 'variants': {}}
+
+
+def delete_variants(manifest, keep=None, storage=None):
+    """Delete variant files in manifest that are not listed in keep."""
+    storage = storage or default_storage
+    keep_names = {name for variants in (keep or {}).get('variants', {}).values() for _, name in variants}
+    for variants in (manifest or {}).get('variants', {}).values():
+        for _, name in variants:
+            if name not in keep_names:
+                storage.delete(name)
+
+
+def _source_in_use(model, image_field, manifest):
+    """True if any row still uses the manifest's source (e.g. the default profile image)."""
+    source = (manifest or {}).get('source')
+    return bool(source) and model._default_manager.filter(**{image_field: source}).exists()
+
+
+def needs_processing(instance, image_field, manifest_field):
+    """True if the image changed since its variants were generated."""
+    name = getattr(instance, image_field).name or ''
+    manifest = getattr(instance, manifest_field) or {}
+    return manifest.get('source', '') != name
+
+
+def refresh_variants(model, pk, image_field, manifest_field):
+    """Regenerate variants for one row and store the new manifest."""
+    instance = model._default_manager.filter(pk=pk).only(image_field, manifest_field).first()
+    if instance is None or not needs_processing(instance, image_field, manifest_field):
+        return
+    
+    old_manifest = getattr(instance, manifest_field) or {}
+    manifest = build_manifest(getattr(instance, image_field).name)
+    
+    # update() skips save signals, so this doesn't trigger another refresh
+    model._default_manager.filter(pk=pk).update(**{manifest_field: manifest})
+    
+    if not _source_in_use(model, image_field, old_manifest):
+        delete_variants(old_manifest, keep=manifest)
+
+
+def image_changed(instance, image_field, update_fields=None):
+    """
+    True if a save may have changed the image. Uses the value the instance
+    was loaded with, not its manifest: a worker may have stored a newer
+    manifest than the one this instance holds.
+    """
+    if update_fields is not None and image_field not in update_fields:
+        return False
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    if image_field not in loaded:
+        # Created, or loaded without the field: compare with the manifest
+        return True
+    loaded_name = getattr(loaded[image_field], 'name', loaded[image_field]) or ''
+    return loaded_name != (getattr(instance, image_field).name or '')
+
+
+def _is_default_image(instance, image_field):
+    default = instance._meta.get_field(image_field).default
+    return isinstance(default, str) and getattr(instance, image_field).name == default
+
+
+def schedule_refresh(instance, image_field, manifest_field, update_fields=None):
+    """
+    Queue a variant refresh for after the current transaction commits, if the
+    save changed the image. Call before instance.remember_saved_values().
+    Rows on the shared default image only get a job when they have old
+    variants to replace; generate_image_variants covers the default itself.
+    """
+    if not image_changed(instance, image_field, update_fields):
+        return
+    if _is_default_image(instance, image_field) and not getattr(instance, manifest_field):
+        return
+    if not needs_processing(instance, image_field, manifest_field):
+        return
+    enqueue('catering.refresh_image_variants', {
+        'model': instance._meta.label,
+        'pk': instance.pk,
+        'image_field': image_field,
+        'manifest_field': manifest_field,
+    })
+
+
+def discard_manifest(model, image_field, manifest):
+    """Delete a manifest's variants unless a row still uses its source."""
+    if not _source_in_use(model, image_field, manifest):
+        delete_variants(manifest)
+
+
+def discard_variants(instance, image_field, manifest_field):
+    """Queue deletion of a removed row's variants."""
+    manifest = getattr(instance, manifest_field)
+    if manifest:
+        enqueue('catering.discard_image_variants', {
+            'model': instance._meta.label,
+            'image_field': image_field,
+            'manifest': manifest,
+        })
+
+
+def srcset(manifest, key):
+    """Return a srcset attribute value for one format of a manifest."""
+    variants = (manifest or {}).get('variants', {}).get(key, [])
+    return ', '.join(f"{default_storage.url(name)} {width}w" for width, name in variants)
+
+
+def _init_worker():
+    """Set up Django in pool processes that were spawned rather than forked."""
+    django.setup()
+
+
+def _pending_rows(model, image_field, manifest_field, reprocess):
+    """Return {source name: [(pk, manifest)]} for rows whose variants are stale."""
+    pending = {}
+    rows = model._default_manager.exclude(**{image_field: ''}).exclude(
+        **{f'{image_field}__isnull': True}
+    ).values_list('pk', image_field, manifest_field)
+    for pk, source, manifest in rows.iterator():
+        manifest = manifest or {}
+        if reprocess or manifest.get('source') != source:
+            pending.setdefault(source, []).append((pk, manifest))
+    return pending
+
+
+def backfill_variants(workers=None, reprocess=False):
+    """
+    Generate variants for every stored image that lacks them, using a process pool.
+    Each distinct file is processed once even if several rows share it.
+    Returns {model label: rows updated} and the number of files processed.
+    """
+    pending = {}
+    for (label, image_field), manifest_field in IMAGE_FIELDS.items():
+        model = apps.get_model(label)
+        pending[label] = _pending_rows(model, image_field, manifest_field, reprocess)
+    
+    sources = sorted({source for rows in pending.values() for source in rows})
+    if not sources:
+        return {label: 0 for label in pending}, 0
+    
+    # Forked workers must not share the parent's database connections
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        manifests = dict(zip(sources, executor.map(build_manifest, sources, chunksize=4)))
+    
+    updated = {}
+    for (label, image_field), manifest_field in IMAGE_FIELDS.items():
+        model = apps.get_model(label)
+        updated[label] = 0
+        for source, rows in pending[label].items():
+            manifest = manifests[source]
+            updated[label] += model._default_manager.filter(
+                pk__in=[pk for pk, _ in rows]
+            ).update(**{manifest_field: manifest})
+            
+            for _, old_manifest in rows:
+                if old_manifest.get('source') != source and not _source_in_use(model, image_field, old_manifest):
+                    delete_variants(old_manifest, keep=manifest)
+    
+    return updated, len(sources)
@@ -0,0 +1,248 @@
+"""
+Database-backed job queue for the Catering Application.
+Side effects are enqueued with enqueue() once the current transaction
+commits and executed by `manage.py run_workers`.
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+# name -> callable; filled by the @task decorator (see catering.tasks)
+TASKS = {}
+
+THROUGHPUT_WINDOW = timedelta(minutes=1)
+
+# How often each worker deletes finished jobs older than JOB_RETENTION_DAYS
+PRUNE_INTERVAL = timedelta(minutes=5)
+
+# Statuses counted by queue_stats; succeeded jobs only grow the table
+COUNTED_STATUSES = ('queued', 'running', 'failed')
+
+
+def task(name, max_attempts=None):
+    """
+    Register a function as a job. Its keyword arguments are the JSON payload.
+    The function gains .enqueue(**payload) as a shortcut for enqueue(name, payload).
+    """
+    def decorator(func):
+        TASKS[name] = func
+        func.task_name = name
+        func.max_attempts = max_attempts
+        func.enqueue = lambda delay=0, **payload: enqueue(name, payload, delay=delay)
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, delay=0, max_attempts=None):
+    """
+    Queue a job to run after the current transaction commits.
+    Nothing is queued if the transaction rolls back. With JOBS_RUN_INLINE
+    the job runs in-process on commit instead (development and tests).
+    """
+    if name not in TASKS:
+        raise ValueError(f"Unknown task {name!r}")
+    payload = payload or {}
+    
+    if getattr(settings, 'JOBS_RUN_INLINE', False):
+        transaction.on_commit(lambda: TASKS[name](**payload))
+        return
+    
+    if max_attempts is None:
+        max_attempts = TASKS[name].max_attempts or getattr(settings, 'JOB_MAX_ATTEMPTS', 5)
+    
+    def create():
+        Job.objects.create(
+            name=name,
+            payload=payload,
+            max_attempts=max_attempts,
+            run_after=timezone.now() + timedelta(seconds=delay)
+        )
+    
+    transaction.on_commit(create)
+
+
+def retry_delay(attempts):
+    """Seconds to wait before retry number attempts: exponential with jitter."""
+    base = getattr(settings, 'JOB_RETRY_BASE_DELAY', 5)
+    maximum = getattr(settings, 'JOB_RETRY_MAX_DELAY', 3600)
+    delay = min(maximum, base * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def default_worker_id(index=0):
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def claim_jobs(worker_id, limit=10):
+    """
+    Claim up to limit due jobs for worker_id and return them.
+    Claims are conditional updates, so concurrent workers never run the
+    same job, without needing SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(status='queued', run_after__lte=now)
+        .order_by('run_after', 'id')
+        .values_list('id', flat=True)[:limit]
+    )
+    
+    claimed = []
+    for job_id in candidates:
+        updated = Job.objects.filter(id=job_id, status='queued').update(
+            status='running',
+            locked_by=worker_id,
+            started_at=now,
+            attempts=F('attempts') + 1
+        )
+        if updated:
+            claimed.append(job_id)
+    
+    return list(Job.objects.filter(id__in=claimed, locked_by=worker_id).order_by('run_after', 'id'))
+
+
+def run_job(job):
+    """
+    Execute a claimed job and record its outcome. Returns True on success.
+    The outcome is only recorded while this worker still holds the job: if
+    release_stale_jobs requeued it meanwhile, the newer attempt owns it.
+    """
+    claim = Job.objects.filter(id=job.id, status='running', locked_by=job.locked_by)
+    func = TASKS.get(job.name)
+    try:
+        if func is None:
+            raise LookupError(f"Unknown task {job.name!r}")
+        func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            logger.error("Job %s failed permanently after %s attempts", job, job.attempts)
+            claim.update(status='failed', last_error=error, finished_at=timezone.now())
+        else:
+            delay = retry_delay(job.attempts)
+            logger.warning("Job %s failed (attempt %s); retrying in %.0fs", job, job.attempts, delay)
+            claim.update(
+                status='queued',
+                last_error=error,
+                locked_by='',
+                run_after=timezone.now() + timedelta(seconds=delay)
+            )
+        return False
+    
+    claim.update(status='succeeded', finished_at=timezone.now())
+    return True
+
+
+def release_stale_jobs():
+    """
+    Requeue running jobs whose worker died (started over JOB_LOCK_TIMEOUT ago).
+    Jobs that have used all their attempts are marked failed instead.
+    There is no heartbeat, so a job that is merely slow is requeued too and
+    runs twice: keep JOB_LOCK_TIMEOUT above the longest job and make tasks
+    idempotent.
+    """
+    timeout = getattr(settings, 'JOB_LOCK_TIMEOUT', 600)
+    now = timezone.now()
+    stale = Job.objects.filter(status='running', started_at__lt=now - timedelta(seconds=timeout))
+    
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', last_error='Worker lost while running the job.', finished_at=now
+    )
+    return stale.update(status='queued', locked_by='', run_after=now)
+
+
+def prune_jobs(batch_size=1000):
+    """
+    Delete succeeded and failed jobs finished over JOB_RETENTION_DAYS ago.
+    Returns the number of jobs deleted.
+    """
+    days = getattr(settings, 'JOB_RETENTION_DAYS', 7)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    for status in ('succeeded', 'failed'):
+        # Batched by id so a large backlog doesn't hold one long delete
+        while True:
+            ids = list(
+                Job.objects.filter(status=status, finished_at__lt=cutoff)
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            deleted += Job.objects.filter(id__in=ids).delete()[0]
+    return deleted
+
+
+def work(worker_id, stop_event=None, poll_interval=1.0, batch_size=10, burst=False):
+    """
+    Process jobs until stop_event is set (or the queue is empty, with burst).
+    Returns the number of jobs executed.
+    """
+    stop_event = stop_event or threading.Event()
+    processed = 0
+    next_prune = timezone.now()
+    try:
+        while not stop_event.is_set():
+            close_old_connections()
+            release_stale_jobs()
+            if timezone.now() >= next_prune:
+                prune_jobs()
+                next_prune = timezone.now() + PRUNE_INTERVAL
+            jobs = claim_jobs(worker_id, batch_size)
+            if not jobs:
+                if burst:
+                    break
+                stop_event.wait(poll_interval)
+                continue
+            for job in jobs:
+                run_job(job)
+                processed += 1
+    finally:
+        connections.close_all()
+    return processed
+
+
+def queue_stats():
+    """
+    Return counts of unfinished and failed jobs, recent throughput and the
+    oldest due job's lag. Succeeded jobs are left out of the counts.
+    """
+    now = timezone.now()
+    counts = dict(
+        Job.objects.filter(status__in=COUNTED_STATUSES)
+        .values_list('status').annotate(total=Count('id')).order_by()
+    )
+    finished = Job.objects.filter(
+        status__in=['succeeded', 'failed'], finished_at__gte=now - THROUGHPUT_WINDOW
+    ).count()
+    oldest = Job.objects.filter(status='queued', run_after__lte=now).aggregate(oldest=Min('run_after'))['oldest']
+    
+    return {
+        'counts': {status: counts.get(status, 0) for status in COUNTED_STATUSES},
+        'throughput_per_second': finished / THROUGHPUT_WINDOW.total_seconds(),
+        'lag_seconds': (now - oldest).total_seconds() if oldest else 0.0,
+    }
+
+
+def job_queue_metrics():
+    """Metrics collector for smartcater.metrics."""
+    stats = queue_stats()
+    return [
+        ('smartcater_jobs', 'Queued, running and failed jobs by status.', 'gauge',
+         {('status', status): count for status, count in stats['counts'].items()}),
+        ('smartcater_jobs_throughput_per_second', 'Jobs finished per second over the last minute.', 'gauge',
+         {None: round(stats['throughput_per_second'], 3)}),
+        ('smartcater_jobs_lag_seconds', 'Age of the oldest due job.', 'gauge',
+         {None: round(stats['lag_seconds'], 3)}),
+    ]
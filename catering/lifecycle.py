@@ -0,0 +1,142 @@
+"""
+Booking lifecycle for the Catering Application.
+Status changes are declared as transitions and applied with a conditional
+UPDATE on the status and version the caller read, so concurrent changes
+fail with BookingConflict instead of overwriting each other. The UPDATE
+and the aggregate deltas it implies commit in one transaction.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from . import availability, rollups, stats
+from .models import Booking
+
+
+CUSTOMER = 'customer'
+CATERER = 'caterer'
+
+
+class BookingConflict(ValidationError):
+    """Raised when a booking changed between being read and being updated."""
+
+
+class Transition:
+    """A status change one kind of user may make."""
+    
+    def __init__(self, source, target, actor, label):
+        self.source = source
+        self.target = target
+        self.actor = actor
+        self.label = label
+
+
+TRANSITIONS = (
+    Transition('pending', 'confirmed', CATERER, 'Confirm'),
+    Transition('pending', 'cancelled', CATERER, 'Reject'),
+    Transition('confirmed', 'completed', CATERER, 'Mark as completed'),
+    Transition('confirmed', 'cancelled', CATERER, 'Cancel'),
+    Transition('pending', 'cancelled', CUSTOMER, 'Cancel'),
+)
+
+
+def transitions_from(status, actor):
+    """Return the transitions an actor may make from a status."""
+    return [
+        transition for transition in TRANSITIONS
+        if transition.source == status and transition.actor == actor
+    ]
+
+
+def can_change_status(booking, target, actor):
+    return any(transition.target == target for transition in transitions_from(booking.status, actor))
+
+
+def _expected_version(booking, version):
+    """
+    The version the caller saw, e.g. from a form. Checked against the loaded
+    booking first, so a stale form fails without touching the database.
+    """
+    if version in (None, ''):
+        return booking.version
+    try:
+        version = int(version)
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid booking version.")
+    if version != booking.version:
+        raise BookingConflict("This booking was changed by someone else. Please review it and try again.")
+    return version
+
+
+def _apply(booking, version, **updates):
+    """
+    UPDATE the booking if it still has the status and version it was
+    loaded with, then apply the change to the derived aggregates, all in
+    one transaction. updates must hold plain values, not expressions.
+    """
+    now = timezone.now()
+    previous = {field: getattr(booking, field) for field in (*updates, 'version', 'updated_at')}
+    try:
+        # The conditional UPDATE decides the winner without a row lock; the
+        # transaction commits the status and the aggregate deltas together,
+        # so a failed delta can't leave the counters out of step
+        with transaction.atomic():
+            updated = Booking.objects.filter(
+                id=booking.id,
+                status=booking.status,
+                version=version
+            ).update(version=F('version') + 1, updated_at=now, **updates)
+            if not updated:
+                raise BookingConflict("This booking was changed by someone else. Please review it and try again.")
+            
+            for field, value in updates.items():
+                setattr(booking, field, value)
+            booking.version = version + 1
+            booking.updated_at = now
+            
+            # update() bypasses post_save, so apply the aggregate deltas directly
+            stats.booking_saved(booking, created=False)
+            rollups.booking_saved(booking, created=False)
+            availability.booking_saved(booking, created=False)
+    except Exception:
+        # Rolled back: keep the instance in step with the database
+        for field, value in previous.items():
+            setattr(booking, field, value)
+        raise
+    booking.remember_saved_values()
+    return booking
+
+
+def change_status(booking, target, actor, version=None):
+    """
+    Move a booking to target status on behalf of actor.
+    Raises ValidationError for transitions that aren't allowed and
+    BookingConflict when the booking changed since it was read.
+    """
+    if not can_change_status(booking, target, actor):
+        raise ValidationError(
+            f"A {booking.get_status_display().lower()} booking can't be changed to {target} by the {actor}."
+        )
+    return _apply(booking, _expected_version(booking, version), status=target)
+
+
+def place_booking(booking, version=None):
+    """
+    Place a pending booking on behalf of its customer: fix the menu and
+    turn the per-person total into the total for all guests. Runs at most
+    once per booking, however many times it is submitted.
+    """
+    if booking.placed_at is not None:
+        raise ValidationError("This booking has already been placed.")
+    if booking.status != 'pending':
+        raise ValidationError("This booking cannot be confirmed.")
+    
+    version = _expected_version(booking, version)
+    # The version check guarantees the total and guest count are the ones read
+    return _apply(
+        booking,
+        version,
+        total_amount=booking.total_amount * booking.number_of_guests,
+        placed_at=timezone.now()
+    )
@@ -0,0 +1,132 @@
+"""
+Load test comparing the WSGI and ASGI paths for the async catering views.
+Sends the same requests with N concurrent clients through each handler
+and reports requests/sec and latency percentiles.
+"""
+
+import asyncio
+import threading
+import time
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from .benchmark import _sample_objects, percentile
+
+
+SYNC_URLCONF = 'smartcater.urls'
+ASYNC_URLCONF = 'smartcater.urls_async'
+
+# (URL name, role) for each async view
+LOAD_TEST_VIEWS = [
+    ('home', 'anonymous'),
+    ('caterer_list', 'anonymous'),
+    ('caterer_detail', 'anonymous'),
+    ('my_bookings', 'customer'),
+]
+
+
+def _urls(samples, only=None):
+    urls = []
+    for name, role in LOAD_TEST_VIEWS:
+        if only and name not in only:
+            continue
+        kwargs = {'caterer_id': samples['kwargs']['caterer_id']} if name == 'caterer_detail' else {}
+        urls.append((name, role, reverse(name, kwargs=kwargs)))
+    return urls
+
+
+def _client(client_class, samples, role):
+    client = client_class(raise_request_exception=False)
+    if role != 'anonymous':
+        client.force_login(samples[role])
+    return client
+
+
+def _summary(latencies, statuses, elapsed):
+    return {
+        'requests': len(latencies),
+        'requests_per_sec': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'status': sorted(statuses),
+    }
+
+
+def _run_wsgi(samples, url, role, concurrency, requests):
+    """Drive the WSGI handler from concurrency threads."""
+    latencies = []
+    statuses = set()
+    lock = threading.Lock()
+    
+    def worker(count):
+        client = _client(Client, samples, role)
+        local = []
+        try:
+            for _ in range(count):
+                start = time.perf_counter()
+                response = client.get(url)
+                local.append((time.perf_counter() - start) * 1000)
+                statuses.add(response.status_code)
+        finally:
+            connections.close_all()
+        with lock:
+            latencies.extend(local)
+    
+    counts = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    threads = [threading.Thread(target=worker, args=(count,)) for count in counts]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return _summary(latencies, statuses, time.perf_counter() - start)
+
+
+def _run_asgi(samples, url, role, concurrency, requests):
+    """Drive the ASGI handler from concurrency tasks on one event loop."""
+    latencies = []
+    statuses = set()
+    clients = [_client(AsyncClient, samples, role) for _ in range(concurrency)]
+    
+    async def worker(client, count):
+        for _ in range(count):
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses.add(response.status_code)
+    
+    async def main():
+        counts = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+        await asyncio.gather(*(worker(client, count) for client, count in zip(clients, counts)))
+    
+    start = time.perf_counter()
+    asyncio.run(main())
+    return _summary(latencies, statuses, time.perf_counter() - start)
+
+
+def run_load_test(concurrency=10, requests=200, only=None):
+    """
+    Run each async view through WSGI (sync views) and ASGI (async views).
+    Returns a JSON-serializable report.
+    """
+    samples = _sample_objects()
+    results = {}
+    
+    for name, role, url in _urls(samples, only):
+        with override_settings(ROOT_URLCONF=SYNC_URLCONF):
+            wsgi = _run_wsgi(samples, url, role, concurrency, requests)
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            asgi = _run_asgi(samples, url, role, concurrency, requests)
+        
+        speedup = None
+        if wsgi['requests_per_sec'] and asgi['requests_per_sec']:
+            speedup = round(asgi['requests_per_sec'] / wsgi['requests_per_sec'], 2)
+        results[name] = {'url': url, 'role': role, 'wsgi': wsgi, 'asgi': asgi, 'asgi_speedup': speedup}
+    
+    return {
+        'database': connections['default'].vendor,
+        'concurrency': concurrency,
+        'requests_per_view': requests,
+        'views': results,
+    }
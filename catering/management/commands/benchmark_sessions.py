@@ -0,0 +1,49 @@
+"""
+Management command to compare per-request database work across session engines.
+"""
+
+import json
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from catering.benchmark import BenchmarkError, run_session_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Request authenticated customer and caterer pages under each session engine '
+        '(settings.SESSION_ENGINES) and print session table reads/writes, other queries '
+        'and latency per request as JSON.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per view and engine.')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per view and engine before timing.')
+        parser.add_argument(
+            '--store', action='append', dest='stores', choices=sorted(settings.SESSION_ENGINES),
+            help='Only benchmark this session store (repeatable).'
+        )
+        parser.add_argument(
+            '--save-every-request', action='store_true',
+            help='Run with SESSION_SAVE_EVERY_REQUEST, as with sliding session expiry.'
+        )
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+    
+    def handle(self, *args, **options):
+        stores = options['stores'] or list(settings.SESSION_ENGINES)
+        try:
+            report = run_session_benchmark(
+                {store: settings.SESSION_ENGINES[store] for store in stores},
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                save_every_request=options['save_every_request']
+            )
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+        
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
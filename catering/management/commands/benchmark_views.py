@@ -0,0 +1,35 @@
+"""
+Management command to benchmark every catering and accounts view.
+"""
+
+import json
+from django.core.management.base import BaseCommand, CommandError
+from catering.benchmark import BenchmarkError, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmark each URL with the test client and print p50/p95/p99 latency and query counts as JSON.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per URL.')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per URL before timing.')
+        parser.add_argument('--view', action='append', dest='views', help='Only benchmark this URL name (repeatable).')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+    
+    def handle(self, *args, **options):
+        try:
+            report = run_benchmark(
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                only=options['views']
+            )
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+        
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,23 @@
+"""
+Management command to verify hot view queries use indexes.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from catering.query_plans import check_hot_queries
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot view queries and fail if any needs a full table scan.'
+    
+    def handle(self, *args, **options):
+        failures = 0
+        for name, problems in check_hot_queries():
+            if problems:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}: {'; '.join(problems)}"))
+            else:
+                self.stdout.write(f"ok         {name}")
+        
+        if failures:
+            raise CommandError(f"{failures} hot queries are not served by an index.")
+        self.stdout.write(self.style.SUCCESS("All hot queries use an index."))
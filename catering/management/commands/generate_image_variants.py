@@ -0,0 +1,34 @@
+"""
+Management command to backfill resized variants for stored images.
+"""
+
+import os
+from django.core.management.base import BaseCommand
+from catering.images import backfill_variants
+
+
+class Command(BaseCommand):
+    help = 'Generate WebP/JPEG variants for menu and profile images that lack them.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Number of worker processes.'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='reprocess',
+            help='Reprocess every image, e.g. after changing IMAGE_VARIANT_WIDTHS.'
+        )
+    
+    def handle(self, *args, **options):
+        updated, processed = backfill_variants(
+            workers=options['workers'],
+            reprocess=options['reprocess']
+        )
+        for label, count in updated.items():
+            self.stdout.write(f"{label}: {count} rows updated")
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} images."))
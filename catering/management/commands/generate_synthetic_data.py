@@ -0,0 +1,250 @@
+"""
+Management command to generate a synthetic dataset for benchmarking.
+"""
+
+import random
+from datetime import time, timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from accounts.models import User, CatererProfile
+from catering.models import MenuCategory, MenuItem, Booking, BookingItem, Review
+from catering.cache import bump_home_version
+from catering.ratings import average
+from catering.availability import rebuild_availability
+from catering.facets import rebuild_facets
+from catering.geo import rebuild_geo_index
+from catering.rollups import rebuild_rollups
+from catering.search import rebuild_index
+from catering.stats import refresh_caterer_stats
+
+
+WORDS = (
+    'spicy', 'royal', 'golden', 'fresh', 'garden', 'coastal', 'classic', 'urban',
+    'biryani', 'dosa', 'paneer', 'tandoori', 'kebab', 'curry', 'pasta', 'salad',
+    'wedding', 'corporate', 'party', 'festival', 'feast', 'kitchen', 'grill', 'bakery',
+)
+# Area -> city centre (latitude, longitude); locations are scattered around it
+AREA_COORDINATES = {
+    'Chennai': (13.0827, 80.2707),
+    'Bangalore': (12.9716, 77.5946),
+    'Mumbai': (19.0760, 72.8777),
+    'Delhi': (28.7041, 77.1025),
+    'Hyderabad': (17.3850, 78.4867),
+    'Pune': (18.5204, 73.8567),
+    'Kochi': (9.9312, 76.2673),
+    'Madurai': (9.9252, 78.1198),
+}
+AREAS = tuple(AREA_COORDINATES)
+# Spread of generated locations around the city centre, in degrees
+LOCATION_SPREAD = 0.2
+CATEGORIES = ('Appetizers', 'Main Course', 'Desserts', 'Beverages', 'Breads', 'Salads')
+MEAL_TYPES = [choice for choice, _ in MenuItem.MEAL_TYPE_CHOICES]
+STATUSES = [choice for choice, _ in Booking.STATUS_CHOICES]
+
+# Password for every generated account
+PASSWORD = 'benchmark-pass'
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic caterers, menus, bookings and reviews with bulk inserts.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--caterers', type=int, default=50, help='Number of caterers (N).')
+        parser.add_argument('--menu-items', type=int, default=30, help='Menu items per caterer (M).')
+        parser.add_argument('--bookings', type=int, default=1000, help='Total bookings (K).')
+        parser.add_argument('--customers', type=int, default=200, help='Number of customers.')
+        parser.add_argument('--items-per-booking', type=int, default=4, help='Maximum items per booking.')
+        parser.add_argument('--review-ratio', type=float, default=0.5, help='Share of completed bookings with a review.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible datasets.')
+        parser.add_argument('--prefix', default='bench', help='Username prefix for generated accounts.')
+    
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        prefix = options['prefix']
+        password = make_password(PASSWORD)
+        now = timezone.now()
+        
+        with transaction.atomic():
+            categories = self._categories()
+            
+            # Users
+            User.objects.bulk_create(
+                [
+                    User(username=f'{prefix}_caterer_{i}', email=f'{prefix}_caterer_{i}@example.com',
+                         role='caterer', password=password, date_joined=now - timedelta(days=rng.randint(0, 365)))
+                    for i in range(options['caterers'])
+                ],
+                batch_size=batch_size
+            )
+            User.objects.bulk_create(
+                [
+                    User(username=f'{prefix}_customer_{i}', email=f'{prefix}_customer_{i}@example.com',
+                         role='customer', password=password, date_joined=now - timedelta(days=rng.randint(0, 365)))
+                    for i in range(options['customers'])
+                ],
+                batch_size=batch_size
+            )
+            # Reload rows: MySQL doesn't return ids from bulk_create
+            caterer_users = list(User.objects.filter(username__startswith=f'{prefix}_caterer_'))
+            customers = list(User.objects.filter(username__startswith=f'{prefix}_customer_'))
+            
+            # Caterer profiles
+            profiles = []
+            for i, user in enumerate(caterer_users):
+                area = rng.choice(AREAS)
+                latitude, longitude = self._location(rng, area)
+                profiles.append(CatererProfile(
+                    user=user,
+                    company_name=f"{self._words(rng, 2).title()} Caterers {i}",
+                    description=self._words(rng, 20).capitalize(),
+                    service_area=area,
+                    latitude=latitude,
+                    longitude=longitude,
+                    service_radius_km=rng.choice((10, 15, 25, 40)),
+                    is_verified=rng.random() < 0.7,
+                    created_at=user.date_joined,
+                ))
+            CatererProfile.objects.bulk_create(profiles, batch_size=batch_size)
+            caterers = list(CatererProfile.objects.filter(user__in=caterer_users))
+            
+            # Menu items
+            MenuItem.objects.bulk_create(
+                [
+                    MenuItem(
+                        caterer=caterer,
+                        category=rng.choice(categories),
+                        name=self._words(rng, 2).title(),
+                        description=self._words(rng, 12).capitalize(),
+                        price=Decimal(rng.randint(50, 2000)) / 10,
+                        meal_type=rng.choice(MEAL_TYPES),
+                        is_available=rng.random() < 0.9,
+                        is_vegetarian=rng.random() < 0.5,
+                        is_vegan=rng.random() < 0.2,
+                        is_gluten_free=rng.random() < 0.2,
+                    )
+                    for caterer in caterers
+                    for _ in range(options['menu_items'])
+                ],
+                batch_size=batch_size
+            )
+            menus = {}
+            for item_id, caterer_id, price in MenuItem.objects.filter(
+                caterer__in=caterers
+            ).values_list('id', 'caterer_id', 'price').iterator():
+                menus.setdefault(caterer_id, []).append((item_id, price))
+            
+            # Bookings
+            bookings = []
+            for _ in range(options['bookings']):
+                created_at = now - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1440))
+                area = rng.choice(AREAS)
+                event_latitude, event_longitude = self._location(rng, area)
+                bookings.append(Booking(
+                    customer=rng.choice(customers),
+                    caterer=rng.choice(caterers),
+                    event_name=f"{self._words(rng, 1).title()} Event",
+                    event_date=(created_at + timedelta(days=rng.randint(1, 90))).date(),
+                    event_time=time(rng.randint(8, 21), rng.choice((0, 30))),
+                    location=f"{rng.randint(1, 999)} Main Road, {area}",
+                    event_latitude=event_latitude,
+                    event_longitude=event_longitude,
+                    number_of_guests=rng.randint(10, 500),
+                    status=rng.choice(STATUSES),
+                    created_at=created_at,
+                ))
+            Booking.objects.bulk_create(bookings, batch_size=batch_size)
+            bookings = list(Booking.objects.filter(caterer__in=caterers).only(
+                'id', 'caterer_id', 'customer_id', 'status', 'created_at'
+            ))
+            
+            # Booking items, totals and reviews
+            items = []
+            reviews = []
+            totals = {}
+            for booking in bookings:
+                menu = menus.get(booking.caterer_id)
+                if not menu:
+                    continue
+                total = Decimal('0')
+                for item_id, price in rng.sample(menu, min(len(menu), rng.randint(1, options['items_per_booking']))):
+                    quantity = rng.randint(1, 10)
+                    items.append(BookingItem(
+                        booking_id=booking.id, menu_item_id=item_id,
+                        quantity=quantity, unit_price=price, subtotal=price * quantity
+                    ))
+                    total += price * quantity
+                totals[booking.id] = total
+                if booking.status == 'completed' and rng.random() < options['review_ratio']:
+                    reviews.append(Review(
+                        booking_id=booking.id, customer_id=booking.customer_id, caterer_id=booking.caterer_id,
+                        rating=rng.randint(1, 5), comment=self._words(rng, 10).capitalize(),
+                        created_at=booking.created_at + timedelta(days=1),
+                    ))
+            BookingItem.objects.bulk_create(items, batch_size=batch_size)
+            Review.objects.bulk_create(reviews, batch_size=batch_size)
+            
+            for booking in bookings:
+                booking.total_amount = totals.get(booking.id, Decimal('0'))
+            Booking.objects.bulk_update(bookings, ['total_amount'], batch_size=batch_size)
+            
+            self._update_caterer_totals(caterers, bookings, reviews, batch_size)
+        
+        # bulk_create skips signals, so rebuild derived data
+        rebuild_index()
+        rebuild_rollups()
+        rebuild_availability()
+        rebuild_geo_index()
+        rebuild_facets()
+        for caterer in caterers:
+            refresh_caterer_stats(caterer.id)
+        bump_home_version()
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(caterers)} caterers, {len(customers)} customers, "
+            f"{sum(len(menu) for menu in menus.values())} menu items, {len(bookings)} bookings, "
+            f"{len(items)} booking items and {len(reviews)} reviews. Password: {PASSWORD}"
+        ))
+    
+    def _categories(self):
+        """Return the standard menu categories, creating missing ones."""
+        existing = set(MenuCategory.objects.filter(name__in=CATEGORIES).values_list('name', flat=True))
+        MenuCategory.objects.bulk_create(
+            [MenuCategory(name=name) for name in CATEGORIES if name not in existing]
+        )
+        return list(MenuCategory.objects.filter(name__in=CATEGORIES))
+    
+    def _words(self, rng, count):
+        return ' '.join(rng.choice(WORDS) for _ in range(count))
+    
+    def _location(self, rng, area):
+        """Return a random (latitude, longitude) around an area's centre."""
+        latitude, longitude = AREA_COORDINATES[area]
+        return (
+            round(latitude + rng.uniform(-LOCATION_SPREAD, LOCATION_SPREAD), 6),
+            round(longitude + rng.uniform(-LOCATION_SPREAD, LOCATION_SPREAD), 6),
+        )
+    
+    def _update_caterer_totals(self, caterers, bookings, reviews, batch_size):
+        """Fill in total_bookings and rating on the generated caterers."""
+        confirmed = {}
+        for booking in bookings:
+            if booking.status in ('confirmed', 'completed'):
+                confirmed[booking.caterer_id] = confirmed.get(booking.caterer_id, 0) + 1
+        ratings = {}
+        for review in reviews:
+            ratings.setdefault(review.caterer_id, []).append(review.rating)
+        
+        for caterer in caterers:
+            caterer.total_bookings = confirmed.get(caterer.id, 0)
+            scores = ratings.get(caterer.id, [])
+            caterer.rating_sum = sum(scores)
+            caterer.rating_count = len(scores)
+            caterer.rating = average(caterer.rating_sum, caterer.rating_count)
+        CatererProfile.objects.bulk_update(
+            caterers, ['total_bookings', 'rating', 'rating_sum', 'rating_count'], batch_size=batch_size
+        )
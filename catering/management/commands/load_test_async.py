@@ -0,0 +1,39 @@
+"""
+Management command to compare requests/sec of the WSGI and ASGI view paths.
+"""
+
+import json
+from django.core.management.base import BaseCommand, CommandError
+from catering.benchmark import BenchmarkError
+from catering.loadtest import run_load_test
+
+
+class Command(BaseCommand):
+    help = 'Load test home, caterer_list, caterer_detail and my_bookings through WSGI and ASGI and print requests/sec as JSON.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=10, help='Concurrent clients per handler.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per view per handler.')
+        parser.add_argument('--view', action='append', dest='views', help='Only load test this URL name (repeatable).')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+    
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError("--concurrency and --requests must be positive.")
+        
+        try:
+            report = run_load_test(
+                concurrency=options['concurrency'],
+                requests=options['requests'],
+                only=options['views']
+            )
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+        
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,14 @@
+"""
+Management command to rebuild the caterer availability calendar.
+"""
+
+from django.core.management.base import BaseCommand
+from catering.availability import rebuild_availability
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-day caterer availability from active bookings.'
+    
+    def handle(self, *args, **options):
+        count = rebuild_availability()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} availability days."))
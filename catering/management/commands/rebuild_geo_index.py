@@ -0,0 +1,14 @@
+"""
+Management command to rebuild the caterer grid cell index.
+"""
+
+from django.core.management.base import BaseCommand
+from catering.geo import rebuild_geo_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the geospatial grid index from caterer locations.'
+    
+    def handle(self, *args, **options):
+        count = rebuild_geo_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} located caterers."))
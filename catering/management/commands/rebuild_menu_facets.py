@@ -0,0 +1,17 @@
+"""
+Management command to rebuild the menu facet counters.
+"""
+
+from django.core.management.base import BaseCommand
+from catering.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the dish search facet counters from menu items.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--caterer', type=int, help='Only rebuild this caterer profile id.')
+    
+    def handle(self, *args, **options):
+        count = rebuild_facets(caterer_id=options['caterer'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} facet counters."))
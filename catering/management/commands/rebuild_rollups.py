@@ -0,0 +1,16 @@
+"""
+Management command to rebuild the daily analytics rollups.
+"""
+
+from django.core.management.base import BaseCommand
+from catering.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily booking and sign-up rollups from history.'
+    
+    def handle(self, *args, **options):
+        booking_buckets, user_buckets = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {booking_buckets} booking buckets and {user_buckets} user buckets."
+        ))
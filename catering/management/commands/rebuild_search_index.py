@@ -0,0 +1,22 @@
+"""
+Management command to rebuild the caterer search index.
+"""
+
+from django.core.management.base import BaseCommand
+from catering.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the caterer search index from scratch.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of index rows inserted per query.'
+        )
+    
+    def handle(self, *args, **options):
+        count = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} caterers."))
@@ -0,0 +1,31 @@
+"""
+Management command to recompute materialized caterer statistics.
+"""
+
+from django.core.management.base import BaseCommand
+from accounts.models import CatererProfile
+from catering.stats import refresh_caterer_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute CatererStats rows from bookings (backfill or repair).'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'caterer_ids',
+            nargs='*',
+            type=int,
+            help='Caterer profile ids to recompute (default: all caterers).'
+        )
+    
+    def handle(self, *args, **options):
+        caterer_ids = options['caterer_ids']
+        if not caterer_ids:
+            caterer_ids = list(CatererProfile.objects.values_list('id', flat=True))
+        
+        count = 0
+        for caterer_id in caterer_ids:
+            refresh_caterer_stats(caterer_id)
+            count += 1
+        
+        self.stdout.write(self.style.SUCCESS(f"Recomputed stats for {count} caterers."))
@@ -0,0 +1,35 @@
+"""
+Management command to reconcile denormalized caterer ratings with reviews.
+"""
+
+from django.core.management.base import BaseCommand
+from catering.ratings import reconcile_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recompute caterer rating totals from reviews and fix any drift.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'caterer_ids',
+            nargs='*',
+            type=int,
+            help='Caterer profile ids to check (default: all caterers).'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drift without fixing it.'
+        )
+    
+    def handle(self, *args, **options):
+        drifted = reconcile_ratings(options['caterer_ids'] or None, dry_run=options['dry_run'])
+        
+        for caterer_id, stored, actual in drifted:
+            self.stdout.write(
+                f"Caterer #{caterer_id}: stored sum={stored[0]} count={stored[1]} rating={stored[2]}, "
+                f"actual sum={actual[0]} count={actual[1]} rating={actual[2]}"
+            )
+        
+        verb = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drifted)} caterers with rating drift."))
@@ -0,0 +1,149 @@
+"""
+Management command to race booking lifecycle transitions from a thread pool.
+"""
+
+import json
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+from django.db.models import Sum
+from catering.lifecycle import CATERER, CUSTOMER, BookingConflict, change_status, place_booking
+from catering.models import Booking, CatererStats, DailyBookingRollup
+from catering.stats import compute_caterer_stats, materialized_stats_enabled
+
+
+# (action, target status, actor) submitted concurrently for every booking;
+# place is submitted twice, like a double-clicked button
+ACTIONS = (
+    ('place', None, CUSTOMER),
+    ('place', None, CUSTOMER),
+    ('cancel', 'cancelled', CUSTOMER),
+    ('confirm', 'confirmed', CATERER),
+)
+
+
+def _attempt(booking_id, action, target, actor):
+    """Load a booking and try one action on it, as a request would."""
+    try:
+        booking = Booking.objects.get(id=booking_id)
+        if action == 'place':
+            place_booking(booking)
+        else:
+            change_status(booking, target, actor)
+        return booking_id, action, 'applied'
+    except BookingConflict:
+        return booking_id, action, 'conflict'
+    except ValidationError:
+        return booking_id, action, 'rejected'
+    except DatabaseError:
+        # e.g. SQLite's "database is locked"; counted, never a lost update
+        return booking_id, action, 'error'
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Race customer and caterer transitions (place twice, cancel, confirm) on the same pending '
+        'bookings from a thread pool, then check that no update was lost. Changes the bookings it '
+        'uses, so run it against synthetic data.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--bookings', type=int, default=50, help='Pending bookings to race on.')
+        parser.add_argument('--workers', type=int, default=8, help='Threads, each with its own connection.')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for the submission order.')
+    
+    def handle(self, *args, **options):
+        if options['bookings'] < 1 or options['workers'] < 1:
+            raise CommandError("--bookings and --workers must be positive.")
+        
+        originals = {
+            booking_id: (total, guests)
+            for booking_id, total, guests in Booking.objects.filter(
+                status='pending', placed_at__isnull=True
+            ).order_by('id').values_list('id', 'total_amount', 'number_of_guests')[:options['bookings']]
+        }
+        if not originals:
+            raise CommandError("No pending bookings to use; run generate_synthetic_data first.")
+        
+        tasks = [(booking_id, *action) for booking_id in originals for action in ACTIONS]
+        random.Random(options['seed']).shuffle(tasks)
+        # The main thread's connection isn't shared with the workers
+        connection.close()
+        
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            results = list(pool.map(lambda task: _attempt(*task), tasks))
+        
+        violations = self._check(originals, results)
+        outcomes = Counter(f"{action}:{outcome}" for _, action, outcome in results)
+        report = {
+            'bookings': len(originals),
+            'attempts': len(results),
+            'outcomes': dict(sorted(outcomes.items())),
+            'violations': violations,
+        }
+        self.stdout.write(json.dumps(report, indent=2, default=str))
+        
+        if violations:
+            raise CommandError(f"{len(violations)} invariant violations.")
+        self.stdout.write(self.style.SUCCESS("No lost updates."))
+    
+    def _check(self, originals, results):
+        """Return a list of invariant violations after the race."""
+        applied = {booking_id: Counter() for booking_id in originals}
+        for booking_id, action, outcome in results:
+            if outcome == 'applied':
+                applied[booking_id][action] += 1
+        
+        violations = []
+        bookings = Booking.objects.in_bulk(list(originals))
+        for booking_id, (total, guests) in originals.items():
+            booking = bookings[booking_id]
+            counts = applied[booking_id]
+            status_changes = counts['cancel'] + counts['confirm']
+            
+            if counts['place'] > 1:
+                violations.append({'booking': booking_id, 'error': 'placed more than once'})
+            if status_changes > 1:
+                violations.append({'booking': booking_id, 'error': 'cancelled and confirmed'})
+            
+            expected_total = total * guests if counts['place'] else total
+            if booking.total_amount != expected_total:
+                violations.append({
+                    'booking': booking_id, 'error': 'wrong total',
+                    'expected': expected_total, 'actual': booking.total_amount,
+                })
+            expected_status = (
+                'cancelled' if counts['cancel'] else 'confirmed' if counts['confirm'] else 'pending'
+            )
+            if booking.status != expected_status:
+                violations.append({
+                    'booking': booking_id, 'error': 'wrong status',
+                    'expected': expected_status, 'actual': booking.status,
+                })
+            if bool(booking.placed_at) != bool(counts['place']):
+                violations.append({'booking': booking_id, 'error': 'placed_at out of step'})
+        
+        # The aggregates were updated by hand, so compare them with a recount
+        caterer_ids = {booking.caterer_id for booking in bookings.values()}
+        for caterer_id in caterer_ids:
+            expected = compute_caterer_stats(caterer_id)
+            if materialized_stats_enabled():
+                stored = CatererStats.objects.filter(caterer_id=caterer_id).values(*expected).first()
+                if stored is not None and stored != expected:
+                    violations.append({'caterer': caterer_id, 'error': 'stats drift', 'expected': expected, 'actual': stored})
+            
+            for status in ('pending', 'confirmed', 'cancelled'):
+                actual = DailyBookingRollup.objects.filter(
+                    caterer_id=caterer_id, status=status
+                ).aggregate(count=Sum('booking_count'))['count'] or 0
+                if actual != expected[f'{status}_count']:
+                    violations.append({
+                        'caterer': caterer_id, 'error': f'{status} rollup drift',
+                        'expected': expected[f'{status}_count'], 'actual': actual,
+                    })
+        return violations
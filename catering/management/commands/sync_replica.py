@@ -0,0 +1,41 @@
+"""
+Management command to copy the primary SQLite database into its replicas.
+"""
+
+import sqlite3
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the SQLite primary into every SQLite replica, standing in for '
+        'replication (see smartcater.settings_replica).'
+    )
+    
+    def handle(self, *args, **options):
+        replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+        if not replicas:
+            raise CommandError("No DATABASE_REPLICAS are configured.")
+        
+        aliases = [DEFAULT_DB_ALIAS, *replicas]
+        for alias in aliases:
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(
+                    f"Database '{alias}' is not SQLite; real replicas are kept in sync by the database server."
+                )
+        
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        for alias in replicas:
+            # The copy replaces the file under any open connection
+            connections[alias].close()
+            target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(f"Copied {primary.settings_dict['NAME']} to {alias}.")
+        
+        self.stdout.write(self.style.SUCCESS(f"Synced {len(replicas)} replicas."))
@@ -0,0 +1,297 @@
+"""
+Bulk menu import and export for the Catering Application.
+Imports stream an uploaded CSV or JSON Lines file row by row and upsert
+in batches; exports stream the menu back out. Memory use does not grow
+with file size.
+"""
+
+import csv
+import io
+import json
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from .cache import bump_menu_version
+from .exports import Echo
+from .facets import rebuild_facets
+from .forms import MenuItemImportForm
+from .models import MenuCategory, MenuItem
+from .pagination import iter_keyset
+from .search import reindex_caterer
+
+
+IMPORT_BATCH_SIZE = 500
+# Per-row errors kept for the report; further failures are only counted
+MAX_REPORTED_ERRORS = 100
+
+EXPORT_FIELDS = (
+    'id', 'name', 'description', 'category', 'price', 'meal_type', 'is_available',
+    'is_vegetarian', 'is_vegan', 'is_gluten_free', 'preparation_time'
+)
+BOOLEAN_FIELDS = ('is_available', 'is_vegetarian', 'is_vegan', 'is_gluten_free')
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+
+# Fields written by bulk_update for existing items
+UPDATE_FIELDS = [name for name in EXPORT_FIELDS if name != 'id'] + ['updated_at']
+
+
+class ImportResult:
+    """Counts and per-row errors of a bulk import."""
+    
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+    
+    def add_error(self, row_number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'errors': errors})
+    
+    @property
+    def unreported_errors(self):
+        return self.failed - len(self.errors)
+
+
+def iter_rows(upload, file_format):
+    """
+    Yield (row number, dict or None) from an uploaded CSV or JSONL file.
+    None marks a line that couldn't be parsed. The file is read lazily, so
+    UnicodeDecodeError (a file that isn't UTF-8) and csv.Error can be raised
+    part way through.
+    """
+    text = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        if file_format == 'csv':
+            reader = csv.DictReader(text)
+            for row in reader:
+                # Header is row 1; cells missing from short rows are None,
+                # so drop them like absent columns
+                yield reader.line_num, {column: value for column, value in row.items() if value is not None}
+        else:
+            for line_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield line_number, row if isinstance(row, dict) else None
+    finally:
+        # Don't let the wrapper close the uploaded file
+        text.detach()
+
+
+def _form_data(row):
+    """
+    Turn a parsed row into form data; absent columns take the model defaults.
+    Rows for existing items are merged with their saved values first.
+    """
+    data = {}
+    for name in EXPORT_FIELDS:
+        if name == 'id':
+            continue
+        if name in BOOLEAN_FIELDS:
+            if name in row:
+                checked = str(row[name]).strip().lower() in TRUE_VALUES
+            else:
+                checked = MenuItem._meta.get_field(name).default
+            # Checkbox semantics: unchecked boxes are simply absent
+            if checked:
+                data[name] = 'on'
+        elif row.get(name) is not None:
+            data[name] = str(row[name]).strip()
+    
+    if not data.get('preparation_time'):
+        data['preparation_time'] = MenuItem._meta.get_field('preparation_time').default
+    return data
+
+
+class _MenuUpserter:
+    """Buffers validated items and writes them in batches."""
+    
+    def __init__(self, caterer, result, batch_size):
+        self.caterer = caterer
+        self.result = result
+        self.batch_size = batch_size
+        self.to_create = {}
+        self.to_update = {}
+        
+        # Bounded by the caterer's menu size, not the file size
+        self.ids_by_name = {}
+        # Current column values by item id, so rows only override the
+        # columns they contain
+        self.saved_rows = {}
+        self.pending_rows = {}
+        # Inactive categories kept by existing items: a row that omits the
+        # category may keep it, but no row may assign it
+        self.kept_categories = {}
+        items = MenuItem.objects.filter(caterer=caterer).select_related('category')
+        for item in iter_keyset(items, ('-id',), 500):
+            self.ids_by_name[item.name] = item.id
+            self.saved_rows[item.id] = _export_values(item)
+            if item.category and not item.category.is_active:
+                self.kept_categories[item.category.name.lower()] = item.category
+        self.known_ids = set(self.ids_by_name.values())
+    
+    def target_for(self, row_id, name):
+        """Return (existing item id or None, error message or None) for a row."""
+        if row_id not in (None, ''):
+            try:
+                item_id = int(row_id)
+            except (TypeError, ValueError):
+                return None, f"Invalid id '{row_id}'."
+            if item_id not in self.known_ids:
+                return None, f"Menu item {item_id} does not belong to your menu."
+            return item_id, None
+        return self.ids_by_name.get(name), None
+    
+    def merged_row(self, item_id, name, row):
+        """The row over the current values of the item it updates, if any."""
+        base = self.saved_rows.get(item_id) if item_id is not None else self.pending_rows.get(name)
+        return {**base, **row} if base else row
+    
+    def add(self, item, row):
+        if item.pk is None:
+            self.to_create[item.name] = item
+            self.pending_rows[item.name] = row
+        else:
+            self.to_update[item.pk] = item
+            self.saved_rows[item.pk] = row
+        if len(self.to_create) + len(self.to_update) >= self.batch_size:
+            self.flush()
+    
+    def pending(self, name):
+        """An item created earlier in the same batch, so repeated names update it."""
+        return self.to_create.get(name)
+    
+    @transaction.atomic
+    def flush(self):
+        if self.to_create:
+            MenuItem.objects.bulk_create(self.to_create.values(), batch_size=self.batch_size)
+            # MySQL doesn't return ids from bulk_create, so look them up by name
+            names = list(self.to_create)
+            for item_id, name in MenuItem.objects.filter(
+                caterer=self.caterer, name__in=names
+            ).order_by('id').values_list('id', 'name'):
+                self.ids_by_name[name] = item_id
+                self.known_ids.add(item_id)
+                self.saved_rows[item_id] = self.pending_rows[name]
+            self.result.created += len(self.to_create)
+        if self.to_update:
+            # bulk_update doesn't apply auto_now
+            now = timezone.now()
+            for item in self.to_update.values():
+                item.updated_at = now
+            MenuItem.objects.bulk_update(self.to_update.values(), UPDATE_FIELDS, batch_size=self.batch_size)
+            self.result.updated += len(self.to_update)
+        self.to_create = {}
+        self.to_update = {}
+        self.pending_rows = {}
+
+
+def import_menu(caterer, upload, file_format, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Upsert a caterer's menu items from an uploaded CSV or JSONL file.
+    Rows match existing items by id, or else by exact name, and only change
+    the columns they contain. Invalid rows are skipped and reported; valid
+    rows are written in batches.
+    """
+    result = ImportResult()
+    categories = {
+        category.name.lower(): category
+        for category in MenuCategory.objects.filter(is_active=True)
+    }
+    upserter = _MenuUpserter(caterer, result, batch_size)
+    
+    row_number = 1 if file_format == 'csv' else 0
+    try:
+        try:
+            for row_number, row in iter_rows(upload, file_format):
+                _import_row(upserter, categories, row_number, row)
+        except UnicodeDecodeError:
+            result.add_error(row_number + 1, {'__all__': [
+                "The file is not UTF-8 encoded; the rest of it was not imported. "
+                "Save it as UTF-8 (e.g. \"CSV UTF-8\" in Excel) and upload it again."
+            ]})
+        except csv.Error as e:
+            result.add_error(row_number + 1, {'__all__': [f"The rest of the file could not be read: {e}."]})
+        upserter.flush()
+    finally:
+        # bulk writes skip model signals, so refresh the derived data once,
+        # including for batches written before an error
+        if result.created or result.updated:
+            bump_menu_version(id=caterer.id)
+            rebuild_facets(caterer.id)
+            transaction.on_commit(lambda: reindex_caterer(caterer.id))
+    
+    return result
+
+
+def _import_row(upserter, categories, row_number, row):
+    """Validate one parsed row and hand it to the upserter, or record its errors."""
+    result = upserter.result
+    if row is None:
+        result.add_error(row_number, {'__all__': ["Row could not be parsed."]})
+        return
+    
+    name = str(row.get('name') or '').strip()
+    item_id, error = upserter.target_for(row.get('id'), name)
+    if error:
+        result.add_error(row_number, {'id': [error]})
+        return
+    
+    columns = upserter.merged_row(item_id, name, row)
+    data = _form_data(columns)
+    instance = upserter.pending(name) if item_id is None else None
+    if instance is None:
+        instance = MenuItem(id=item_id, caterer=upserter.caterer)
+        # Existing rows: skip the primary key uniqueness query
+        instance._state.adding = item_id is None
+    
+    form_categories = categories
+    if upserter.kept_categories and 'category' not in row:
+        # The item keeps its current category, which may be inactive
+        form_categories = {**upserter.kept_categories, **categories}
+    form = MenuItemImportForm(data, instance=instance, categories=form_categories)
+    if not form.is_valid():
+        result.add_error(row_number, {field: list(messages) for field, messages in form.errors.items()})
+        return
+    upserter.add(form.instance, columns)
+
+
+def _export_values(item):
+    values = {name: getattr(item, name) for name in EXPORT_FIELDS if name != 'category'}
+    values['category'] = item.category.name if item.category else ''
+    values['price'] = str(values['price'])
+    return {name: values[name] for name in EXPORT_FIELDS}
+
+
+def _iter_menu(caterer):
+    # Keyset batches: iterator() doesn't bound memory with mysqlclient
+    return iter_keyset(MenuItem.objects.filter(caterer=caterer).select_related('category'), ('id',), 500)
+
+
+def iter_csv(caterer):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for item in _iter_menu(caterer):
+        values = _export_values(item)
+        yield writer.writerow([values[name] for name in EXPORT_FIELDS])
+
+
+def iter_jsonl(caterer):
+    for item in _iter_menu(caterer):
+        yield json.dumps(_export_values(item), default=str) + '\n'
+
+
+def export_menu_response(caterer, file_format):
+    """Return a StreamingHttpResponse with the caterer's whole menu."""
+    if file_format == 'jsonl':
+        response = StreamingHttpResponse(iter_jsonl(caterer), content_type='application/x-ndjson')
+    else:
+        file_format = 'csv'
+        response = StreamingHttpResponse(iter_csv(caterer), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="menu-{caterer.id}.{file_format}"'
+    return response
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('catering', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('field', models.CharField(choices=[('company_name', 'Company Name'), ('description', 'Description'), ('service_area', 'Service Area'), ('menu_item', 'Menu Item')], max_length=20)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('caterer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='accounts.catererprofile')),
+            ],
+            options={
+                'verbose_name': 'Search Token',
+                'verbose_name_plural': 'Search Tokens',
+                'indexes': [models.Index(fields=['token', 'field'], name='search_token_field_idx')],
+                'unique_together': {('token', 'caterer', 'field')},
+            },
+        ),
+    ]
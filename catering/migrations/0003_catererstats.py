@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_catererprofile_created_at'),
+        ('catering', '0002_searchtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatererStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pending_count', models.IntegerField(default=0)),
+                ('confirmed_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('cancelled_count', models.IntegerField(default=0)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('caterer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='accounts.catererprofile')),
+            ],
+            options={
+                'verbose_name': 'Caterer Stats',
+                'verbose_name_plural': 'Caterer Stats',
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_catererprofile_created_at'),
+        ('catering', '0003_catererstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyUserRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('role', models.CharField(choices=[('customer', 'Customer'), ('caterer', 'Caterer'), ('admin', 'Admin')], max_length=20)),
+                ('new_users', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Daily User Rollup',
+                'verbose_name_plural': 'Daily User Rollups',
+                'ordering': ['-day'],
+                'unique_together': {('day', 'role')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyBookingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('booking_count', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('caterer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='accounts.catererprofile')),
+            ],
+            options={
+                'verbose_name': 'Daily Booking Rollup',
+                'verbose_name_plural': 'Daily Booking Rollups',
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['day', 'status'], name='rollup_day_status_idx')],
+                'unique_together': {('day', 'caterer', 'status')},
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_availability(apps, schema_editor):
+    """Populate the calendar from existing active bookings."""
+    from django.db.models import Count, Sum
+
+    Booking = apps.get_model('catering', 'Booking')
+    CatererAvailability = apps.get_model('catering', 'CatererAvailability')
+
+    totals = (
+        Booking.objects.filter(status__in=['pending', 'confirmed', 'completed'])
+        .values('caterer_id', 'event_date')
+        .annotate(events=Count('id'), guests=Sum('number_of_guests'))
+        .order_by()
+    )
+    CatererAvailability.objects.bulk_create(
+        [
+            CatererAvailability(
+                caterer_id=row['caterer_id'],
+                day=row['event_date'],
+                event_count=row['events'],
+                guest_count=row['guests'] or 0,
+            )
+            for row in totals.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_catererprofile_capacity'),
+        ('catering', '0007_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatererAvailability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('event_count', models.IntegerField(default=0)),
+                ('guest_count', models.IntegerField(default=0)),
+                ('caterer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability', to='accounts.catererprofile')),
+            ],
+            options={
+                'verbose_name': 'Caterer Availability',
+                'verbose_name_plural': 'Caterer Availability',
+                'ordering': ['day'],
+                'unique_together': {('caterer', 'day')},
+            },
+        ),
+        migrations.RunPython(backfill_availability, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:55
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_catererprofile_location'),
+        ('catering', '0008_catereravailability'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='event_latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='event_longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.CreateModel(
+            name='CatererGeoCell',
+            fields=[
+                ('caterer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='geo_cell', serialize=False, to='accounts.catererprofile')),
+                ('cell_lat', models.IntegerField()),
+                ('cell_lng', models.IntegerField()),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('service_radius_km', models.PositiveIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Caterer Geo Cell',
+                'verbose_name_plural': 'Caterer Geo Cells',
+                'indexes': [models.Index(fields=['cell_lat', 'cell_lng'], name='geocell_cell_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_catererprofile_location'),
+        ('catering', '0009_geo_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category_key', models.PositiveIntegerField(default=0)),
+                ('meal_type', models.CharField(choices=[('breakfast', 'Breakfast'), ('lunch', 'Lunch'), ('dinner', 'Dinner'), ('snacks', 'Snacks'), ('dessert', 'Dessert'), ('beverage', 'Beverage')], max_length=20)),
+                ('dietary', models.PositiveSmallIntegerField(default=0)),
+                ('price_bucket', models.PositiveSmallIntegerField(default=0)),
+                ('item_count', models.IntegerField(default=0)),
+                ('caterer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facet_counts', to='accounts.catererprofile')),
+            ],
+            options={
+                'verbose_name': 'Menu Facet Count',
+                'verbose_name_plural': 'Menu Facet Counts',
+                'unique_together': {('caterer', 'category_key', 'meal_type', 'dietary', 'price_bucket')},
+            },
+        ),
+    ]
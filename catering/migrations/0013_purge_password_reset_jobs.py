@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def purge_password_reset_jobs(apps, schema_editor):
+    """
+    Delete catering.send_email jobs: their payloads hold rendered password
+    reset emails, including live reset links. Users can request a new link.
+    """
+    Job = apps.get_model('catering', 'Job')
+    Job.objects.filter(name='catering.send_email').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catering', '0012_dataversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(purge_password_reset_jobs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+from decimal import Decimal
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+
+
+TRACKED_STATUSES = ('pending', 'confirmed', 'completed', 'cancelled')
+
+
+def backfill_caterer_stats(apps, schema_editor):
+    """
+    Recount every caterer with bookings. Rows used to be built on the first
+    dashboard read, so some are missing or missed deltas; from now on the
+    first booking delta creates a caterer's row.
+    """
+    Booking = apps.get_model('catering', 'Booking')
+    CatererStats = apps.get_model('catering', 'CatererStats')
+    aggregates = {
+        f'{status}_count': Count('id', filter=Q(status=status))
+        for status in TRACKED_STATUSES
+    }
+    aggregates['total_revenue'] = Sum('total_amount', filter=Q(status='completed'))
+    totals = Booking.objects.values('caterer_id').annotate(**aggregates).order_by()
+
+    CatererStats.objects.all().delete()
+    rows = []
+    for row in totals.iterator():
+        row['total_revenue'] = row['total_revenue'] or Decimal('0')
+        rows.append(CatererStats(**row))
+    CatererStats.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catering', '0013_purge_password_reset_jobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_caterer_stats, migrations.RunPython.noop),
+    ]
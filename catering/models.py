@@ -64,6 +64,8 @@ class MenuItem(models.Model):
     )
     meal_type = models.CharField(max_length=20, choices=MEAL_TYPE_CHOICES, default='lunch')
     image = models.ImageField(upload_to='menu_images/', blank=True, null=True)
+    # Resized variants of image, maintained by catering.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     is_available = models.BooleanField(default=True)
     is_vegetarian = models.BooleanField(default=False)
     is_vegan = models.BooleanField(default=False)
@@ -79,9 +81,31 @@ class MenuItem(models.Model):
         verbose_name = 'Menu Item'
         verbose_name_plural = 'Menu Items'
         ordering = ['-created_at']
+        indexes = [
+            # caterer_detail / select_menu: available items of one caterer
+            models.Index(fields=['caterer', 'is_available', '-created_at'], name='menuitem_caterer_avail_idx'),
+            # caterer_menu: newest-first keyset pages of one caterer
+            models.Index(fields=['caterer', '-created_at', '-id'], name='menuitem_caterer_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.caterer.company_name}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember loaded values so the facet counters can be moved on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def remember_saved_values(self):
+        """Make the current field values the baseline for the next change."""
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+        }
+        # Keep the image's name: its FieldFile changes in place on image.save()
+        self._loaded_values['image'] = self.image.name
 
 
 class Booking(models.Model):
@@ -111,6 +135,17 @@ class Booking(models.Model):
     event_date = models.DateField()
     event_time = models.TimeField()
     location = models.TextField()
+    # Coordinates of location, when the customer provides them
+    event_latitude = models.FloatField(
+        null=True, 
+        blank=True, 
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    event_longitude = models.FloatField(
+        null=True, 
+        blank=True, 
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
     number_of_guests = models.IntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(10000)]
     )
@@ -125,6 +160,10 @@ class Booking(models.Model):
         decimal_places=2, 
         default=0
     )
+    # Set once the customer places the booking; its menu is then fixed
+    placed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Bumped by every write; catering.lifecycle updates only the version it read
+    version = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -132,10 +171,48 @@ class Booking(models.Model):
         verbose_name = 'Booking'
         verbose_name_plural = 'Bookings'
         ordering = ['-created_at']
+        indexes = [
+            # my_bookings, with and without a status filter
+            models.Index(fields=['customer', '-created_at', '-id'], name='booking_customer_created_idx'),
+            models.Index(fields=['customer', 'status', '-created_at'], name='booking_customer_status_idx'),
+            # catering_bookings / caterer_dashboard, with and without a status filter
+            models.Index(fields=['caterer', '-created_at', '-id'], name='booking_caterer_created_idx'),
+            models.Index(fields=['caterer', 'status', '-created_at'], name='booking_caterer_status_idx'),
+            # admin_dashboard recent bookings
+            models.Index(fields=['-created_at', '-id'], name='booking_created_idx'),
+        ]
     
     def __str__(self):
         return f"Booking #{self.id} - {self.customer.username} - {self.caterer.company_name}"
     
+    def save(self, *args, **kwargs):
+        # Every write moves the version on, so stale lifecycle updates conflict
+        if not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'version'}
+        super().save(*args, **kwargs)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember loaded values so signal handlers can compute deltas."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def remember_saved_values(self):
+        """Make the current field values the baseline for the next change."""
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+        }
+    
+    @property
+    def is_editable(self):
+        """True while the customer may still change the menu selection."""
+        return self.status == 'pending' and self.placed_at is None
+    
     def get_status_class(self):
         """Returns Bootstrap color class for status."""
         status_classes = {
@@ -212,6 +289,284 @@ class Review(models.Model):
         verbose_name = 'Review'
         verbose_name_plural = 'Reviews'
         ordering = ['-created_at']
+        indexes = [
+            # caterer_detail: latest reviews of one caterer
+            models.Index(fields=['caterer', '-created_at'], name='review_caterer_created_idx'),
+        ]
     
     def __str__(self):
         return f"Review by {self.customer.username} for {self.caterer.company_name}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded rating so edits can be applied as a delta."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_rating = (loaded.get('caterer_id'), loaded.get('rating'))
+        return instance
+
+
+class SearchToken(models.Model):
+    """
+    Inverted index entry mapping a search token to a caterer.
+    Maintained by catering.search; do not edit by hand.
+    """
+    
+    # Indexed source fields
+    FIELD_CHOICES = [
+        ('company_name', 'Company Name'),
+        ('description', 'Description'),
+        ('service_area', 'Service Area'),
+        ('menu_item', 'Menu Item'),
+    ]
+    
+    token = models.CharField(max_length=64)
+    caterer = models.ForeignKey(
+        CatererProfile, 
+        on_delete=models.CASCADE, 
+        related_name='search_tokens'
+    )
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    weight = models.PositiveIntegerField(default=1)
+    
+    class Meta:
+        verbose_name = 'Search Token'
+        verbose_name_plural = 'Search Tokens'
+        unique_together = ('token', 'caterer', 'field')
+        indexes = [
+            # Prefix lookups (LIKE 'tok%') can use this index
+            models.Index(fields=['token', 'field'], name='search_token_field_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.token} -> {self.caterer_id} ({self.field})"
+
+
+class CatererStats(models.Model):
+    """
+    Materialized booking statistics for a caterer's dashboard.
+    Kept up to date incrementally by catering.stats.
+    """
+    
+    caterer = models.OneToOneField(
+        CatererProfile, 
+        on_delete=models.CASCADE, 
+        related_name='stats'
+    )
+    pending_count = models.IntegerField(default=0)
+    confirmed_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    cancelled_count = models.IntegerField(default=0)
+    total_revenue = models.DecimalField(
+        max_digits=14, 
+        decimal_places=2, 
+        default=0
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Caterer Stats'
+        verbose_name_plural = 'Caterer Stats'
+    
+    def __str__(self):
+        return f"Stats for caterer #{self.caterer_id}"
+
+
+class DailyBookingRollup(models.Model):
+    """
+    Bookings and revenue per day, caterer and status.
+    Day is the booking's creation date. Maintained by catering.rollups.
+    """
+    
+    day = models.DateField()
+    caterer = models.ForeignKey(
+        CatererProfile, 
+        on_delete=models.CASCADE, 
+        related_name='daily_rollups'
+    )
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    booking_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(
+        max_digits=14, 
+        decimal_places=2, 
+        default=0
+    )
+    
+    class Meta:
+        verbose_name = 'Daily Booking Rollup'
+        verbose_name_plural = 'Daily Booking Rollups'
+        ordering = ['-day']
+        unique_together = ('day', 'caterer', 'status')
+        indexes = [
+            models.Index(fields=['day', 'status'], name='rollup_day_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.day} - caterer #{self.caterer_id} - {self.status}: {self.booking_count}"
+
+
+class DailyUserRollup(models.Model):
+    """
+    New user sign-ups per day and role.
+    Maintained by catering.rollups.
+    """
+    
+    day = models.DateField()
+    role = models.CharField(max_length=20, choices=User.ROLE_CHOICES)
+    new_users = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Daily User Rollup'
+        verbose_name_plural = 'Daily User Rollups'
+        ordering = ['-day']
+        unique_together = ('day', 'role')
+    
+    def __str__(self):
+        return f"{self.day} - {self.role}: {self.new_users}"
+
+
+class CatererAvailability(models.Model):
+    """
+    Capacity used per caterer and event day by active bookings.
+    Maintained incrementally by catering.availability.
+    """
+    
+    caterer = models.ForeignKey(
+        CatererProfile, 
+        on_delete=models.CASCADE, 
+        related_name='availability'
+    )
+    day = models.DateField()
+    event_count = models.IntegerField(default=0)
+    guest_count = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Caterer Availability'
+        verbose_name_plural = 'Caterer Availability'
+        ordering = ['day']
+        # Also serves the month range lookups (caterer, day BETWEEN ...)
+        unique_together = ('caterer', 'day')
+    
+    def __str__(self):
+        return f"Caterer #{self.caterer_id} on {self.day}: {self.event_count} events, {self.guest_count} guests"
+
+
+class CatererGeoCell(models.Model):
+    """
+    Grid cell index of caterer locations for radius searches.
+    One row per located caterer, maintained by catering.geo on save.
+    """
+    
+    caterer = models.OneToOneField(
+        CatererProfile, 
+        on_delete=models.CASCADE, 
+        primary_key=True,
+        related_name='geo_cell'
+    )
+    cell_lat = models.IntegerField()
+    cell_lng = models.IntegerField()
+    # Copied from the profile so candidates are filtered without a join
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    service_radius_km = models.PositiveIntegerField()
+    
+    class Meta:
+        verbose_name = 'Caterer Geo Cell'
+        verbose_name_plural = 'Caterer Geo Cells'
+        indexes = [
+            # Radius search: cell_lat BETWEEN ... AND cell_lng BETWEEN ...
+            models.Index(fields=['cell_lat', 'cell_lng'], name='geocell_cell_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Caterer #{self.caterer_id} in cell ({self.cell_lat}, {self.cell_lng})"
+
+
+class MenuFacetCount(models.Model):
+    """
+    Number of available menu items per caterer and facet combination
+    (category, meal type, dietary flags, price bucket).
+    Maintained incrementally by catering.facets.
+    """
+    
+    caterer = models.ForeignKey(
+        CatererProfile, 
+        on_delete=models.CASCADE, 
+        related_name='facet_counts'
+    )
+    # MenuCategory id, or 0 for uncategorized items
+    category_key = models.PositiveIntegerField(default=0)
+    meal_type = models.CharField(max_length=20, choices=MenuItem.MEAL_TYPE_CHOICES)
+    # Bit mask of catering.facets.DIETARY_FLAGS
+    dietary = models.PositiveSmallIntegerField(default=0)
+    # Index into catering.facets.PRICE_BUCKETS
+    price_bucket = models.PositiveSmallIntegerField(default=0)
+    item_count = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Menu Facet Count'
+        verbose_name_plural = 'Menu Facet Counts'
+        unique_together = ('caterer', 'category_key', 'meal_type', 'dietary', 'price_bucket')
+    
+    def __str__(self):
+        return (
+            f"Caterer #{self.caterer_id} ({self.category_key}, {self.meal_type}, "
+            f"{self.dietary}, {self.price_bucket}): {self.item_count}"
+        )
+
+
+class Job(models.Model):
+    """
+    A background task queued for the run_workers command.
+    Created by catering.jobs.enqueue once the enqueuing transaction commits.
+    """
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        ordering = ['-created_at']
+        indexes = [
+            # Workers poll for due jobs; metrics count recent completions
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+            models.Index(fields=['status', 'finished_at'], name='job_status_finished_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class DataVersion(models.Model):
+    """
+    A version number for a group of data, bumped whenever the data changes.
+    Cache keys and ETags include it, so every process sees an invalidation
+    as soon as the bumping transaction commits. See catering.cache.
+    """
+    
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Data Version'
+        verbose_name_plural = 'Data Versions'
+    
+    def __str__(self):
+        return f"{self.name} v{self.version}"
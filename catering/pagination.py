@@ -0,0 +1,276 @@
+"""
+Keyset (cursor) pagination for the Catering Application.
+Pages are located by the last row's ordering key instead of OFFSET,
+so deep pages cost the same as the first one.
+"""
+
+import bisect
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+CURSOR_PARAM = 'cursor'
+PAGE_SIZE_PARAM = 'page_size'
+CURSOR_SALT = 'catering.pagination'
+
+DEFAULT_ORDERING = ('-created_at', '-id')
+
+
+def get_page_size(request):
+    """Return the requested page size, bounded by the configured maximum."""
+    default = getattr(settings, 'CATERING_PAGE_SIZE', 20)
+    maximum = getattr(settings, 'CATERING_MAX_PAGE_SIZE', 100)
+    try:
+        size = int(request.GET.get(PAGE_SIZE_PARAM, default))
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+def encode_cursor(values, reverse=False):
+    """Return an opaque, signed token for an ordering key."""
+    return signing.dumps({'v': list(values), 'r': reverse}, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token):
+    """
+    Return (values, reverse) for a cursor token.
+    Invalid or tampered tokens decode to (None, False), i.e. the first page.
+    """
+    if not token:
+        return None, False
+    try:
+        data = signing.loads(token, salt=CURSOR_SALT)
+        return list(data['v']), bool(data.get('r'))
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None, False
+
+
+class CursorPage:
+    """
+    One page of results with links to its neighbours.
+    Iterable like a list, so templates can loop over it directly.
+    """
+    
+    def __init__(self, request, items, next_cursor=None, previous_cursor=None):
+        self.request = request
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __bool__(self):
+        return bool(self.items)
+    
+    def __getitem__(self, index):
+        return self.items[index]
+    
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+    
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+    
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+    
+    def _url(self, cursor):
+        params = self.request.GET.copy()
+        params[CURSOR_PARAM] = cursor
+        return f"?{params.urlencode()}"
+    
+    @property
+    def next_url(self):
+        return self._url(self.next_cursor) if self.has_next else None
+    
+    @property
+    def previous_url(self):
+        return self._url(self.previous_cursor) if self.has_previous else None
+
+
+def _parse_ordering(ordering):
+    """Return [(field_name, descending)] for an ordering tuple."""
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def _keyset_condition(fields, values, reverse):
+    """
+    Build the row-comparison filter for rows after (or before) a key.
+    For ('-created_at', '-id') this is:
+    created_at < v0 OR (created_at = v0 AND id < v1)
+    """
+    condition = Q()
+    for position, (name, descending) in enumerate(fields):
+        # Walking backwards flips every comparison
+        lookup = 'lt' if descending != reverse else 'gt'
+        clause = Q(**{f'{name}__{lookup}': values[position]})
+        for prev_position in range(position):
+            clause &= Q(**{fields[prev_position][0]: values[prev_position]})
+        condition |= clause
+    return condition
+
+
+def _key_values(obj, fields):
+    """Return an object's ordering key as JSON-serializable values."""
+    values = []
+    for name, _ in fields:
+        value = getattr(obj, name)
+        values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+    return values
+
+
+def _coerce_values(model, fields, values):
+    """Convert decoded cursor values back to field types, or None if invalid."""
+    if len(values) != len(fields):
+        return None
+    try:
+        return [
+            model._meta.get_field(name).to_python(value)
+            for (name, _), value in zip(fields, values)
+        ]
+    except (FieldDoesNotExist, ValidationError):
+        return None
+
+
+def _keyset_query(request, queryset, ordering, page_size):
+    """Return (sliced queryset, fields, cursor values, reverse) for a keyset page."""
+    fields = _parse_ordering(ordering)
+    values, reverse = decode_cursor(request.GET.get(CURSOR_PARAM))
+    
+    if values is not None:
+        values = _coerce_values(queryset.model, fields, values)
+        if values is None:
+            reverse = False
+    
+    if reverse:
+        order_by = [name[1:] if name.startswith('-') else f'-{name}' for name in ordering]
+    else:
+        order_by = list(ordering)
+    
+    queryset = queryset.order_by(*order_by)
+    if values is not None:
+        queryset = queryset.filter(_keyset_condition(fields, values, reverse))
+    
+    # Fetch one extra row to learn whether another page exists
+    return queryset[:page_size + 1], fields, values, reverse
+
+
+def _keyset_page(request, rows, fields, values, reverse, page_size):
+    """Build the CursorPage for rows fetched by _keyset_query."""
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    
+    if reverse:
+        rows.reverse()
+        has_next = values is not None
+        has_previous = has_more
+    else:
+        has_next = has_more
+        has_previous = values is not None
+    
+    next_cursor = previous_cursor = None
+    if rows and has_next:
+        next_cursor = encode_cursor(_key_values(rows[-1], fields))
+    if rows and has_previous:
+        previous_cursor = encode_cursor(_key_values(rows[0], fields), reverse=True)
+    
+    return CursorPage(request, rows, next_cursor, previous_cursor)
+
+
+def paginate_queryset(request, queryset, ordering=DEFAULT_ORDERING, page_size=None):
+    """
+    Return a CursorPage for queryset ordered by ordering.
+    The last field of ordering must be unique (normally the primary key).
+    """
+    page_size = page_size or get_page_size(request)
+    queryset, fields, values, reverse = _keyset_query(request, queryset, ordering, page_size)
+    return _keyset_page(request, list(queryset), fields, values, reverse, page_size)
+
+
+async def apaginate_queryset(request, queryset, ordering=DEFAULT_ORDERING, page_size=None):
+    """Async version of paginate_queryset for async views."""
+    page_size = page_size or get_page_size(request)
+    queryset, fields, values, reverse = _keyset_query(request, queryset, ordering, page_size)
+    rows = [row async for row in queryset]
+    return _keyset_page(request, rows, fields, values, reverse, page_size)
+
+
+def iter_keyset(queryset, ordering=DEFAULT_ORDERING, batch_size=1000):
+    """
+    Yield every row of queryset in ordering, fetching one keyset batch per
+    query. Unlike QuerySet.iterator(), memory stays bounded on drivers that
+    buffer whole result sets (mysqlclient), and prefetch_related lookups run
+    once per batch. The last field of ordering must be unique.
+    """
+    fields = _parse_ordering(ordering)
+    queryset = queryset.order_by(*ordering)
+    values = None
+    while True:
+        batch = queryset if values is None else queryset.filter(_keyset_condition(fields, values, False))
+        rows = list(batch[:batch_size])
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        values = [getattr(rows[-1], name) for name, _ in fields]
+
+
+def _ranked_slice(request, ranked, page_size):
+    """Return (keys on the page, start, end, total keys) for ranked results."""
+    values, reverse = decode_cursor(request.GET.get(CURSOR_PARAM))
+    keys = [(-score, pk) for pk, score in ranked]
+    
+    start = 0
+    if values is not None and len(values) == 2:
+        key = (-values[0], values[1])
+        if reverse:
+            start = max(0, bisect.bisect_left(keys, key) - page_size)
+        else:
+            start = bisect.bisect_right(keys, key)
+    end = start + page_size
+    
+    return keys[start:end], start, end, len(keys)
+
+
+def _ranked_page(request, page_keys, objects, start, end, total):
+    """Build the CursorPage for ranked results from loaded objects."""
+    # Rows that disappeared since ranking (e.g. deactivated) are skipped
+    rows = [objects[pk] for _, pk in page_keys if pk in objects]
+    
+    next_cursor = previous_cursor = None
+    if page_keys and end < total:
+        score, pk = page_keys[-1]
+        next_cursor = encode_cursor([-score, pk])
+    if page_keys and start > 0:
+        score, pk = page_keys[0]
+        previous_cursor = encode_cursor([-score, pk], reverse=True)
+    
+    return CursorPage(request, rows, next_cursor, previous_cursor)
+
+
+def paginate_ranked(request, ranked, queryset, page_size=None):
+    """
+    Return a CursorPage over ranked [(id, score)] results, best first.
+    Only the rows on the requested page are loaded from queryset.
+    """
+    page_size = page_size or get_page_size(request)
+    page_keys, start, end, total = _ranked_slice(request, ranked, page_size)
+    objects = queryset.in_bulk([pk for _, pk in page_keys])
+    return _ranked_page(request, page_keys, objects, start, end, total)
+
+
+async def apaginate_ranked(request, ranked, queryset, page_size=None):
+    """Async version of paginate_ranked for async views."""
+    page_size = page_size or get_page_size(request)
+    page_keys, start, end, total = _ranked_slice(request, ranked, page_size)
+    objects = await queryset.ain_bulk([pk for _, pk in page_keys])
+    return _ranked_page(request, page_keys, objects, start, end, total)
@@ -0,0 +1,88 @@
+"""
+Query plan checks for the Catering Application.
+Runs EXPLAIN on the query shapes used by the hot views and reports any
+that fall back to a full table scan. Supports SQLite and MySQL.
+"""
+
+from django.db import connection
+from accounts.models import CatererProfile
+from .models import MenuItem, Booking, BookingItem, Review, SearchToken
+from .search import prefix_condition
+
+
+# Placeholder ids: plans depend on the query shape, not on the data
+SAMPLE_ID = 1
+
+
+def hot_queries():
+    """
+    Return [(name, queryset)] mirroring the queries in catering/views.py.
+    """
+    return [
+        ('home: featured caterers',
+         CatererProfile.objects.filter(is_verified=True).order_by('-total_bookings')[:6]),
+        ('caterer_list: first page',
+         CatererProfile.objects.filter(user__is_active=True).order_by('-created_at', '-id')[:21]),
+        ('caterer_list: search token prefix',
+         SearchToken.objects.filter(prefix_condition('pasta') | prefix_condition('rome'))),
+        ('caterer_detail: available menu',
+         MenuItem.objects.filter(caterer_id=SAMPLE_ID, is_available=True)),
+        ('caterer_detail: latest reviews',
+         Review.objects.filter(caterer_id=SAMPLE_ID).order_by('-created_at')[:5]),
+        ('caterer_menu: first page',
+         MenuItem.objects.filter(caterer_id=SAMPLE_ID).order_by('-created_at', '-id')[:21]),
+        ('my_bookings: first page',
+         Booking.objects.filter(customer_id=SAMPLE_ID).order_by('-created_at', '-id')[:21]),
+        ('my_bookings: by status',
+         Booking.objects.filter(customer_id=SAMPLE_ID, status='pending').order_by('-created_at', '-id')[:21]),
+        ('catering_bookings: first page',
+         Booking.objects.filter(caterer_id=SAMPLE_ID).order_by('-created_at', '-id')[:21]),
+        ('catering_bookings: by status',
+         Booking.objects.filter(caterer_id=SAMPLE_ID, status='pending').order_by('-created_at', '-id')[:21]),
+        ('caterer_dashboard: recent bookings',
+         Booking.objects.filter(caterer_id=SAMPLE_ID).order_by('-created_at')[:10]),
+        ('admin_dashboard: recent bookings',
+         Booking.objects.order_by('-created_at')[:10]),
+        ('select_menu: booking items',
+         BookingItem.objects.filter(booking_id=SAMPLE_ID)),
+    ]
+
+
+def explain(queryset):
+    """
+    Return a list of plan rows for a queryset as dicts.
+    SQLite rows have a 'detail' key; MySQL rows have 'table', 'type' and 'key'.
+    """
+    sql, params = queryset.query.sql_with_params()
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        columns = [column[0].lower() for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def full_scans(queryset):
+    """Return the plan steps that read the queried table without an index."""
+    table = queryset.model._meta.db_table
+    rows = explain(queryset)
+    
+    if connection.vendor == 'sqlite':
+        # "SCAN tbl" is a table scan; "SCAN tbl USING [COVERING] INDEX ..." walks an index
+        return [
+            row['detail'] for row in rows
+            if row['detail'] in (f'SCAN {table}', f'SCAN TABLE {table}')
+        ]
+    if connection.vendor == 'mysql':
+        return [
+            f"{row['table']}: type={row['type']}" for row in rows
+            if row.get('table') == table and row.get('type') == 'ALL'
+        ]
+    raise NotImplementedError(f"Query plan checks are not supported on {connection.vendor}.")
+
+
+def check_hot_queries():
+    """
+    Return [(name, problems)] for every hot query.
+    An empty problems list means the query is served by an index.
+    """
+    return [(name, full_scans(queryset)) for name, queryset in hot_queries()]
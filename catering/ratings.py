@@ -0,0 +1,110 @@
+"""
+Caterer ratings for the Catering Application.
+Keeps CatererProfile.rating_sum/rating_count (and the rating average) in
+step with reviews under a row lock, and reconciles drift.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import transaction
+from django.db.models import Count, Sum
+from accounts.models import CatererProfile
+from .cache import bump_caterer_list_version
+from .models import Review
+
+
+def apply_rating_change(caterer_id, sum_delta, count_delta):
+    """
+    Add to a caterer's rating totals and recompute the average.
+    The totals are read under a row lock and the average is rounded with
+    average(), the same way reconcile_ratings computes it.
+    """
+    if not sum_delta and not count_delta:
+        return
+    
+    with transaction.atomic():
+        totals = (
+            CatererProfile.objects.select_for_update()
+            .filter(id=caterer_id)
+            .values_list('rating_sum', 'rating_count')
+            .first()
+        )
+        if totals is None:
+            return
+        rating_sum = totals[0] + sum_delta
+        rating_count = totals[1] + count_delta
+        CatererProfile.objects.filter(id=caterer_id).update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=average(rating_sum, rating_count)
+        )
+    # update() skips the profile's post_save
+    bump_caterer_list_version()
+
+
+def review_saved(review, created):
+    """Apply a new or edited review to its caterer's rating."""
+    if created:
+        apply_rating_change(review.caterer_id, review.rating, 1)
+    else:
+        old_caterer_id, old_rating = getattr(review, '_loaded_rating', (None, None))
+        if old_caterer_id is None or old_rating is None:
+            # Previous values unknown: rebuild this caterer's totals
+            reconcile_ratings([review.caterer_id])
+        elif old_caterer_id != review.caterer_id:
+            apply_rating_change(old_caterer_id, -old_rating, -1)
+            apply_rating_change(review.caterer_id, review.rating, 1)
+        else:
+            apply_rating_change(review.caterer_id, review.rating - old_rating, 0)
+    review._loaded_rating = (review.caterer_id, review.rating)
+
+
+def review_deleted(review):
+    """Remove a deleted review from its caterer's rating."""
+    caterer_id, rating = getattr(review, '_loaded_rating', (None, None))
+    if caterer_id is None or rating is None:
+        caterer_id, rating = review.caterer_id, review.rating
+    apply_rating_change(caterer_id, -rating, -1)
+
+
+def average(rating_sum, rating_count):
+    """Return the rounded average rating for stored totals."""
+    if not rating_count:
+        return Decimal('0')
+    return (Decimal(rating_sum) / rating_count).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def reconcile_ratings(caterer_ids=None, dry_run=False):
+    """
+    Recompute rating totals from Review rows and fix any drift.
+    Returns [(caterer_id, (stored sum, count, rating), (actual sum, count, rating))]
+    for every caterer that was out of sync.
+    """
+    reviews = Review.objects.all()
+    caterers = CatererProfile.objects.only('id', 'rating', 'rating_sum', 'rating_count')
+    if caterer_ids is not None:
+        reviews = reviews.filter(caterer_id__in=caterer_ids)
+        caterers = caterers.filter(id__in=caterer_ids)
+    
+    actual = {
+        row['caterer_id']: (row['total'], row['count'])
+        for row in reviews.values('caterer_id').annotate(
+            total=Sum('rating'), count=Count('id')
+        ).order_by()
+    }
+    
+    drifted = []
+    for caterer in caterers.iterator():
+        rating_sum, rating_count = actual.get(caterer.id, (0, 0))
+        rating = average(rating_sum, rating_count)
+        stored = (caterer.rating_sum, caterer.rating_count, caterer.rating)
+        if stored == (rating_sum, rating_count, rating):
+            continue
+        drifted.append((caterer.id, stored, (rating_sum, rating_count, rating)))
+        if not dry_run:
+            CatererProfile.objects.filter(id=caterer.id).update(
+                rating_sum=rating_sum, rating_count=rating_count, rating=rating
+            )
+    if drifted and not dry_run:
+        bump_caterer_list_version()
+    
+    return drifted
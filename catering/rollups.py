@@ -0,0 +1,214 @@
+"""
+Platform analytics rollups for the Catering Application.
+Keeps daily booking/revenue and sign-up buckets so the admin dashboard
+reads a few rows per day instead of scanning Booking and User.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from accounts.models import User
+from .counters import increment
+from .models import Booking, DailyBookingRollup, DailyUserRollup
+
+
+REVENUE_STATUS = 'completed'
+
+
+def _day(value):
+    """Return the local calendar day of a datetime."""
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def _booking_bucket(values):
+    """Return (bucket key, revenue) for booking values, or None if unknown."""
+    if not {'created_at', 'caterer_id', 'status', 'total_amount'} <= values.keys():
+        return None
+    key = {
+        'day': _day(values['created_at']),
+        'caterer_id': values['caterer_id'],
+        'status': values['status'],
+    }
+    return key, values['total_amount'] or Decimal('0')
+
+
+def _current_values(booking):
+    return {
+        'created_at': booking.created_at,
+        'caterer_id': booking.caterer_id,
+        'status': booking.status,
+        'total_amount': booking.total_amount,
+    }
+
+
+def booking_saved(booking, created):
+    """Move a saved booking between daily buckets."""
+    new_key, new_amount = _booking_bucket(_current_values(booking))
+    
+    if not created:
+        old = _booking_bucket(getattr(booking, '_loaded_values', None) or {})
+        if old is None:
+            # Previous values unknown (deferred load); rebuild_rollups repairs this
+            return
+        old_key, old_amount = old
+        if old_key == new_key and old_amount == new_amount:
+            return
+        increment(DailyBookingRollup, old_key, booking_count=-1, revenue=-old_amount, create=False)
+    
+    increment(DailyBookingRollup, new_key, booking_count=1, revenue=new_amount)
+
+
+def booking_amount_changed(booking, delta):
+    """Apply a total_amount change made with queryset.update()."""
+    key, _ = _booking_bucket(_current_values(booking))
+    increment(DailyBookingRollup, key, revenue=delta)
+
+
+def booking_deleted(booking):
+    """Remove a deleted booking from its daily bucket."""
+    values = getattr(booking, '_loaded_values', None) or {}
+    bucket = _booking_bucket(values) or _booking_bucket(_current_values(booking))
+    key, amount = bucket
+    # Never create buckets here: the caterer may be mid-cascade delete
+    increment(DailyBookingRollup, key, booking_count=-1, revenue=-amount, create=False)
+
+
+def user_created(user):
+    """Count a new sign-up."""
+    increment(DailyUserRollup, {'day': _day(user.date_joined), 'role': user.role}, new_users=1)
+
+
+def _loaded_role(user):
+    """The role the user had when loaded, or None if unknown."""
+    return (getattr(user, '_loaded_values', None) or {}).get('role')
+
+
+def user_role_changed(user, update_fields=None):
+    """Move a user whose role changed to the new role's sign-up bucket."""
+    if update_fields is not None and 'role' not in update_fields:
+        return
+    old_role = _loaded_role(user)
+    if old_role is None or old_role == user.role:
+        # Unchanged, or unknown (deferred load); rebuild_rollups repairs this
+        return
+    day = _day(user.date_joined)
+    increment(DailyUserRollup, {'day': day, 'role': old_role}, new_users=-1, create=False)
+    increment(DailyUserRollup, {'day': day, 'role': user.role}, new_users=1)
+
+
+def user_deleted(user):
+    """Remove a deleted user from its sign-up bucket."""
+    role = _loaded_role(user) or user.role
+    increment(DailyUserRollup, {'day': _day(user.date_joined), 'role': role}, new_users=-1, create=False)
+
+
+@transaction.atomic
+def rebuild_rollups():
+    """
+    Rebuild every rollup bucket from Booking and User history.
+    Returns (booking buckets, user buckets) written.
+    """
+    DailyBookingRollup.objects.all().delete()
+    DailyUserRollup.objects.all().delete()
+    
+    booking_rows = (
+        Booking.objects
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'caterer_id', 'status')
+        .annotate(booking_count=Count('id'), revenue=Sum('total_amount'))
+        .order_by()
+    )
+    DailyBookingRollup.objects.bulk_create(
+        [
+            DailyBookingRollup(
+                day=row['day'],
+                caterer_id=row['caterer_id'],
+                status=row['status'],
+                booking_count=row['booking_count'],
+                revenue=row['revenue'] or 0,
+            )
+            for row in booking_rows.iterator()
+        ],
+        batch_size=1000
+    )
+    
+    user_rows = (
+        User.objects
+        .annotate(day=TruncDate('date_joined'))
+        .values('day', 'role')
+        .annotate(new_users=Count('id'))
+        .order_by()
+    )
+    DailyUserRollup.objects.bulk_create(
+        [DailyUserRollup(**row) for row in user_rows.iterator()],
+        batch_size=1000
+    )
+    
+    return DailyBookingRollup.objects.count(), DailyUserRollup.objects.count()
+
+
+def platform_totals():
+    """Return all-time platform totals from the rollup tables."""
+    totals = DailyBookingRollup.objects.aggregate(
+        total_bookings=Sum('booking_count'),
+        total_revenue=Sum('revenue', filter=Q(status=REVENUE_STATUS)),
+    )
+    users = DailyUserRollup.objects.aggregate(
+        total_users=Sum('new_users'),
+        total_customers=Sum('new_users', filter=Q(role='customer')),
+    )
+    
+    return {
+        'total_bookings': totals['total_bookings'] or 0,
+        'total_revenue': totals['total_revenue'] or Decimal('0'),
+        'total_users': users['total_users'] or 0,
+        'total_customers': users['total_customers'] or 0,
+    }
+
+
+def bookings_by_status():
+    """Return [{'status': ..., 'count': ...}] across all bookings."""
+    return list(
+        DailyBookingRollup.objects
+        .values('status')
+        .annotate(count=Sum('booking_count'))
+        .filter(count__gt=0)
+        .order_by('status')
+    )
+
+
+def daily_trend(start, end, caterer_id=None):
+    """
+    Return one row per day in [start, end] with bookings, revenue and sign-ups.
+    Days without activity are filled with zeros.
+    """
+    bookings = DailyBookingRollup.objects.filter(day__range=(start, end))
+    if caterer_id is not None:
+        bookings = bookings.filter(caterer_id=caterer_id)
+    
+    series = defaultdict(lambda: {'bookings': 0, 'revenue': Decimal('0'), 'new_users': 0, 'by_status': {}})
+    for row in bookings.values('day', 'status').annotate(
+        count=Sum('booking_count'), revenue=Sum('revenue')
+    ).order_by():
+        bucket = series[row['day']]
+        bucket['bookings'] += row['count']
+        bucket['by_status'][row['status']] = row['count']
+        if row['status'] == REVENUE_STATUS:
+            bucket['revenue'] += row['revenue']
+    
+    if caterer_id is None:
+        for row in DailyUserRollup.objects.filter(day__range=(start, end)).values('day').annotate(
+            count=Sum('new_users')
+        ).order_by():
+            series[row['day']]['new_users'] = row['count']
+    
+    days = []
+    day = start
+    while day <= end:
+        days.append({'day': day, **series[day]})
+        day += timedelta(days=1)
+    return days
@@ -0,0 +1,242 @@
+"""
+Caterer search for the Catering Application.
+Maintains an inverted index (token -> caterer) and answers ranked prefix queries.
+"""
+
+import re
+from collections import defaultdict
+from django.contrib import messages
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from accounts.models import CatererProfile
+from .cache import bump_caterer_list_version
+from .geo import nearby_caterers, parse_search
+from .models import MenuItem, SearchToken
+
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 64
+
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'is', 'it', 'of', 'on', 'or', 'the', 'to', 'we', 'with', 'our', 'your',
+})
+
+# Relative importance of each indexed field when ranking
+FIELD_WEIGHTS = {
+    'company_name': 5,
+    'service_area': 3,
+    'menu_item': 2,
+    'description': 1,
+}
+
+# Exact token matches rank above prefix matches
+EXACT_MATCH_BONUS = 2
+
+
+def tokenize(text):
+    """Split text into normalized search tokens."""
+    if not text:
+        return []
+    
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if len(token) < MIN_TOKEN_LENGTH or token in STOP_WORDS:
+            continue
+        tokens.append(token[:MAX_TOKEN_LENGTH])
+    return tokens
+
+
+def _count_tokens(counts, field, text):
+    """Add field-weighted token frequencies for text to counts."""
+    for token in tokenize(text):
+        counts[(token, field)] += FIELD_WEIGHTS[field]
+
+
+def build_document(caterer, menu_item_names=None):
+    """
+    Return {(token, field): weight} for a caterer.
+    Menu item names are fetched when not supplied.
+    """
+    if menu_item_names is None:
+        menu_item_names = MenuItem.objects.filter(
+            caterer=caterer,
+            is_available=True
+        ).values_list('name', flat=True)
+    
+    counts = defaultdict(int)
+    _count_tokens(counts, 'company_name', caterer.company_name)
+    _count_tokens(counts, 'description', caterer.description)
+    _count_tokens(counts, 'service_area', caterer.service_area)
+    for name in menu_item_names:
+        _count_tokens(counts, 'menu_item', name)
+    return counts
+
+
+def index_caterer(caterer, menu_item_names=None):
+    """
+    Bring a caterer's index entries up to date.
+    Only tokens that were added, removed or re-weighted are written.
+    """
+    document = build_document(caterer, menu_item_names)
+    
+    existing = {
+        (row.token, row.field): row
+        for row in SearchToken.objects.filter(caterer=caterer)
+    }
+    
+    to_create = []
+    to_update = []
+    for key, weight in document.items():
+        row = existing.pop(key, None)
+        if row is None:
+            to_create.append(SearchToken(token=key[0], field=key[1], caterer=caterer, weight=weight))
+        elif row.weight != weight:
+            row.weight = weight
+            to_update.append(row)
+    
+    with transaction.atomic():
+        if existing:
+            SearchToken.objects.filter(id__in=[row.id for row in existing.values()]).delete()
+        if to_create:
+            SearchToken.objects.bulk_create(to_create)
+        if to_update:
+            SearchToken.objects.bulk_update(to_update, ['weight'])
+        if existing or to_create or to_update:
+            # Searches may now match differently
+            bump_caterer_list_version()
+
+
+def reindex_caterer(caterer_id):
+    """Re-index a caterer by id, ignoring caterers that no longer exist."""
+    caterer = CatererProfile.objects.filter(id=caterer_id).only(
+        'id', 'company_name', 'description', 'service_area'
+    ).first()
+    if caterer is not None:
+        index_caterer(caterer)
+
+
+def rebuild_index(batch_size=500):
+    """
+    Rebuild the whole index from scratch.
+    Returns the number of caterers indexed.
+    """
+    menu_names = defaultdict(list)
+    for caterer_id, name in MenuItem.objects.filter(is_available=True).values_list('caterer_id', 'name').iterator():
+        menu_names[caterer_id].append(name)
+    
+    count = 0
+    rows = []
+    with transaction.atomic():
+        SearchToken.objects.all().delete()
+        for caterer in CatererProfile.objects.only(
+            'id', 'company_name', 'description', 'service_area'
+        ).iterator():
+            document = build_document(caterer, menu_names.get(caterer.id, []))
+            rows.extend(
+                SearchToken(token=token, field=field, caterer_id=caterer.id, weight=weight)
+                for (token, field), weight in document.items()
+            )
+            if len(rows) >= batch_size:
+                SearchToken.objects.bulk_create(rows, batch_size=batch_size)
+                rows = []
+            count += 1
+        if rows:
+            SearchToken.objects.bulk_create(rows, batch_size=batch_size)
+        bump_caterer_list_version()
+    
+    return count
+
+
+def prefix_condition(term):
+    """
+    Return a Q matching tokens that start with term, as a range on token.
+    LIKE 'term%' (startswith/istartswith) scans the table on SQLite and is
+    LIKE BINARY on MySQL; a plain range walks search_token_field_idx on both.
+    """
+    upper = term[:-1] + chr(ord(term[-1]) + 1)
+    return Q(token__gte=term, token__lt=upper)
+
+
+def search_caterers(query, fields=None):
+    """
+    Return [(caterer_id, score)] matching every token of query, best first.
+    Each query token matches index tokens it is a prefix of.
+    Returns None when the query contains no indexable tokens.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return None
+    
+    condition = Q()
+    for term in terms:
+        condition |= prefix_condition(term)
+    
+    rows = SearchToken.objects.filter(condition)
+    if fields:
+        rows = rows.filter(field__in=fields)
+    
+    # caterer_id -> {term: best score for that term}
+    matches = defaultdict(dict)
+    for caterer_id, token, weight in rows.values_list('caterer_id', 'token', 'weight'):
+        for term in terms:
+            if not token.startswith(term):
+                continue
+            score = weight * EXACT_MATCH_BONUS if token == term else weight
+            if score > matches[caterer_id].get(term, 0):
+                matches[caterer_id][term] = score
+    
+    results = [
+        (caterer_id, sum(scores.values()))
+        for caterer_id, scores in matches.items()
+        if len(scores) == len(terms)
+    ]
+    results.sort(key=lambda result: (-result[1], result[0]))
+    return results
+
+
+def rank_caterer_search(request):
+    """
+    Apply the caterer list's ?search=, ?area= and ?lat=&lng=&radius= filters.
+    Returns (scores, distances, point):
+    - scores: [(caterer_id, score)] best first, or None when nothing filters
+      the list;
+    - distances: {caterer_id: km} when searching near a point, else None;
+    - point: (lat, lng, radius_km) or None. An invalid point is reported
+      with messages.error and ignored.
+    Shared by the sync and async caterer_list views.
+    """
+    # caterer_id -> relevance score; None means no filtering
+    scores = None
+    for query, fields in ((request.GET.get('search', ''), None), (request.GET.get('area', ''), ['service_area'])):
+        results = search_caterers(query, fields=fields)
+        if results is None:
+            continue
+        if scores is None:
+            scores = dict(results)
+        else:
+            scores = {
+                caterer_id: score + scores[caterer_id]
+                for caterer_id, score in results
+                if caterer_id in scores
+            }
+    
+    distances = None
+    try:
+        point = parse_search(request.GET)
+    except ValidationError as e:
+        messages.error(request, e.messages[0])
+        point = None
+    if point is not None:
+        distances = dict(nearby_caterers(*point))
+        if scores is None:
+            # Nearest first
+            scores = {caterer_id: -distance for caterer_id, distance in distances.items()}
+        else:
+            scores = {caterer_id: score for caterer_id, score in scores.items() if caterer_id in distances}
+    
+    if scores is not None:
+        scores = sorted(scores.items(), key=lambda result: (-result[1], result[0]))
+    return scores, distances, point
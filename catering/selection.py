@@ -0,0 +1,174 @@
+"""
+Menu selection for bookings in the Catering Application.
+Applies batches of (menu_item_id, quantity) changes in one transaction and
+keeps Booking.total_amount current with F() deltas instead of re-summing.
+"""
+
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from . import rollups, stats
+from .models import Booking, BookingItem, MenuItem
+
+
+# Upper bound on pairs accepted in a single batch
+MAX_BATCH_SIZE = 200
+
+MODE_ADD = 'add'
+MODE_SET = 'set'
+
+
+def adjust_booking_total(booking, delta):
+    """
+    Add delta to a booking's total_amount with an F() expression.
+    Keeps caterer stats, rollups and the in-memory booking in step.
+    """
+    if not delta:
+        return
+    
+    Booking.objects.filter(id=booking.id).update(
+        total_amount=F('total_amount') + delta,
+        version=F('version') + 1,
+        updated_at=timezone.now()
+    )
+    # update() bypasses post_save, so apply the aggregate deltas directly
+    stats.booking_amount_changed(booking, delta)
+    rollups.booking_amount_changed(booking, delta)
+    
+    booking.total_amount = (booking.total_amount or Decimal('0')) + delta
+    booking.version += 1
+    booking.remember_saved_values()
+
+
+def _lock_editable(booking):
+    """
+    Lock the booking row so concurrent changes apply one after another.
+    Raises ValidationError unless the booking is still editable.
+    """
+    row = Booking.objects.select_for_update().filter(
+        id=booking.id
+    ).values('status', 'placed_at', 'version', 'total_amount').first()
+    if row is None or row['status'] != 'pending' or row['placed_at'] is not None:
+        raise ValidationError("This booking cannot be modified.")
+    # Changes committed since the booking was read
+    booking.version = row['version']
+    booking.total_amount = row['total_amount']
+    booking.remember_saved_values()
+
+
+def _normalize(pairs, mode):
+    """
+    Validate pairs and merge duplicates into {menu_item_id: quantity}.
+    """
+    if mode not in (MODE_ADD, MODE_SET):
+        raise ValidationError(f"Unknown mode '{mode}'.")
+    if not pairs:
+        raise ValidationError("No menu items given.")
+    if len(pairs) > MAX_BATCH_SIZE:
+        raise ValidationError(f"At most {MAX_BATCH_SIZE} items can be applied at once.")
+    
+    minimum = 1 if mode == MODE_ADD else 0
+    quantities = {}
+    for menu_item_id, quantity in pairs:
+        try:
+            menu_item_id = int(menu_item_id)
+            quantity = int(quantity)
+        except (TypeError, ValueError):
+            raise ValidationError("Menu item ids and quantities must be integers.")
+        if quantity < minimum:
+            raise ValidationError(f"Quantity must be at least {minimum}.")
+        if mode == MODE_ADD:
+            quantities[menu_item_id] = quantities.get(menu_item_id, 0) + quantity
+        else:
+            quantities[menu_item_id] = quantity
+    return quantities
+
+
+def apply_selection(booking, pairs, mode=MODE_ADD):
+    """
+    Apply (menu_item_id, quantity) pairs to a pending booking.
+    MODE_ADD adds to existing quantities; MODE_SET replaces them and a
+    quantity of 0 removes the item. Returns the total_amount delta.
+    Raises ValidationError without writing anything if any pair is invalid
+    or the booking has been placed.
+    """
+    quantities = _normalize(pairs, mode)
+    
+    with transaction.atomic():
+        _lock_editable(booking)
+        
+        prices = dict(
+            MenuItem.objects.filter(
+                id__in=quantities,
+                caterer_id=booking.caterer_id,
+                is_available=True
+            ).values_list('id', 'price')
+        )
+        missing = sorted(set(quantities) - set(prices))
+        if missing:
+            raise ValidationError(f"Menu items not available from this caterer: {missing}")
+        
+        existing = {
+            item.menu_item_id: item
+            for item in BookingItem.objects.filter(booking_id=booking.id, menu_item_id__in=quantities)
+        }
+        
+        delta = Decimal('0')
+        to_create, to_update, to_delete = [], [], []
+        for menu_item_id, quantity in quantities.items():
+            price = prices[menu_item_id]
+            item = existing.get(menu_item_id)
+            if item is not None:
+                if mode == MODE_ADD:
+                    quantity += item.quantity
+                delta -= item.subtotal
+                if quantity == 0:
+                    to_delete.append(item.id)
+                    continue
+                item.quantity = quantity
+                item.unit_price = price
+                item.subtotal = price * quantity
+                to_update.append(item)
+            elif quantity:
+                item = BookingItem(
+                    booking_id=booking.id,
+                    menu_item_id=menu_item_id,
+                    quantity=quantity,
+                    unit_price=price,
+                    subtotal=price * quantity
+                )
+                to_create.append(item)
+            else:
+                continue
+            delta += item.subtotal
+        
+        if to_delete:
+            BookingItem.objects.filter(id__in=to_delete).delete()
+        if to_create:
+            BookingItem.objects.bulk_create(to_create)
+        if to_update:
+            BookingItem.objects.bulk_update(to_update, ['quantity', 'unit_price', 'subtotal'])
+        
+        adjust_booking_total(booking, delta)
+    
+    return delta
+
+
+def remove_item(item):
+    """
+    Remove a booking item and subtract its subtotal from the booking.
+    Returns False if a concurrent request already removed it.
+    """
+    with transaction.atomic():
+        _lock_editable(item.booking)
+        # Read under the booking lock: the quantity may have changed since
+        subtotal = BookingItem.objects.filter(pk=item.pk).values_list('subtotal', flat=True).first()
+        if subtotal is None:
+            return False
+        deleted, _ = BookingItem.objects.filter(pk=item.pk).delete()
+        if deleted != 1:
+            return False
+        adjust_booking_total(item.booking, -subtotal)
+    return True
@@ -0,0 +1,177 @@
+"""
+Signal handlers for the Catering Application.
+Keeps cached and derived data in sync with model changes.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from accounts.models import User, CatererProfile
+from . import availability, facets, geo, images, ratings, rollups, stats
+from .models import MenuCategory, MenuItem, Booking, Review
+from .cache import bump_caterer_list_version, bump_home_version, bump_menu_version
+from .search import reindex_caterer
+
+
+@receiver(post_save, sender=CatererProfile, dispatch_uid='home_caterer_saved')
+@receiver(post_delete, sender=CatererProfile, dispatch_uid='home_caterer_deleted')
+@receiver(post_save, sender=MenuCategory, dispatch_uid='home_category_saved')
+@receiver(post_delete, sender=MenuCategory, dispatch_uid='home_category_deleted')
+@receiver(post_delete, sender=Booking, dispatch_uid='home_booking_deleted')
+def invalidate_home_data(sender, **kwargs):
+    """Bump the home data version when featured data changes."""
+    bump_home_version()
+
+
+@receiver(post_save, sender=Booking, dispatch_uid='home_booking_saved')
+def invalidate_home_data_on_booking(sender, instance, created, **kwargs):
+    """Bump the home data version when the booking count changes."""
+    # Updates to an existing booking don't affect anything on the home page
+    if created:
+        bump_home_version()
+
+
+@receiver(post_save, sender=CatererProfile, dispatch_uid='caterer_list_caterer_saved')
+@receiver(post_delete, sender=CatererProfile, dispatch_uid='caterer_list_caterer_deleted')
+def invalidate_caterer_list_on_caterer(sender, **kwargs):
+    """Bump the caterer list version when a caterer's card changes."""
+    bump_caterer_list_version()
+
+
+@receiver(post_save, sender=User, dispatch_uid='caterer_list_user_saved')
+def invalidate_caterer_list_on_user(sender, instance, update_fields=None, **kwargs):
+    """Bump the caterer list version when a caterer's username or active flag may have changed."""
+    # Logins only save last_login, which the list doesn't show
+    if instance.is_caterer() and set(update_fields or ()) != {'last_login'}:
+        bump_caterer_list_version()
+
+
+@receiver(post_save, sender=MenuItem, dispatch_uid='menu_item_saved')
+@receiver(post_delete, sender=MenuItem, dispatch_uid='menu_item_deleted')
+def invalidate_menu_on_item_change(sender, instance, **kwargs):
+    """Bump the caterer's menu version when one of its items changes."""
+    # Covers admin list_editable too, which saves each changed row
+    bump_menu_version(id=instance.caterer_id)
+
+
+@receiver(post_save, sender=MenuCategory, dispatch_uid='menu_category_saved')
+@receiver(pre_delete, sender=MenuCategory, dispatch_uid='menu_category_deleted')
+def invalidate_menu_on_category_change(sender, instance, **kwargs):
+    """Bump menu versions of caterers whose items show this category."""
+    # pre_delete: once deleted, the items' category is already nulled
+    bump_menu_version(menu_items__category=instance)
+
+
+def _schedule_reindex(caterer_id):
+    """Re-index a caterer once the current transaction commits."""
+    transaction.on_commit(lambda: reindex_caterer(caterer_id))
+
+
+@receiver(post_save, sender=CatererProfile, dispatch_uid='search_caterer_saved')
+def update_search_index_on_caterer(sender, instance, **kwargs):
+    """Keep the search index in sync with caterer profile text."""
+    _schedule_reindex(instance.id)
+
+
+@receiver(post_save, sender=CatererProfile, dispatch_uid='geo_caterer_saved')
+def update_geo_index_on_caterer(sender, instance, update_fields=None, **kwargs):
+    """Keep the caterer's grid cell in sync with its location."""
+    geo.caterer_saved(instance, update_fields)
+
+
+@receiver(post_save, sender=MenuItem, dispatch_uid='search_menu_item_saved')
+@receiver(post_delete, sender=MenuItem, dispatch_uid='search_menu_item_deleted')
+def update_search_index_on_menu_item(sender, instance, **kwargs):
+    """Keep the search index in sync with menu item names."""
+    _schedule_reindex(instance.caterer_id)
+
+
+@receiver(post_save, sender=MenuItem, dispatch_uid='facets_menu_item_saved')
+def update_derived_data_on_menu_item_save(sender, instance, created, update_fields=None, **kwargs):
+    """Move a saved menu item between facet counters and refresh its image variants."""
+    facets.menu_item_saved(instance, created)
+    # Both compare with the loaded values, so remember the new ones last
+    image_field, manifest_field = _image_fields(sender)
+    images.schedule_refresh(instance, image_field, manifest_field, update_fields)
+    instance.remember_saved_values()
+
+
+@receiver(post_delete, sender=MenuItem, dispatch_uid='facets_menu_item_deleted')
+def update_facets_on_menu_item_delete(sender, instance, **kwargs):
+    """Remove a deleted menu item from the facet counters."""
+    facets.menu_item_deleted(instance)
+
+
+@receiver(pre_delete, sender=MenuCategory, dispatch_uid='facets_category_deleted')
+def update_facets_on_category_delete(sender, instance, **kwargs):
+    """Count a deleted category's items as uncategorized."""
+    facets.category_deleted(instance)
+
+
+@receiver(post_save, sender=Booking, dispatch_uid='aggregates_booking_saved')
+def update_booking_aggregates_on_save(sender, instance, created, **kwargs):
+    """Apply a booking's change to caterer stats, daily rollups and availability."""
+    stats.booking_saved(instance, created)
+    rollups.booking_saved(instance, created)
+    availability.booking_saved(instance, created)
+    instance.remember_saved_values()
+
+
+@receiver(post_delete, sender=Booking, dispatch_uid='aggregates_booking_deleted')
+def update_booking_aggregates_on_delete(sender, instance, **kwargs):
+    """Remove a deleted booking from caterer stats, daily rollups and availability."""
+    stats.booking_deleted(instance)
+    rollups.booking_deleted(instance)
+    availability.booking_deleted(instance)
+
+
+@receiver(post_save, sender=User, dispatch_uid='rollups_user_saved')
+def update_user_rollups_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Count new sign-ups, and role changes, in the daily rollups."""
+    if created:
+        rollups.user_created(instance)
+    else:
+        rollups.user_role_changed(instance, update_fields)
+
+
+@receiver(post_delete, sender=User, dispatch_uid='rollups_user_deleted')
+def update_user_rollups_on_delete(sender, instance, **kwargs):
+    """Remove deleted users from the daily rollups."""
+    rollups.user_deleted(instance)
+
+
+@receiver(post_save, sender=Review, dispatch_uid='ratings_review_saved')
+def update_rating_on_review_save(sender, instance, created, **kwargs):
+    """Apply a new or edited review to the caterer's stored rating."""
+    ratings.review_saved(instance, created)
+
+
+@receiver(post_delete, sender=Review, dispatch_uid='ratings_review_deleted')
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """Remove a deleted review from the caterer's stored rating."""
+    ratings.review_deleted(instance)
+
+
+@receiver(post_save, sender=User, dispatch_uid='images_user_saved')
+def update_image_variants_on_save(sender, instance, update_fields=None, **kwargs):
+    """Generate resized variants when a profile image is uploaded or replaced."""
+    image_field, manifest_field = _image_fields(sender)
+    images.schedule_refresh(instance, image_field, manifest_field, update_fields)
+    # Registered after the rollups handler, which also reads the loaded values
+    instance.remember_saved_values()
+
+
+@receiver(post_delete, sender=MenuItem, dispatch_uid='images_menu_item_deleted')
+@receiver(post_delete, sender=User, dispatch_uid='images_user_deleted')
+def delete_image_variants_on_delete(sender, instance, **kwargs):
+    """Remove generated variants along with their row."""
+    image_field, manifest_field = _image_fields(sender)
+    images.discard_variants(instance, image_field, manifest_field)
+
+
+def _image_fields(model):
+    """Return (image field, manifest field) for a model with image variants."""
+    for (label, image_field), manifest_field in images.IMAGE_FIELDS.items():
+        if label == model._meta.label:
+            return image_field, manifest_field
+    raise KeyError(model._meta.label)
@@ -0,0 +1,162 @@
+"""
+Caterer dashboard statistics for the Catering Application.
+Computes booking counts and revenue in one query, and keeps the optional
+CatererStats row in sync as bookings change. A caterer's row is created by
+the first booking delta (migration 0014 backfilled existing caterers), so
+reads never write.
+"""
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import Count, Q, Sum
+from .counters import increment
+from .models import Booking, CatererStats
+
+
+# Statuses tracked by CatererStats (each has a <status>_count column)
+TRACKED_STATUSES = ('pending', 'confirmed', 'completed', 'cancelled')
+
+# Only completed bookings count towards revenue
+REVENUE_STATUS = 'completed'
+
+
+def materialized_stats_enabled():
+    """Return True when dashboards read from CatererStats rows."""
+    return getattr(settings, 'CATERING_MATERIALIZED_STATS', True)
+
+
+def compute_caterer_stats(caterer_id, using=None):
+    """
+    Return booking counts and revenue for a caterer.
+    Uses a single conditional-aggregation query, on the database alias
+    using if given.
+    """
+    aggregates = {
+        f'{status}_count': Count('id', filter=Q(status=status))
+        for status in TRACKED_STATUSES
+    }
+    aggregates['total_revenue'] = Sum('total_amount', filter=Q(status=REVENUE_STATUS))
+    
+    stats = Booking.objects.using(using).filter(caterer_id=caterer_id).aggregate(**aggregates)
+    stats['total_revenue'] = stats['total_revenue'] or Decimal('0')
+    return stats
+
+
+@transaction.atomic
+def refresh_caterer_stats(caterer_id):
+    """
+    Recompute and store the CatererStats row for a caterer.
+    The row is locked before the bookings are counted, so deltas from
+    concurrent booking changes wait and then apply on top of the result.
+    """
+    # Lock (or create) first: on MySQL the snapshot read by the aggregate
+    # starts at its first plain SELECT, which must come after the lock
+    stats = CatererStats.objects.select_for_update().filter(caterer_id=caterer_id).first()
+    if stats is None:
+        try:
+            with transaction.atomic():
+                stats = CatererStats.objects.create(caterer_id=caterer_id)
+        except IntegrityError:
+            stats = CatererStats.objects.select_for_update().get(caterer_id=caterer_id)
+    
+    for field, value in compute_caterer_stats(caterer_id, using=DEFAULT_DB_ALIAS).items():
+        setattr(stats, field, value)
+    stats.save()
+    return stats
+
+
+def get_caterer_stats(caterer_id):
+    """
+    Return dashboard statistics as a dict.
+    Reads the materialized row when enabled. A caterer without a row has
+    had no bookings since the backfill, so its stats are aggregated
+    without storing them.
+    """
+    if not materialized_stats_enabled():
+        return compute_caterer_stats(caterer_id)
+    
+    fields = [f'{status}_count' for status in TRACKED_STATUSES] + ['total_revenue']
+    stats = CatererStats.objects.filter(caterer_id=caterer_id).values(*fields).first()
+    if stats is None:
+        stats = compute_caterer_stats(caterer_id)
+    return stats
+
+
+def _contribution(status, amount):
+    """Return the stats columns a single booking contributes to."""
+    contribution = {}
+    if status in TRACKED_STATUSES:
+        contribution[f'{status}_count'] = 1
+    if status == REVENUE_STATUS:
+        contribution['total_revenue'] = amount or Decimal('0')
+    return contribution
+
+
+def _apply_delta(caterer_id, delta):
+    """Add delta to a caterer's stats row, creating it on the first booking."""
+    increment(CatererStats, {'caterer_id': caterer_id}, **delta)
+
+
+def record_booking_change(old, new):
+    """
+    Update CatererStats for a booking change.
+    old and new are (caterer_id, status, total_amount) tuples, or None when
+    the booking was created or deleted.
+    """
+    if not materialized_stats_enabled() or old == new:
+        return
+    
+    deltas = {}
+    if old is not None:
+        caterer_id, status, amount = old
+        delta = deltas.setdefault(caterer_id, {})
+        for field, value in _contribution(status, amount).items():
+            delta[field] = delta.get(field, 0) - value
+    if new is not None:
+        caterer_id, status, amount = new
+        delta = deltas.setdefault(caterer_id, {})
+        for field, value in _contribution(status, amount).items():
+            delta[field] = delta.get(field, 0) + value
+    
+    for caterer_id, delta in deltas.items():
+        _apply_delta(caterer_id, delta)
+
+
+def booking_state(booking, loaded=False):
+    """
+    Return the (caterer_id, status, total_amount) tuple tracked for a booking.
+    With loaded=True, return the values it had when read from the database.
+    """
+    if loaded:
+        values = getattr(booking, '_loaded_values', None)
+        # Unknown when the booking wasn't loaded or these fields were deferred
+        if values is None or not {'caterer_id', 'status', 'total_amount'} <= values.keys():
+            return None
+        return (values['caterer_id'], values['status'], values['total_amount'])
+    return (booking.caterer_id, booking.status, booking.total_amount)
+
+
+def booking_saved(booking, created):
+    """Apply a saved booking's change to its caterer's stats."""
+    if not materialized_stats_enabled():
+        return
+    
+    old = None if created else booking_state(booking, loaded=True)
+    if old is None and not created:
+        # Previous values unknown: recount under the row lock
+        refresh_caterer_stats(booking.caterer_id)
+    else:
+        record_booking_change(old, booking_state(booking))
+
+
+def booking_deleted(booking):
+    """Remove a deleted booking from its caterer's stats."""
+    old = booking_state(booking, loaded=True) or booking_state(booking)
+    record_booking_change(old, None)
+
+
+def booking_amount_changed(booking, delta):
+    """Apply a total_amount change made with queryset.update()."""
+    if materialized_stats_enabled() and booking.status == REVENUE_STATUS:
+        _apply_delta(booking.caterer_id, {'total_revenue': delta})
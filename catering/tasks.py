@@ -0,0 +1,36 @@
+"""
+Background tasks for the Catering Application.
+Run by `manage.py run_workers`; enqueue with <task>.enqueue(**payload).
+"""
+
+from django.apps import apps
+from accounts.models import CatererProfile
+from . import images
+from .jobs import task
+from .models import Booking
+
+
+@task('catering.recount_total_bookings')
+def recount_total_bookings(caterer_id):
+    """Recount a caterer's confirmed and completed bookings."""
+    caterer = CatererProfile.objects.filter(id=caterer_id).first()
+    if caterer is None:
+        return
+    caterer.total_bookings = Booking.objects.filter(
+        caterer_id=caterer_id,
+        status__in=['confirmed', 'completed']
+    ).count()
+    # Only write total_bookings so concurrent rating updates aren't overwritten
+    caterer.save(update_fields=['total_bookings'])
+
+
+@task('catering.refresh_image_variants')
+def refresh_image_variants(model, pk, image_field, manifest_field):
+    """Generate resized variants for one uploaded image."""
+    images.refresh_variants(apps.get_model(model), pk, image_field, manifest_field)
+
+
+@task('catering.discard_image_variants')
+def discard_image_variants(model, image_field, manifest):
+    """Delete a removed row's variants unless another row still uses the file."""
+    images.discard_manifest(apps.get_model(model), image_field, manifest)
@@ -0,0 +1,51 @@
+"""
+Template tags for responsive images.
+Usage: {% load catering_images %}{% responsive_image item "image" sizes="96px" alt=item.name %}
+"""
+
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+from ..images import IMAGE_FIELDS, srcset
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(instance, field='image', sizes='100vw', **attrs):
+    """
+    Render a <picture> with WebP and JPEG srcsets for an image field.
+    Falls back to a plain <img> of the original until variants exist.
+    Extra keyword arguments (alt, class, ...) become <img> attributes.
+    """
+    image = getattr(instance, field, None)
+    if not image:
+        return ''
+    
+    manifest_field = IMAGE_FIELDS.get((instance._meta.label, field))
+    manifest = getattr(instance, manifest_field, None) if manifest_field else None
+    variants = (manifest or {}).get('variants', {})
+    
+    attrs.setdefault('alt', '')
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    
+    if not variants.get('jpeg') or manifest.get('source') != image.name:
+        return format_html('<img src="{}"{}>', image.url, flatatt(attrs))
+    
+    # Intrinsic size lets the browser reserve space before the image loads
+    attrs.setdefault('width', manifest['width'])
+    attrs.setdefault('height', manifest['height'])
+    largest = variants['jpeg'][-1][1]
+    
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}"{}></picture>',
+        srcset(manifest, 'webp'),
+        sizes,
+        image.storage.url(largest),
+        srcset(manifest, 'jpeg'),
+        sizes,
+        flatatt(attrs)
+    )
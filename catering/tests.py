@@ -0,0 +1,472 @@
+"""
+Tests for the Catering Application.
+Run with `python manage.py test catering`.
+"""
+
+import csv
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import time, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from time import sleep
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from accounts.models import CatererProfile, User
+from smartcater.metrics import get_query_budget
+from .availability import reserve
+from .benchmark import SKIPPED_VIEWS, VIEW_ROLES, _build_url, _sample_objects, _url_names
+from .exports import export_bookings_queryset, iter_bookings_csv
+from .jobs import claim_jobs, prune_jobs, queue_stats, release_stale_jobs, run_job
+from .menu_io import import_menu
+from .lifecycle import CATERER, CUSTOMER, BookingConflict, change_status, place_booking
+from .models import Booking, BookingItem, CatererAvailability, CatererStats, Job, MenuItem, Review
+from .query_plans import check_hot_queries
+from .ratings import reconcile_ratings
+from .selection import apply_selection, remove_item
+from .rollups import platform_totals
+from .search import rebuild_index
+from .stats import get_caterer_stats
+
+
+class QueryBudgetTests(TestCase):
+    """Every view with a query budget stays within it (N+1 regressions fail here)."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'generate_synthetic_data', caterers=3, customers=4, bookings=30, menu_items=8,
+            prefix='budget', stdout=StringIO()
+        )
+        User.objects.create_user('budget_admin', password='x', role='admin')
+        # Enough items on the sample booking for a per-item query to exceed budgets
+        booking = Booking.objects.get(id=_sample_objects()['kwargs']['booking_id'])
+        for menu_item in MenuItem.objects.filter(caterer=booking.caterer).exclude(bookingitem__booking=booking)[:6]:
+            BookingItem.objects.create(booking=booking, menu_item=menu_item, quantity=1, unit_price=menu_item.price)
+    
+    def setUp(self):
+        # Cached pages would hide the queries of a cold request
+        cache.clear()
+        self.samples = _sample_objects()
+        self.samples['admin'] = User.objects.get(username='budget_admin')
+    
+    def _check_budgets(self):
+        checked = 0
+        for name in _url_names():
+            if name in SKIPPED_VIEWS:
+                continue
+            url = _build_url(name, self.samples['kwargs'])
+            if get_query_budget(resolve(url)) is None:
+                continue
+            
+            role = VIEW_ROLES.get(name)
+            if role is not None:
+                self.client.force_login(self.samples[role])
+            with self.subTest(view=name):
+                # Twice: cold caches and one-off session writes, then the warm path
+                for _ in range(2):
+                    response = self.client.get(url)
+                    self.assertLess(response.status_code, 500)
+            self.client.logout()
+            checked += 1
+        self.assertGreater(checked, 0)
+    
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_views_within_query_budgets(self):
+        self._check_budgets()
+    
+    @override_settings(QUERY_BUDGET_STRICT=True, ROOT_URLCONF='smartcater.urls_async')
+    def test_async_views_within_query_budgets(self):
+        self._check_budgets()
+
+
+class QueryPlanTests(TestCase):
+    """The hot view queries are served by indexes (see check_query_plans)."""
+    
+    def test_hot_queries_use_indexes(self):
+        for name, problems in check_hot_queries():
+            with self.subTest(query=name):
+                self.assertEqual(problems, [])
+
+
+@override_settings(DEBUG=False, METRICS_TOKEN='scrape-secret', METRICS_ALLOWED_IPS=[])
+class MetricsAccessTests(TestCase):
+    """/metrics/ is limited to staff users and METRICS_TOKEN bearers."""
+    
+    def test_local_address_is_not_trusted(self):
+        # The test client connects from 127.0.0.1, like a same-host reverse proxy
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+    
+    def test_token_and_staff_allowed(self):
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.client.force_login(User.objects.create_user('metrics_staff', password='x', is_staff=True))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+
+def _create_caterer(username, **capacity):
+    user = User.objects.create_user(username, password='x', role='caterer')
+    return CatererProfile.objects.create(user=user, company_name=f"{username} Catering", **capacity)
+
+
+def _new_booking(customer, caterer, day, guests=10):
+    return Booking(
+        customer=customer, caterer=caterer, event_name='Test event', event_date=day,
+        event_time=time(18), location='Test hall', number_of_guests=guests, total_amount=Decimal('25.00')
+    )
+
+
+class BookingLifecycleTests(TestCase):
+    """Concurrent status changes conflict instead of overwriting each other."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.caterer = _create_caterer('lifecycle_caterer')
+        cls.customer = User.objects.create_user('lifecycle_customer', password='x', role='customer')
+    
+    def setUp(self):
+        booking = _new_booking(self.customer, self.caterer, timezone.localdate() + timedelta(days=30))
+        booking.save()
+        self.booking_id = booking.id
+    
+    def _load(self):
+        return Booking.objects.get(id=self.booking_id)
+    
+    def test_cancel_after_confirm_conflicts(self):
+        # Caterer and customer both load the pending booking
+        as_caterer, as_customer = self._load(), self._load()
+        change_status(as_caterer, 'confirmed', CATERER)
+        with self.assertRaises(BookingConflict):
+            change_status(as_customer, 'cancelled', CUSTOMER)
+        
+        booking = self._load()
+        self.assertEqual(booking.status, 'confirmed')
+        self.assertEqual(booking.version, 1)
+        # The loser's instance still shows what it read
+        self.assertEqual(as_customer.status, 'pending')
+    
+    def test_stale_form_version_conflicts(self):
+        booking = self._load()
+        change_status(self._load(), 'confirmed', CATERER)
+        # The form was rendered before the change
+        with self.assertRaises(BookingConflict):
+            change_status(self._load(), 'completed', CATERER, version=booking.version)
+        self.assertEqual(self._load().status, 'confirmed')
+    
+    def test_disallowed_transition_is_rejected(self):
+        change_status(self._load(), 'confirmed', CATERER)
+        with self.assertRaises(ValidationError) as raised:
+            change_status(self._load(), 'cancelled', CUSTOMER)
+        self.assertNotIsInstance(raised.exception, BookingConflict)
+    
+    def test_double_place_multiplies_total_once(self):
+        first, second = self._load(), self._load()
+        place_booking(first)
+        with self.assertRaises(BookingConflict):
+            place_booking(second)
+        self.assertEqual(self._load().total_amount, Decimal('250.00'))
+
+
+class ReservationRaceTests(TransactionTestCase):
+    """Concurrent bookings for one day never exceed the caterer's capacity."""
+    
+    WORKERS = 6
+    
+    def _race(self, caterer, day, guests):
+        """Book the same day from WORKERS threads at once, as create_booking does."""
+        customers = [
+            User.objects.create_user(f'race_customer_{number}', password='x', role='customer')
+            for number in range(self.WORKERS)
+        ]
+        barrier = threading.Barrier(self.WORKERS)
+        
+        def book(customer):
+            barrier.wait()
+            try:
+                for _ in range(100):
+                    booking = _new_booking(customer, caterer, day, guests)
+                    try:
+                        with transaction.atomic():
+                            reserve(caterer, day, guests)
+                            booking.save()
+                    except ValidationError:
+                        return 'full'
+                    except OperationalError:
+                        # SQLite refuses concurrent writers instead of queueing
+                        # them behind the row lock; try again like a resubmit
+                        sleep(0.01)
+                    else:
+                        return 'booked'
+                return 'locked'
+            finally:
+                connection.close()
+        
+        with ThreadPoolExecutor(self.WORKERS) as pool:
+            outcomes = list(pool.map(book, customers))
+        self.assertNotIn('locked', outcomes)
+        self.assertIn('booked', outcomes)
+        self.assertIn('full', outcomes)
+        return Booking.objects.filter(caterer=caterer, event_date=day)
+    
+    def test_event_limit_is_not_exceeded(self):
+        caterer = _create_caterer('race_events', max_events_per_day=2)
+        day = timezone.localdate() + timedelta(days=30)
+        bookings = self._race(caterer, day, guests=10)
+        
+        self.assertLessEqual(bookings.count(), 2)
+        slot = CatererAvailability.objects.get(caterer=caterer, day=day)
+        self.assertEqual(slot.event_count, bookings.count())
+    
+    def test_guest_limit_is_not_exceeded(self):
+        caterer = _create_caterer('race_guests', max_guests_per_day=100)
+        day = timezone.localdate() + timedelta(days=30)
+        bookings = self._race(caterer, day, guests=40)
+        
+        self.assertLessEqual(sum(booking.number_of_guests for booking in bookings), 100)
+        slot = CatererAvailability.objects.get(caterer=caterer, day=day)
+        self.assertEqual(slot.guest_count, sum(booking.number_of_guests for booking in bookings))
+
+
+class BookingExportTests(TestCase):
+    """Booking exports can't smuggle spreadsheet formulas."""
+    
+    def test_formula_cells_are_neutralised(self):
+        caterer = _create_caterer('export_caterer')
+        customer = User.objects.create_user('export_customer', password='x', role='customer')
+        booking = _new_booking(customer, caterer, timezone.localdate(), guests=12)
+        booking.event_name = '=HYPERLINK("http://example.com","Open")'
+        booking.location = '@SUM(A1)'
+        booking.save()
+        
+        lines = list(iter_bookings_csv(export_bookings_queryset(caterer_id=caterer.id)))
+        header, row = csv.reader(lines)
+        row = dict(zip(header, row))
+        self.assertEqual(row['event_name'], '\'=HYPERLINK("http://example.com","Open")')
+        self.assertEqual(row['location'], "'@SUM(A1)")
+        self.assertEqual(row['number_of_guests'], '12')
+    
+    def test_keyset_batches_cover_every_booking_once(self):
+        caterer = _create_caterer('batch_caterer')
+        customer = User.objects.create_user('batch_customer', password='x', role='customer')
+        created_at = timezone.now()
+        for _ in range(7):
+            booking = _new_booking(customer, caterer, timezone.localdate())
+            # Equal timestamps: batches must continue on the id tiebreaker
+            booking.created_at = created_at
+            booking.save()
+        
+        lines = list(iter_bookings_csv(export_bookings_queryset(caterer_id=caterer.id), chunk_size=3))
+        ids = [int(row[0]) for row in csv.reader(lines[1:])]
+        self.assertEqual(ids, sorted(Booking.objects.filter(caterer=caterer).values_list('id', flat=True), reverse=True))
+
+
+@override_settings(JOBS_RUN_INLINE=False)
+class ImageRefreshJobTests(TestCase):
+    """Saves only queue variant jobs when the image changes."""
+    
+    def _refresh_jobs(self, save):
+        with self.captureOnCommitCallbacks(execute=True):
+            save()
+        return Job.objects.filter(name='catering.refresh_image_variants').count()
+    
+    def test_unchanged_or_default_image_queues_nothing(self):
+        self.assertEqual(self._refresh_jobs(lambda: User.objects.create_user('image_user', password='x')), 0)
+        
+        user = User.objects.get(username='image_user')
+        user.last_login = timezone.now()
+        self.assertEqual(self._refresh_jobs(lambda: user.save(update_fields=['last_login'])), 0)
+        user.first_name = 'Changed'
+        self.assertEqual(self._refresh_jobs(user.save), 0)
+    
+    def test_new_image_queues_one_job(self):
+        user = User.objects.create_user('image_uploader', password='x')
+        user = User.objects.get(id=user.id)
+        user.profile_image = 'profile_images/new.png'
+        self.assertEqual(self._refresh_jobs(user.save), 1)
+        # The instance now holds the new image as its baseline
+        self.assertEqual(self._refresh_jobs(user.save), 1)
+
+
+class JobQueueTests(TestCase):
+    """Finished jobs are pruned and a requeued job's old run can't overwrite it."""
+    
+    def test_prune_keeps_recent_and_unfinished_jobs(self):
+        old = timezone.now() - timedelta(days=30)
+        Job.objects.create(name='old', status='succeeded', finished_at=old)
+        Job.objects.create(name='old', status='failed', finished_at=old)
+        recent = Job.objects.create(name='recent', status='succeeded', finished_at=timezone.now())
+        queued = Job.objects.create(name='queued')
+        
+        with override_settings(JOB_RETENTION_DAYS=7):
+            self.assertEqual(prune_jobs(batch_size=1), 2)
+        self.assertEqual(set(Job.objects.values_list('id', flat=True)), {recent.id, queued.id})
+        self.assertEqual(queue_stats()['counts'], {'queued': 1, 'running': 0, 'failed': 0})
+    
+    def test_stale_run_does_not_record_outcome(self):
+        Job.objects.create(name='catering.refresh_image_variants', payload={'model': 'missing'})
+        job = claim_jobs('slow-worker')[0]
+        # The slow worker's lock expires and another worker claims the job
+        Job.objects.filter(id=job.id).update(started_at=timezone.now() - timedelta(days=1))
+        with override_settings(JOB_LOCK_TIMEOUT=60):
+            self.assertEqual(release_stale_jobs(), 1)
+        claim_jobs('other-worker')
+        
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.last_error), ('running', 'other-worker', ''))
+
+
+class MenuSelectionTests(TestCase):
+    """Concurrent selection changes keep the booking total exact."""
+    
+    def test_double_remove_subtracts_once(self):
+        caterer = _create_caterer('selection_caterer')
+        customer = User.objects.create_user('selection_customer', password='x', role='customer')
+        menu_item = MenuItem.objects.create(
+            caterer=caterer, name='Soup', description='Soup', price=Decimal('4.50'), meal_type='lunch'
+        )
+        booking = _new_booking(customer, caterer, timezone.localdate() + timedelta(days=30))
+        booking.total_amount = Decimal('0')
+        booking.save()
+        apply_selection(booking, [(menu_item.id, 2)])
+        
+        # Two requests load the item before either removes it
+        first, second = (BookingItem.objects.select_related('booking').get(booking=booking) for _ in range(2))
+        self.assertTrue(remove_item(first))
+        self.assertFalse(remove_item(second))
+        self.assertEqual(Booking.objects.get(id=booking.id).total_amount, Decimal('0.00'))
+        # The stale instance was refreshed under the lock
+        self.assertEqual(second.booking.total_amount, Decimal('0.00'))
+
+
+class CatererStatsTests(TestCase):
+    """The materialized stats row follows every booking change."""
+    
+    def setUp(self):
+        self.caterer = _create_caterer('stats_caterer')
+        self.customer = User.objects.create_user('stats_customer', password='x', role='customer')
+    
+    def test_reads_do_not_write(self):
+        self.assertEqual(get_caterer_stats(self.caterer.id)['pending_count'], 0)
+        self.assertFalse(CatererStats.objects.filter(caterer=self.caterer).exists())
+    
+    def test_first_booking_creates_row(self):
+        day = timezone.localdate() + timedelta(days=30)
+        _new_booking(self.customer, self.caterer, day).save()
+        booking = _new_booking(self.customer, self.caterer, day)
+        booking.save()
+        # Saved without its loaded values: recounted instead of applied as a delta
+        booking = Booking.objects.only('id', 'caterer_id').get(id=booking.id)
+        booking.status = 'cancelled'
+        booking.save()
+        
+        stats = get_caterer_stats(self.caterer.id)
+        self.assertEqual((stats['pending_count'], stats['cancelled_count']), (1, 1))
+
+
+class RatingTests(TestCase):
+    """The stored average is rounded like reconcile_ratings rounds it."""
+    
+    def test_half_way_average_does_not_drift(self):
+        caterer = _create_caterer('rating_caterer')
+        customer = User.objects.create_user('rating_customer', password='x', role='customer')
+        day = timezone.localdate() + timedelta(days=30)
+        # 33 / 8 = 4.125, half way between two stored values
+        for rating in (5, 4, 4, 4, 4, 4, 4, 4):
+            booking = _new_booking(customer, caterer, day)
+            booking.save()
+            Review.objects.create(booking=booking, customer=customer, caterer=caterer, rating=rating)
+        
+        caterer.refresh_from_db()
+        self.assertEqual(caterer.rating, Decimal('4.13'))
+        self.assertEqual(reconcile_ratings([caterer.id], dry_run=True), [])
+
+
+class MenuImportTests(TestCase):
+    """Bulk imports update only what the file contains and report bad files."""
+    
+    def setUp(self):
+        self.caterer = _create_caterer('import_caterer')
+        self.item = MenuItem.objects.create(
+            caterer=self.caterer, name='Tart', description='Apple tart', price=Decimal('6.00'),
+            meal_type='dessert', is_vegan=True, preparation_time=45
+        )
+    
+    def _import(self, content, file_format='csv'):
+        return import_menu(self.caterer, SimpleUploadedFile(f'menu.{file_format}', content), file_format)
+    
+    def test_missing_columns_keep_existing_values(self):
+        result = self._import(b'name,price\nTart,7.25\n')
+        self.assertEqual((result.updated, result.failed), (1, 0))
+        
+        item = MenuItem.objects.get(id=self.item.id)
+        self.assertEqual(item.price, Decimal('7.25'))
+        self.assertEqual((item.description, item.is_vegan, item.preparation_time), ('Apple tart', True, 45))
+    
+    def test_non_utf8_file_is_reported(self):
+        content = 'name,description,price,meal_type\nCrème brûlée,Custard,5,dessert\n'.encode('cp1252')
+        result = self._import(content)
+        self.assertEqual((result.created, result.failed), (0, 1))
+        self.assertIn('UTF-8', result.errors[0]['errors']['__all__'][0])
+
+
+class AdminAnalyticsTests(TestCase):
+    """Admin dashboard totals follow role changes; bad trend dates are rejected."""
+    
+    def test_role_change_moves_user_between_buckets(self):
+        User.objects.create_user('rollup_user', password='x', role='customer')
+        self.assertEqual(platform_totals()['total_customers'], 1)
+        
+        user = User.objects.get(username='rollup_user')
+        user.role = 'caterer'
+        user.save()
+        self.assertEqual(platform_totals()['total_customers'], 0)
+        # Saving again from the same instance moves nothing
+        user.save()
+        user.delete()
+        self.assertEqual(platform_totals()['total_users'], 0)
+    
+    def test_invalid_trend_date_is_rejected(self):
+        User.objects.create_user('rollup_admin', password='x', role='admin')
+        self.client.login(username='rollup_admin', password='x')
+        self.assertEqual(self.client.get(reverse('admin_dashboard_trends'), {'end': '2024-02-30'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('admin_dashboard'), {'end': '2024-02-30'}).status_code, 302)
+
+
+class CatererSearchTests(TestCase):
+    """The sync and async caterer lists rank alike; nearby results skip inactive caterers."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        # Closest first: the nearest caterer is deactivated below
+        for number, offset in enumerate((0.001, 0.01, 0.02)):
+            _create_caterer(
+                f'nearby_{number}', service_area='Harbour district', latitude=12.97 + offset, longitude=77.59
+            )
+        User.objects.filter(username='nearby_0').update(is_active=False)
+        # Index updates wait for a commit that TestCase never makes
+        rebuild_index()
+    
+    def test_sync_and_async_lists_match(self):
+        params = {'search': 'nearby', 'area': 'harbour', 'lat': '12.97', 'lng': '77.59', 'radius': '10'}
+        names = []
+        for urlconf in ('smartcater.urls', 'smartcater.urls_async'):
+            with self.settings(ROOT_URLCONF=urlconf):
+                response = self.client.get(reverse('caterer_list'), params)
+            names.append([caterer.company_name for caterer in response.context['caterers']])
+        self.assertEqual(names[0], ['nearby_1 Catering', 'nearby_2 Catering'])
+        self.assertEqual(names[0], names[1])
+    
+    def test_nearby_limit_counts_active_caterers_only(self):
+        with mock.patch('catering.views.NEARBY_RESULTS_LIMIT', 1):
+            response = self.client.get(reverse('caterers_nearby'), {'lat': '12.97', 'lng': '77.59'})
+        self.assertEqual([result['company_name'] for result in response.json()['results']], ['nearby_1 Catering'])
@@ -15,10 +15,14 @@ urlpatterns = [
     # Caterer URLs
     path('caterers/', views.caterer_list, name='caterer_list'),
     path('caterer/<int:caterer_id>/', views.caterer_detail, name='caterer_detail'),
+    path('caterer/<int:caterer_id>/availability/', views.caterer_availability, name='caterer_availability'),
+    path('caterers/nearby/', views.caterers_nearby, name='caterers_nearby'),
+    path('menu/search/', views.search_dishes, name='search_dishes'),
     
     # Booking URLs (Customer)
     path('booking/create/<int:caterer_id>/', views.create_booking, name='create_booking'),
     path('booking/<int:booking_id>/select-menu/', views.select_menu, name='select_menu'),
+    path('booking/<int:booking_id>/select-menu/batch/', views.select_menu_batch, name='select_menu_batch'),
     path('booking/item/<int:item_id>/remove/', views.remove_booking_item, name='remove_booking_item'),
     path('booking/<int:booking_id>/confirm/', views.confirm_booking, name='confirm_booking'),
     path('booking/<int:booking_id>/confirmation/', views.booking_confirmation, name='booking_confirmation'),
@@ -31,13 +35,17 @@ urlpatterns = [
     path('caterer/dashboard/', views.caterer_dashboard, name='caterer_dashboard'),
     path('caterer/menu/', views.caterer_menu, name='caterer_menu'),
     path('caterer/menu/add/', views.add_menu_item, name='add_menu_item'),
+    path('caterer/menu/import/', views.import_menu_items, name='import_menu'),
+    path('caterer/menu/export/', views.export_menu_items, name='export_menu'),
     path('caterer/menu/<int:item_id>/edit/', views.edit_menu_item, name='edit_menu_item'),
     path('caterer/menu/<int:item_id>/delete/', views.delete_menu_item, name='delete_menu_item'),
     path('caterer/categories/', views.manage_categories, name='manage_categories'),
     path('caterer/category/add/', views.add_category, name='add_category'),
     path('caterer/bookings/', views.catering_bookings, name='catering_bookings'),
+    path('bookings/export/', views.export_bookings, name='export_bookings'),
     path('caterer/booking/<int:booking_id>/status/', views.update_booking_status, name='update_booking_status'),
     
     # Admin Dashboard
     path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
+    path('admin-dashboard/trends/', views.admin_dashboard_trends, name='admin_dashboard_trends'),
 ]
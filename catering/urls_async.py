@@ -0,0 +1,21 @@
+"""
+Async URL Configuration for Catering Application.
+Same routes as urls.py with the read-heavy views swapped for async_views.
+"""
+
+from django.urls import path
+from . import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+ASYNC_VIEWS = {
+    'home': async_views.home,
+    'caterer_list': async_views.caterer_list,
+    'caterer_detail': async_views.caterer_detail,
+    'my_bookings': async_views.my_bookings,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name], name=pattern.name)
+    if pattern.name in ASYNC_VIEWS else pattern
+    for pattern in sync_urlpatterns
+]
@@ -4,52 +4,63 @@ Handles menu browsing, booking, and catering management views.
 """
 
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse
-from django.db.models import Q, Count, Sum, Avg
+from django.db import router, transaction
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
-from datetime import date, datetime
+from django.utils.dateparse import parse_date
+from django.core.exceptions import ValidationError
+from datetime import date, datetime, timedelta
+import json
 from .models import MenuItem, MenuCategory, Booking, BookingItem, Review
+from .availability import month_calendar, reserve
+from .cache import get_home_data, get_menu
+from .conditional import conditional_page, home_state, caterer_list_state, caterer_detail_state
+from .exports import bookings_export_response, export_bookings_queryset
+from .facets import DIETARY_FLAGS, DishSearch
+from .geo import DEFAULT_SEARCH_RADIUS_KM, SEARCH_RADIUS_CHOICES, nearby_caterers, parse_search, serves
+from .lifecycle import CATERER, CUSTOMER, can_change_status, change_status, place_booking, transitions_from
+from .menu_io import EXPORT_FIELDS, export_menu_response, import_menu
+from .search import rank_caterer_search
+from .pagination import paginate_queryset, paginate_ranked
+from .stats import get_caterer_stats
+from .rollups import platform_totals, bookings_by_status, daily_trend
+from .selection import apply_selection, remove_item, MODE_ADD
+from .tasks import recount_total_bookings
 from .forms import (
     MenuItemForm, MenuCategoryForm, BookingForm, 
-    BookingStatusForm, BookingItemForm, ReviewForm, CatererSearchForm
+    BookingStatusForm, BookingItemForm, ReviewForm, CatererSearchForm,
+    MenuImportForm
 )
-from accounts.models import CatererProfile, User
+from accounts.access import can_view_booking, caterer_profile_id, has_role, owns, role_required
+from accounts.models import CatererProfile
+from smartcater.metrics import query_budget
 
 
+@query_budget(5)
+@conditional_page(home_state)
 def home(request):
     """
     Home page view.
     Displays featured caterers and welcome message.
     """
-    # Get featured caterers (verified ones with bookings)
-    featured_caterers = CatererProfile.objects.filter(
-        is_verified=True
-    ).order_by('-total_bookings')[:6]
-    
-    # Get all active menu categories
-    categories = MenuCategory.objects.filter(is_active=True)
-    
-    # Statistics for the dashboard
-    total_caterers = CatererProfile.objects.count()
-    total_bookings = Booking.objects.count()
-    
-    context = {
-        'featured_caterers': featured_caterers,
-        'categories': categories,
-        'total_caterers': total_caterers,
-        'total_bookings': total_bookings,
-    }
+    # Featured caterers, categories and statistics are served from a
+    # versioned cache that is invalidated by model signals
+    context = get_home_data(getattr(request, 'home_version', None))
     
     return render(request, 'catering/home.html', context)
 
 
+@query_budget(6)
+@conditional_page(caterer_list_state)
 def caterer_list(request):
     """
     View to list all caterers.
     Allows filtering by search and service area.
+    Matching goes through the search index and results are ranked by relevance.
     """
     caterers = CatererProfile.objects.filter(
         user__is_active=True
@@ -58,24 +69,32 @@ def caterer_list(request):
     search_query = request.GET.get('search', '')
     area_query = request.GET.get('area', '')
     
-    if search_query:
-        caterers = caterers.filter(
-            Q(company_name__icontains=search_query) |
-            Q(description__icontains=search_query)
-        )
+    # Ranked by relevance (or distance); distances only when searching near a point
+    scores, distances, point = rank_caterer_search(request)
+    if scores is not None:
+        page = paginate_ranked(request, scores, caterers)
+    else:
+        page = paginate_queryset(request, caterers)
     
-    if area_query:
-        caterers = caterers.filter(service_area__icontains=area_query)
+    if distances is not None:
+        for caterer in page:
+            caterer.distance_km = distances.get(caterer.id)
     
     context = {
-        'caterers': caterers,
+        'caterers': page,
+        'page': page,
         'search_query': search_query,
         'area_query': area_query,
+        'point': point,
+        'radius': point[2] if point else DEFAULT_SEARCH_RADIUS_KM,
+        'radius_choices': SEARCH_RADIUS_CHOICES,
     }
     
     return render(request, 'catering/caterer_list.html', context)
 
 
+@query_budget(8)
+@conditional_page(caterer_detail_state)
 def caterer_detail(request, caterer_id):
     """
     View to display caterer details and menu.
@@ -85,24 +104,14 @@ def caterer_detail(request, caterer_id):
         id=caterer_id
     )
     
-    # Get menu items grouped by category
-    menu_items = MenuItem.objects.filter(
-        caterer=caterer,
-        is_available=True
-    ).select_related('category')
-    
-    # Group by meal type
-    menu_by_meal = {}
-    for item in menu_items:
-        if item.meal_type not in menu_by_meal:
-            menu_by_meal[item.meal_type] = []
-        menu_by_meal[item.meal_type].append(item)
+    # Menu grouped by meal type, cached per caterer menu version
+    menu_by_meal = get_menu(caterer)['by_meal']
     
     # Get reviews
     reviews = Review.objects.filter(caterer=caterer).select_related('customer')[:5]
     
-    # Calculate average rating
-    avg_rating = Review.objects.filter(caterer=caterer).aggregate(Avg('rating'))['rating__avg']
+    # Average rating is maintained on the profile as reviews change
+    avg_rating = caterer.rating if caterer.rating_count else None
     
     context = {
         'caterer': caterer,
@@ -114,15 +123,117 @@ def caterer_detail(request, caterer_id):
     return render(request, 'catering/caterer_detail.html', context)
 
 
-@login_required
+@query_budget(1)
+def caterer_availability(request, caterer_id):
+    """
+    JSON availability calendar for one month of a caterer.
+    Accepts ?month=YYYY-MM and defaults to the current month.
+    """
+    month_param = request.GET.get('month')
+    if month_param:
+        try:
+            month_start = datetime.strptime(month_param, '%Y-%m').date()
+        except ValueError:
+            return JsonResponse({'error': 'month must be in YYYY-MM format.'}, status=400)
+    else:
+        month_start = timezone.localdate()
+    
+    data = month_calendar(caterer_id, month_start.year, month_start.month)
+    if data is None:
+        return JsonResponse({'error': 'Caterer not found.'}, status=404)
+    
+    return JsonResponse(data)
+
+
+NEARBY_RESULTS_LIMIT = 50
+
+
+@query_budget(2)
+def caterers_nearby(request):
+    """
+    JSON list of caterers within ?radius= km (default 25) of ?lat=&lng=,
+    nearest first. Only caterers whose service radius reaches the point
+    are listed unless ?all=1.
+    """
+    try:
+        point = parse_search(request.GET)
+    except ValidationError as e:
+        return JsonResponse({'error': e.messages[0]}, status=400)
+    if point is None:
+        return JsonResponse({'error': 'lat and lng are required.'}, status=400)
+    
+    results = nearby_caterers(*point, serving_only=request.GET.get('all') != '1')
+    # Drop inactive caterers before limiting, so they don't use up places
+    caterers = CatererProfile.objects.filter(
+        user__is_active=True
+    ).only(
+        'id', 'company_name', 'service_area', 'rating', 'service_radius_km'
+    ).in_bulk([caterer_id for caterer_id, _ in results])
+    results = [result for result in results if result[0] in caterers][:NEARBY_RESULTS_LIMIT]
+    
+    return JsonResponse({
+        'lat': point[0],
+        'lng': point[1],
+        'radius_km': point[2],
+        'results': [
+            {
+                'id': caterer_id,
+                'company_name': caterers[caterer_id].company_name,
+                'service_area': caterers[caterer_id].service_area,
+                'rating': str(caterers[caterer_id].rating),
+                'distance_km': distance,
+                'service_radius_km': caterers[caterer_id].service_radius_km,
+                'url': reverse('caterer_detail', args=[caterer_id]),
+            }
+            for caterer_id, distance in results
+        ],
+    })
+
+
+@query_budget(4)
+def search_dishes(request):
+    """
+    JSON dish search across all caterers, with facet counts per category,
+    meal type, price bucket and dietary flag. See DishSearch for the
+    query parameters; results use cursor pagination.
+    """
+    try:
+        search = DishSearch(request.GET)
+    except ValidationError as e:
+        return JsonResponse({'error': e.messages[0]}, status=400)
+    
+    total, facets = search.facets()
+    page = paginate_queryset(request, search.items())
+    
+    return JsonResponse({
+        'count': total,
+        'results': [
+            {
+                'id': item.id,
+                'name': item.name,
+                'price': str(item.price),
+                'meal_type': item.meal_type,
+                'category': item.category.name if item.category else None,
+                'dietary': [name for name, field, _, _ in DIETARY_FLAGS if getattr(item, field)],
+                'caterer': {
+                    'id': item.caterer_id,
+                    'company_name': item.caterer.company_name,
+                    'url': reverse('caterer_detail', args=[item.caterer_id]),
+                },
+            }
+            for item in page
+        ],
+        'facets': facets,
+        'next': page.next_url,
+        'previous': page.previous_url,
+    })
+
+
+@role_required('customer', "Only customers can make bookings.")
 def create_booking(request, caterer_id):
     """
     View to create a new booking.
     """
-    if not request.user.is_customer:
-        messages.error(request, "Only customers can make bookings.")
-        return redirect('home')
-    
     caterer = get_object_or_404(CatererProfile, id=caterer_id)
     
     if request.method == 'POST':
@@ -131,10 +242,21 @@ def create_booking(request, caterer_id):
             booking = form.save(commit=False)
             booking.customer = request.user
             booking.caterer = caterer
-            booking.save()
-            
-            # Redirect to menu selection
-            return redirect('select_menu', booking_id=booking.id)
+            if not serves(caterer, booking.event_latitude, booking.event_longitude):
+                form.add_error(
+                    'location', f"{caterer.company_name} only serves events within {caterer.service_radius_km} km."
+                )
+            else:
+                try:
+                    # The day's availability row stays locked until the booking is saved
+                    with transaction.atomic():
+                        reserve(caterer, booking.event_date, booking.number_of_guests)
+                        booking.save()
+                except ValidationError as e:
+                    form.add_error('event_date', e)
+                else:
+                    # Redirect to menu selection
+                    return redirect('select_menu', booking_id=booking.id)
     else:
         form = BookingForm()
     
@@ -146,62 +268,49 @@ def create_booking(request, caterer_id):
     return render(request, 'catering/create_booking.html', context)
 
 
+@query_budget(10)
 @login_required
 def select_menu(request, booking_id):
     """
     View to select menu items for a booking.
     """
-    booking = get_object_or_404(Booking, id=booking_id, customer=request.user)
+    booking = get_object_or_404(
+        Booking.objects.select_related('caterer'),
+        id=booking_id,
+        customer=request.user
+    )
     
-    # Check if booking is still pending
-    if booking.status != 'pending':
+    # Check if booking is still pending and not yet placed
+    if not booking.is_editable:
         messages.error(request, "This booking cannot be modified.")
         return redirect('my_bookings')
     
-    # Get caterer's available menu items
-    menu_items = MenuItem.objects.filter(
-        caterer=booking.caterer,
-        is_available=True
-    ).select_related('category')
+    # Caterer's available menu items, cached per menu version
+    menu_items = get_menu(booking.caterer)['items']
     
     # Get already selected items
     selected_items = BookingItem.objects.filter(booking=booking).select_related('menu_item')
     
     if request.method == 'POST':
         menu_item_id = request.POST.get('menu_item_id')
-        quantity = int(request.POST.get('quantity', 1))
+        quantity = request.POST.get('quantity', 1)
         
         if menu_item_id:
             menu_item = get_object_or_404(MenuItem, id=menu_item_id, caterer=booking.caterer)
             
-            # Check if item already in booking
-            existing_item = BookingItem.objects.filter(
-                booking=booking,
-                menu_item=menu_item
-            ).first()
-            
-            if existing_item:
-                existing_item.quantity += quantity
-                existing_item.save()
+            try:
+                apply_selection(booking, [(menu_item.id, quantity)])
+            except ValidationError as e:
+                messages.error(request, e.messages[0])
             else:
-                BookingItem.objects.create(
-                    booking=booking,
-                    menu_item=menu_item,
-                    quantity=quantity
-                )
-            
-            messages.success(request, f"Added {menu_item.name} to your booking.")
-    
-    # Calculate total
-    total = sum(item.subtotal for item in selected_items)
-    booking.total_amount = total
-    booking.save()
+                messages.success(request, f"Added {menu_item.name} to your booking.")
     
+    # Total is maintained incrementally, so GET requests don't write
     context = {
         'booking': booking,
         'menu_items': menu_items,
         'selected_items': selected_items,
-        'total': total,
+        'total': booking.total_amount,
     }
     
     return render(request, 'catering/select_menu.html', context)
@@ -212,29 +321,73 @@ def remove_booking_item(request, item_id):
     """
     View to remove an item from booking.
     """
-    item = get_object_or_404(BookingItem, id=item_id)
+    item = get_object_or_404(BookingItem.objects.select_related('booking'), id=item_id)
     booking = item.booking
     
     # Verify ownership
-    if booking.customer != request.user:
+    if booking.customer_id != request.user.pk:
         messages.error(request, "You don't have permission to remove this item.")
         return redirect('my_bookings')
     
-    if booking.status != 'pending':
+    if not booking.is_editable:
         messages.error(request, "This booking cannot be modified.")
         return redirect('my_bookings')
     
-    item.delete()
-    
-    # Recalculate total
-    total = sum(i.subtotal for i in BookingItem.objects.filter(booking=booking))
-    booking.total_amount = total
-    booking.save()
+    # Subtracts the item's subtotal from the booking total
+    try:
+        removed = remove_item(item)
+    except ValidationError as e:
+        messages.error(request, e.messages[0])
+        return redirect('my_bookings')
     
-    messages.success(request, "Item removed from booking.")
+    if removed:
+        messages.success(request, "Item removed from booking.")
+    else:
+        messages.info(request, "This item was already removed.")
     return redirect('select_menu', booking_id=booking.id)
 
 
+@login_required
+@require_http_methods(["POST"])
+def select_menu_batch(request, booking_id):
+    """
+    JSON endpoint to apply many menu selections in one request.
+    Body: {"mode": "add" | "set", "items": [{"menu_item_id": 1, "quantity": 2}, ...]}
+    """
+    booking = get_object_or_404(Booking, id=booking_id, customer=request.user)
+    
+    try:
+        payload = json.loads(request.body or b'{}')
+        mode = payload.get('mode', MODE_ADD)
+        pairs = [(entry['menu_item_id'], entry.get('quantity', 1)) for entry in payload['items']]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return JsonResponse({'error': 'Invalid request body.'}, status=400)
+    
+    try:
+        apply_selection(booking, pairs, mode=mode)
+    except ValidationError as e:
+        return JsonResponse({'error': e.messages[0]}, status=400)
+    
+    items = BookingItem.objects.filter(booking=booking).values(
+        'id', 'menu_item_id', 'quantity', 'unit_price', 'subtotal'
+    )
+    
+    return JsonResponse({
+        'booking_id': booking.id,
+        'total_amount': str(booking.total_amount),
+        'items': [
+            {
+                'id': item['id'],
+                'menu_item_id': item['menu_item_id'],
+                'quantity': item['quantity'],
+                'unit_price': str(item['unit_price']),
+                'subtotal': str(item['subtotal']),
+            }
+            for item in items
+        ],
+    })
+
+
 @login_required
 def confirm_booking(request, booking_id):
     """
@@ -242,7 +395,7 @@ def confirm_booking(request, booking_id):
     """
     booking = get_object_or_404(Booking, id=booking_id, customer=request.user)
     
-    if booking.status != 'pending':
+    if not booking.is_editable:
         messages.error(request, "This booking cannot be confirmed.")
         return redirect('my_bookings')
     
@@ -251,22 +404,24 @@ def confirm_booking(request, booking_id):
         messages.error(request, "Please select at least one menu item.")
         return redirect('select_menu', booking_id=booking.id)
     
-    # Calculate total based on number of guests
-    # This is a simple calculation - can be customized
-    total = booking.total_amount * booking.number_of_guests
-    booking.total_amount = total
-    booking.save()
+    # Multiplies the per-person total by the number of guests, exactly once
+    try:
+        place_booking(booking)
+    except ValidationError as e:
+        messages.error(request, e.messages[0])
+        return redirect('my_bookings')
     
     messages.success(request, "Booking confirmed successfully!")
     return redirect('booking_confirmation', booking_id=booking.id)
 
 
+@query_budget(4)
 @login_required
 def booking_confirmation(request, booking_id):
     """
     View to display booking confirmation.
     """
-    booking = get_object_or_404(Booking, id=booking_id, customer=request.user)
+    booking = get_object_or_404(Booking.objects.select_related('caterer'), id=booking_id, customer=request.user)
     items = BookingItem.objects.filter(booking=booking).select_related('menu_item')
     
     context = {
@@ -277,26 +432,26 @@ def booking_confirmation(request, booking_id):
     return render(request, 'catering/booking_confirmation.html', context)
 
 
-@login_required
+@query_budget(8)
+@role_required('customer')
 def my_bookings(request):
     """
     View to display customer's bookings.
     """
-    if not request.user.is_customer:
-        messages.error(request, "Access denied.")
-        return redirect('home')
-    
     bookings = Booking.objects.filter(
         customer=request.user
-    ).select_related('caterer').prefetch_related('items')
+    ).select_related('caterer', 'review').prefetch_related('items')
     
     # Filter by status
     status_filter = request.GET.get('status')
     if status_filter:
         bookings = bookings.filter(status=status_filter)
     
+    page = paginate_queryset(request, bookings)
+    
     context = {
-        'bookings': bookings,
+        'bookings': page,
+        'page': page,
         'status_filter': status_filter,
     }
     
@@ -305,68 +460,41 @@ def my_bookings(request):
 
 # ==================== CATERER VIEWS ====================
 
-@login_required
+@query_budget(12)
+@role_required('caterer', "Access denied. Only caterers can access this page.")
 def caterer_dashboard(request):
     """
     Dashboard view for caterers.
     Displays booking statistics and recent orders.
     """
-    if not request.user.is_caterer:
-        messages.error(request, "Access denied. Only caterers can access this page.")
-        return redirect('home')
-    
-    try:
-        caterer_profile = request.user.caterer_profile
-    except CatererProfile.DoesNotExist:
-        messages.error(request, "Please complete your caterer profile first.")
-        return redirect('caterer_profile_edit')
-    
-    # Get all bookings for this caterer
-    bookings = Booking.objects.filter(
-        caterer=caterer_profile
-    ).select_related('customer')
-    
-    # Statistics
-    pending_bookings = bookings.filter(status='pending').count()
-    confirmed_bookings = bookings.filter(status='confirmed').count()
-    completed_bookings = bookings.filter(status='completed').count()
-    total_revenue = bookings.filter(status='completed').aggregate(
-        total=Sum('total_amount')
-    )['total'] or 0
+    # Statistics (materialized CatererStats row or one aggregate query)
+    stats = get_caterer_stats(request.caterer_profile_id)
     
     # Recent bookings
-    recent_bookings = bookings.order_by('-created_at')[:10]
+    recent_bookings = Booking.objects.filter(
+        caterer_id=request.caterer_profile_id
+    ).select_related('customer').order_by('-created_at')[:10]
     
     context = {
-        'caterer_profile': caterer_profile,
-        'bookings': bookings,
-        'pending_bookings': pending_bookings,
-        'confirmed_bookings': confirmed_bookings,
-        'completed_bookings': completed_bookings,
-        'total_revenue': total_revenue,
+        'pending_bookings': stats['pending_count'],
+        'confirmed_bookings': stats['confirmed_count'],
+        'completed_bookings': stats['completed_count'],
+        'total_revenue': stats['total_revenue'],
         'recent_bookings': recent_bookings,
     }
     
     return render(request, 'catering/caterer_dashboard.html', context)
 
 
-@login_required
+@query_budget(8)
+@role_required('caterer')
 def caterer_menu(request):
     """
     View to manage menu items for caterers.
     """
-    if not request.user.is_caterer:
-        messages.error(request, "Access denied.")
-        return redirect('home')
-    
-    try:
-        caterer_profile = request.user.caterer_profile
-    except CatererProfile.DoesNotExist:
-        return redirect('caterer_profile_edit')
-    
     menu_items = MenuItem.objects.filter(
-        caterer=caterer_profile
-    ).select_related('category').order_by('-created_at')
+        caterer_id=request.caterer_profile_id
+    ).select_related('category')
     
     # Filter by availability
     availability_filter = request.GET.get('availability')
@@ -375,34 +503,27 @@ def caterer_menu(request):
     elif availability_filter == 'unavailable':
         menu_items = menu_items.filter(is_available=False)
     
+    page = paginate_queryset(request, menu_items)
+    
     context = {
-        'menu_items': menu_items,
-        'caterer_profile': caterer_profile,
+        'menu_items': page,
+        'page': page,
         'availability_filter': availability_filter,
     }
     
     return render(request, 'catering/caterer_menu.html', context)
 
 
-@login_required
+@role_required('caterer')
 def add_menu_item(request):
     """
     View to add a new menu item.
     """
-    if not request.user.is_caterer:
-        messages.error(request, "Access denied.")
-        return redirect('home')
-    
-    try:
-        caterer_profile = request.user.caterer_profile
-    except CatererProfile.DoesNotExist:
-        return redirect('caterer_profile_edit')
-    
     if request.method == 'POST':
         form = MenuItemForm(request.POST, request.FILES)
         if form.is_valid():
             menu_item = form.save(commit=False)
-            menu_item.caterer = caterer_profile
+            menu_item.caterer_id = request.caterer_profile_id
             menu_item.save()
             messages.success(request, f"Menu item '{menu_item.name}' added successfully!")
             return redirect('caterer_menu')
@@ -411,25 +532,20 @@ def add_menu_item(request):
     
     context = {
         'form': form,
-        'caterer_profile': caterer_profile,
     }
     
     return render(request, 'catering/add_menu_item.html', context)
 
 
-@login_required
+@role_required('caterer')
 def edit_menu_item(request, item_id):
     """
     View to edit a menu item.
     """
-    if not request.user.is_caterer:
-        messages.error(request, "Access denied.")
-        return redirect('home')
-    
     menu_item = get_object_or_404(MenuItem, id=item_id)
     
     # Verify ownership
-    if menu_item.caterer != request.user.caterer_profile:
+    if not owns(request, menu_item):
         messages.error(request, "You don't have permission to edit this item.")
         return redirect('caterer_menu')
     
@@ -450,19 +566,15 @@ def edit_menu_item(request, item_id):
     return render(request, 'catering/edit_menu_item.html', context)
 
 
-@login_required
+@role_required('caterer')
 def delete_menu_item(request, item_id):
     """
     View to delete a menu item.
     """
-    if not request.user.is_caterer:
-        messages.error(request, "Access denied.")
-        return redirect('home')
-    
     menu_item = get_object_or_404(MenuItem, id=item_id)
     
     # Verify ownership
-    if menu_item.caterer != request.user.caterer_profile:
+    if not owns(request, menu_item):
         messages.error(request, "You don't have permission to delete this item.")
         return redirect('caterer_menu')
     
@@ -474,29 +586,60 @@ def delete_menu_item(request, item_id):
     return render(request, 'catering/delete_menu_item.html', {'menu_item': menu_item})
 
 
-@login_required
+@role_required('caterer')
+def import_menu_items(request):
+    """
+    View to bulk import menu items from a CSV or JSON Lines file.
+    """
+    result = None
+    if request.method == 'POST':
+        form = MenuImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            caterer_profile = CatererProfile.objects.get(id=request.caterer_profile_id)
+            result = import_menu(caterer_profile, form.cleaned_data['file'], form.cleaned_data['format'])
+            if result.failed:
+                messages.warning(
+                    request,
+                    f"Imported {result.created + result.updated} items; {result.failed} rows had errors."
+                )
+            else:
+                messages.success(request, f"Imported {result.created + result.updated} items.")
+    else:
+        form = MenuImportForm()
+    
+    context = {
+        'form': form,
+        'result': result,
+        'export_fields': EXPORT_FIELDS,
+    }
+    
+    return render(request, 'catering/import_menu.html', context)
+
+
+@role_required('caterer')
+def export_menu_items(request):
+    """
+    View to download the caterer's menu as CSV or JSON Lines (?format=jsonl).
+    """
+    caterer_profile = CatererProfile.objects.get(id=request.caterer_profile_id)
+    return export_menu_response(caterer_profile, request.GET.get('format', 'csv'))
+
+
+@role_required('caterer')
 def manage_categories(request):
     """
     View to manage menu categories.
     """
-    if not request.user.is_caterer:
-        messages.error(request, "Access denied.")
-        return redirect('home')
-    
     categories = MenuCategory.objects.all()
     
     return render(request, 'catering/manage_categories.html', {'categories': categories})
 
 
-@login_required
+@role_required('caterer')
 def add_category(request):
     """
     View to add a new category.
     """
-    if not request.user.is_caterer:
-        messages.error(request, "Access denied.")
-        return redirect('home')
-    
     if request.method == 'POST':
         form = MenuCategoryForm(request.POST)
         if form.is_valid():
@@ -509,22 +652,14 @@ def add_category(request):
     return render(request, 'catering/add_category.html', {'form': form})
 
 
-@login_required
+@query_budget(8)
+@role_required('caterer')
 def catering_bookings(request):
     """
     View to manage bookings for caterers.
     """
-    if not request.user.is_caterer:
-        messages.error(request, "Access denied.")
-        return redirect('home')
-    
-    try:
-        caterer_profile = request.user.caterer_profile
-    except CatererProfile.DoesNotExist:
-        return redirect('caterer_profile_edit')
-    
     bookings = Booking.objects.filter(
-        caterer=caterer_profile
+        caterer_id=request.caterer_profile_id
     ).select_related('customer').prefetch_related('items')
     
     # Filter by status
@@ -532,8 +667,11 @@ def catering_bookings(request):
     if status_filter:
         bookings = bookings.filter(status=status_filter)
     
+    page = paginate_queryset(request, bookings)
+    
     context = {
-        'bookings': bookings,
+        'bookings': page,
+        'page': page,
         'status_filter': status_filter,
     }
     
@@ -541,39 +679,73 @@ def catering_bookings(request):
 
 
 @login_required
+def export_bookings(request):
+    """
+    Stream bookings and their items as CSV.
+    Caterers export their own bookings; admins may pick a caterer or export all.
+    Accepts status and start/end event dates.
+    """
+    if request.user.is_admin_user():
+        caterer_id = request.GET.get('caterer')
+        caterer_id = int(caterer_id) if caterer_id and caterer_id.isdigit() else None
+    elif request.user.is_caterer():
+        caterer_id = caterer_profile_id(request)
+        if caterer_id is None:
+            return redirect('caterer_profile_edit')
+    else:
+        messages.error(request, "Access denied.")
+        return redirect('home')
+    
+    status = request.GET.get('status')
+    if status not in dict(Booking.STATUS_CHOICES):
+        status = None
+    try:
+        start = parse_date(request.GET.get('start') or '')
+        end = parse_date(request.GET.get('end') or '')
+    except ValueError:
+        messages.error(request, "Invalid date range.")
+        return redirect('admin_dashboard' if request.user.is_admin_user() else 'catering_bookings')
+    
+    bookings = export_bookings_queryset(caterer_id=caterer_id, status=status, start=start, end=end)
+    # Rows stream after the request's routing has ended, so fix the database now
+    bookings = bookings.using(router.db_for_read(Booking))
+    filename = f"bookings-{caterer_id or 'all'}-{timezone.localdate():%Y%m%d}.csv"
+    return bookings_export_response(bookings, filename)
+
+
+@role_required('caterer')
 def update_booking_status(request, booking_id):
     """
     View to update booking status.
     """
-    if not request.user.is_caterer:
-        messages.error(request, "Access denied.")
-        return redirect('home')
-    
     booking = get_object_or_404(Booking, id=booking_id)
     
     # Verify ownership
-    if booking.caterer != request.user.caterer_profile:
+    if not owns(request, booking):
         messages.error(request, "You don't have permission to update this booking.")
         return redirect('catering_bookings')
     
+    if not transitions_from(booking.status, CATERER):
+        messages.error(request, f"A {booking.get_status_display().lower()} booking can't be changed.")
+        return redirect('booking_detail', booking_id=booking.id)
+    
     if request.method == 'POST':
-        form = BookingStatusForm(request.POST, instance=booking)
+        form = BookingStatusForm(request.POST, booking=booking)
         if form.is_valid():
-            booking = form.save()
+            try:
+                change_status(booking, form.cleaned_data['status'], CATERER, version=form.cleaned_data['version'])
+            except ValidationError as e:
+                messages.error(request, e.messages[0])
+                return redirect('booking_detail', booking_id=booking.id)
             
-            # Update caterer total bookings if confirmed or completed
+            # Recount caterer total bookings off the request path
             if booking.status in ['confirmed', 'completed']:
-                caterer = request.user.caterer_profile
-                caterer.total_bookings = Booking.objects.filter(
-                    caterer=caterer,
-                    status__in=['confirmed', 'completed']
-                ).count()
-                caterer.save()
+                recount_total_bookings.enqueue(caterer_id=booking.caterer_id)
             
             messages.success(request, f"Booking status updated to {booking.get_status_display()}!")
             return redirect('catering_bookings')
     else:
-        form = BookingStatusForm(instance=booking)
+        form = BookingStatusForm(booking=booking)
     
     context = {
         'form': form,
@@ -583,19 +755,17 @@ def update_booking_status(request, booking_id):
     return render(request, 'catering/update_booking_status.html', context)
 
 
+# 4 queries; a caterer's first request also stores the profile id in the session
+@query_budget(8)
 @login_required
 def booking_detail(request, booking_id):
     """
     View to display booking details.
     """
-    booking = get_object_or_404(Booking, id=booking_id)
+    booking = get_object_or_404(Booking.objects.select_related('customer', 'caterer'), id=booking_id)
     
-    # Check permission
-    if not (
-        request.user.is_admin_user or
-        (request.user.is_customer and booking.customer == request.user) or
-        (request.user.is_caterer and booking.caterer == request.user.caterer_profile)
-    ):
+    # Check permission by foreign key ids, without loading the related rows
+    if not can_view_booking(request, booking):
         messages.error(request, "You don't have permission to view this booking.")
         return redirect('home')
     
@@ -616,13 +786,16 @@ def cancel_booking(request, booking_id):
     """
     booking = get_object_or_404(Booking, id=booking_id, customer=request.user)
     
-    if booking.status != 'pending':
+    if not can_change_status(booking, 'cancelled', CUSTOMER):
         messages.error(request, "Only pending bookings can be cancelled.")
         return redirect('my_bookings')
     
     if request.method == 'POST':
-        booking.status = 'cancelled'
-        booking.save()
+        try:
+            change_status(booking, 'cancelled', CUSTOMER, version=request.POST.get('version'))
+        except ValidationError as e:
+            messages.error(request, e.messages[0])
+            return redirect('booking_detail', booking_id=booking.id)
         messages.success(request, "Booking cancelled successfully!")
         return redirect('my_bookings')
     
@@ -653,15 +826,9 @@ def submit_review(request, booking_id):
             review.booking = booking
             review.customer = request.user
             review.caterer = booking.caterer
+            # Caterer rating totals are updated by a signal with F() expressions
             review.save()
             
-            # Update caterer rating
-            avg_rating = Review.objects.filter(
-                caterer=booking.caterer
-            ).aggregate(Avg('rating'))['rating__avg']
-            booking.caterer.rating = avg_rating or 0
-            booking.caterer.save()
-            
             messages.success(request, "Thank you for your review!")
             return redirect('my_bookings')
     else:
@@ -677,40 +844,54 @@ def submit_review(request, booking_id):
 
 # ==================== ADMIN VIEWS ====================
 
-@login_required
+# Default and maximum span of dashboard trend charts
+TREND_DEFAULT_DAYS = 30
+TREND_MAX_DAYS = 366
+
+
+def _trend_range(request):
+    """
+    Return the (start, end) dates requested for trend data.
+    Raises ValueError for well-formed but impossible dates (2024-02-30).
+    """
+    end = parse_date(request.GET.get('end') or '') or timezone.localdate()
+    start = parse_date(request.GET.get('start') or '') or end - timedelta(days=TREND_DEFAULT_DAYS - 1)
+    if start > end:
+        start, end = end, start
+    return max(start, end - timedelta(days=TREND_MAX_DAYS - 1)), end
+
+
+@query_budget(10)
+@role_required('admin')
 def admin_dashboard(request):
     """
     Admin dashboard with statistics.
     """
-    if not request.user.is_admin_user:
-        messages.error(request, "Access denied.")
-        return redirect('home')
-    
-    # Statistics
-    total_users = User.objects.count()
-    total_customers = User.objects.filter(role='customer').count()
-    total_caterers = CatererProfile.objects.count()
-    total_bookings = Booking.objects.count()
-    
-    # Revenue from completed bookings
-    total_revenue = Booking.objects.filter(
-        status='completed'
-    ).aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+    # Statistics from the daily rollup tables
+    totals = platform_totals()
     
     # Recent bookings
-    recent_bookings = Booking.objects.order_by('-created_at')[:10]
+    recent_bookings = Booking.objects.select_related(
+        'customer', 'caterer'
+    ).order_by('-created_at')[:10]
     
-    # Bookings by status
-    bookings_by_status = Booking.objects.values('status').annotate(count=Count('id'))
+    try:
+        start, end = _trend_range(request)
+    except ValueError:
+        messages.error(request, "Invalid date range.")
+        return redirect('admin_dashboard')
     
     context = {
-        'total_users': total_users,
-        'total_customers': total_customers,
-        'total_caterers': total_caterers,
-        'total_bookings': total_bookings,
-        'total_revenue': total_revenue,
+        'total_users': totals['total_users'],
+        'total_customers': totals['total_customers'],
+        'total_caterers': get_home_data()['total_caterers'],
+        'total_bookings': totals['total_bookings'],
+        'total_revenue': totals['total_revenue'],
         'recent_bookings': recent_bookings,
-        'bookings_by_status': bookings_by_status,
+        'bookings_by_status': bookings_by_status(),
+        'trend': daily_trend(start, end),
+        'trend_start': start,
+        'trend_end': end,
     }
     
     return render(request, 'catering/admin_dashboard.html', context)
@@ -724,3 +905,36 @@ def about(request):
 def contact(request):
     """Contact page view."""
     return render(request, 'catering/contact.html')
+
+
+@login_required
+def admin_dashboard_trends(request):
+    """
+    JSON trend data for the admin dashboard charts.
+    Accepts start/end dates and an optional caterer id.
+    """
+    if not has_role(request.user, 'admin'):
+        return JsonResponse({'error': 'Access denied.'}, status=403)
+    
+    try:
+        start, end = _trend_range(request)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid date range.'}, status=400)
+    caterer_id = request.GET.get('caterer')
+    
+    trend = daily_trend(start, end, caterer_id=int(caterer_id) if caterer_id and caterer_id.isdigit() else None)
+    
+    return JsonResponse({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'days': [
+            {
+                'day': row['day'].isoformat(),
+                'bookings': row['bookings'],
+                'revenue': str(row['revenue']),
+                'new_users': row['new_users'],
+                'by_status': row['by_status'],
+            }
+            for row in trend
+        ],
+    })
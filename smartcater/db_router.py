@@ -0,0 +1,79 @@
+"""
+Read-replica database routing for SmartCater.
+Reads made while handling a safe (GET/HEAD) request go to a read replica;
+everything else, and every write, goes to the primary ('default').
+"""
+
+import contextlib
+import contextvars
+import random
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# Routing state of the request being handled (see ReplicaRoutingMiddleware)
+_state = contextvars.ContextVar('smartcater_db_routing', default=None)
+
+
+class _RoutingState:
+    
+    def __init__(self, replica):
+        # Replica alias for this request's reads, or None for the primary
+        self.replica = replica
+        self.wrote = False
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+@contextlib.contextmanager
+def routing(use_replica):
+    """
+    Route reads inside the block to one replica (picked once, so a request
+    sees a single consistent snapshot) or to the primary.
+    Yields the state; state.wrote tells whether anything was written.
+    """
+    replicas = get_replicas()
+    state = _RoutingState(random.choice(replicas) if use_replica and replicas else None)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Sends reads to the current request's replica, unless the request has
+    written something or a transaction is open on the primary, so a
+    request always reads its own writes. Outside a request (commands,
+    job workers) reads use the primary.
+    """
+    
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.replica is None or state.wrote:
+            # None lets Django keep related lookups on the instance's database
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return state.replica
+    
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication
+        if db in get_replicas():
+            return False
+        return None
@@ -0,0 +1,56 @@
+"""
+Environment variable helpers for SmartCater settings.
+Values come from the process environment, falling back to a .env file
+in the project root (loaded with python-dotenv, never overriding).
+"""
+
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+TRUE_VALUES = {'1', 'true', 'yes', 'on'}
+FALSE_VALUES = {'0', 'false', 'no', 'off', ''}
+
+load_dotenv(BASE_DIR / '.env', override=False)
+
+
+class ImproperEnvironment(ValueError):
+    """Raised when an environment variable can't be parsed."""
+
+
+def env(name, default=None):
+    """Return the variable as a string, or default when unset."""
+    return os.environ.get(name, default)
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    value = value.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ImproperEnvironment(f"{name} must be a boolean (1/0, true/false), got {value!r}")
+
+
+def env_int(name, default=None):
+    value = os.environ.get(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperEnvironment(f"{name} must be an integer, got {value!r}")
+
+
+def env_list(name, default=()):
+    """Return a comma-separated variable as a list of non-empty strings."""
+    value = os.environ.get(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
@@ -0,0 +1,238 @@
+"""
+In-process metrics for SmartCater.
+Per-view histograms of query count, DB time, template time and wall time,
+exposed in the Prometheus text format.
+"""
+
+import hmac
+import math
+import threading
+from bisect import bisect_left
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+
+# Histogram bucket upper bounds
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250)
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets, per label value.
+    """
+    
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # label -> [bucket counts..., +Inf count], sum
+        self._counts = {}
+        self._sums = {}
+    
+    def observe(self, label, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(label)
+            if counts is None:
+                counts = self._counts[label] = [0] * (len(self.buckets) + 1)
+                self._sums[label] = 0.0
+            counts[index] += 1
+            self._sums[label] += value
+    
+    def snapshot(self):
+        """Return {label: (cumulative bucket counts, count, sum)}."""
+        with self._lock:
+            data = {label: (list(counts), self._sums[label]) for label, counts in self._counts.items()}
+        result = {}
+        for label, (counts, total) in data.items():
+            cumulative = []
+            running = 0
+            for count in counts:
+                running += count
+                cumulative.append(running)
+            result[label] = (cumulative, running, total)
+        return result
+    
+    def quantile(self, label, q):
+        """Estimate a quantile for label from the bucket counts."""
+        snapshot = self.snapshot().get(label)
+        if snapshot is None:
+            return None
+        cumulative, count, _ = snapshot
+        rank = q * count
+        for bound, running in zip(self.buckets + (math.inf,), cumulative):
+            if running >= rank:
+                return bound
+        return math.inf
+    
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+
+class Counter:
+    """
+    Monotonic counter per label value.
+    """
+    
+    def __init__(self, name, help_text, label_name='view'):
+        self.name = name
+        self.help_text = help_text
+        self.label_name = label_name
+        self._lock = threading.Lock()
+        self._values = {}
+    
+    def inc(self, label, amount=1):
+        with self._lock:
+            self._values[label] = self._values.get(label, 0) + amount
+    
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+    
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+view_queries = Histogram(
+    'smartcater_view_queries', 'SQL queries executed per request.', QUERY_COUNT_BUCKETS
+)
+view_db_seconds = Histogram(
+    'smartcater_view_db_seconds', 'Time spent in the database per request.', SECONDS_BUCKETS
+)
+view_template_seconds = Histogram(
+    'smartcater_view_template_seconds', 'Time spent rendering templates per request.', SECONDS_BUCKETS
+)
+view_duration_seconds = Histogram(
+    'smartcater_view_duration_seconds', 'Wall time per request.', SECONDS_BUCKETS
+)
+budget_exceeded = Counter(
+    'smartcater_view_query_budget_exceeded_total', 'Requests that ran more queries than the view budget.'
+)
+db_connections_opened = Counter(
+    'smartcater_db_connections_opened_total', 'Database connections opened, by alias.', 'alias'
+)
+db_connections_reused = Counter(
+    'smartcater_db_connections_reused_total',
+    'Requests that started with an already open (persistent) connection, by alias.',
+    'alias'
+)
+
+HISTOGRAMS = (view_queries, view_db_seconds, view_template_seconds, view_duration_seconds)
+COUNTERS = (budget_exceeded, db_connections_opened, db_connections_reused)
+
+# Extra collectors: callables returning [(name, help, type, {label: value})]
+_collectors = []
+
+
+def register_collector(collector):
+    """Add a callable contributing extra metrics to the text exposition."""
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+def query_budget(max_queries):
+    """
+    Declare the maximum number of SQL queries a view may run.
+    Overridden by settings.VIEW_QUERY_BUDGETS[url_name] when present.
+    """
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def get_query_budget(resolver_match):
+    """Return the query budget for a resolved view, or None."""
+    if resolver_match is None:
+        return None
+    budgets = getattr(settings, 'VIEW_QUERY_BUDGETS', {})
+    if resolver_match.view_name in budgets:
+        return budgets[resolver_match.view_name]
+    return getattr(resolver_match.func, 'query_budget', None)
+
+
+def record_request(view_name, queries, db_seconds, template_seconds, duration_seconds):
+    """Record one request's measurements."""
+    view_queries.observe(view_name, queries)
+    view_db_seconds.observe(view_name, db_seconds)
+    view_template_seconds.observe(view_name, template_seconds)
+    view_duration_seconds.observe(view_name, duration_seconds)
+
+
+def reset():
+    """Clear all recorded metrics."""
+    for metric in HISTOGRAMS + COUNTERS:
+        metric.reset()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == math.inf else repr(float(bound))
+
+
+def render_text():
+    """Return all metrics in the Prometheus text exposition format."""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.append(f'# HELP {histogram.name} {histogram.help_text}')
+        lines.append(f'# TYPE {histogram.name} histogram')
+        for label, (cumulative, count, total) in sorted(histogram.snapshot().items()):
+            view = _escape(label)
+            for bound, running in zip(histogram.buckets + (math.inf,), cumulative):
+                lines.append(f'{histogram.name}_bucket{{view="{view}",le="{_format_bound(bound)}"}} {running}')
+            lines.append(f'{histogram.name}_sum{{view="{view}"}} {total}')
+            lines.append(f'{histogram.name}_count{{view="{view}"}} {count}')
+    
+    for counter in COUNTERS:
+        lines.append(f'# HELP {counter.name} {counter.help_text}')
+        lines.append(f'# TYPE {counter.name} counter')
+        for label, value in sorted(counter.snapshot().items()):
+            lines.append(f'{counter.name}{{{counter.label_name}="{_escape(label)}"}} {value}')
+    
+    for collector in _collectors:
+        for name, help_text, metric_type, values in collector():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            for label, value in sorted(values.items()):
+                if label is None:
+                    lines.append(f'{name} {value}')
+                else:
+                    key, label_value = label
+                    lines.append(f'{name}{{{key}="{_escape(label_value)}"}} {value}')
+    
+    return '\n'.join(lines) + '\n'
+
+
+def _has_metrics_token(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        return False
+    scheme, _, value = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(value.strip().encode(), token.encode())
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint.
+    Open in DEBUG; otherwise limited to staff users, METRICS_TOKEN
+    bearers and METRICS_ALLOWED_IPS.
+    """
+    allowed_ips = getattr(settings, 'METRICS_ALLOWED_IPS', ())
+    user = getattr(request, 'user', None)
+    if not (
+        settings.DEBUG or
+        _has_metrics_token(request) or
+        request.META.get('REMOTE_ADDR') in allowed_ips or
+        (user is not None and user.is_staff)
+    ):
+        return HttpResponseForbidden('Forbidden')
+    
+    return HttpResponse(render_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,220 @@
+"""
+Middleware for SmartCater.
+InstrumentationMiddleware measures SQL queries, DB time, template render
+time (with METRICS_TEMPLATE_TIMING) and wall time per view and enforces
+optional per-view query budgets.
+ReplicaRoutingMiddleware sends reads of safe requests to read replicas.
+"""
+
+import contextvars
+import logging
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import Template as DjangoTemplate
+from . import metrics
+from .db_router import get_replicas, routing
+
+
+logger = logging.getLogger(__name__)
+
+# Measurement for the request being handled. A context variable (rather than
+# a thread local) follows async views into the threads that run their ORM calls.
+_current = contextvars.ContextVar('smartcater_measurement', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a view runs more queries than its budget."""
+
+
+class _Measurement:
+    """Accumulates timings for one request."""
+    
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    """Database execute_wrapper installed on every connection."""
+    measurement = _current.get()
+    if measurement is None:
+        return execute(sql, params, many, context)
+    
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        measurement.db_seconds += time.perf_counter() - start
+        measurement.queries += 1
+
+
+def _install_wrapper(connection):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _install_wrapper(connection)
+    metrics.db_connections_opened.inc(connection.alias)
+
+
+connection_created.connect(_on_connection_created, dispatch_uid='smartcater_instrumentation')
+
+
+_original_render = DjangoTemplate.render
+
+
+def _timed_render(self, context=None, request=None):
+    measurement = _current.get()
+    if measurement is None:
+        return _original_render(self, context, request)
+    
+    # Only time the outermost render; nested renders are included in it
+    measurement.template_depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        measurement.template_depth -= 1
+        if measurement.template_depth == 0:
+            measurement.template_seconds += time.perf_counter() - start
+
+
+def install_template_timing():
+    """
+    Wrap Django's template backend so renders count towards template time.
+    Called by InstrumentationMiddleware when METRICS_TEMPLATE_TIMING is on.
+    """
+    DjangoTemplate.render = _timed_render
+
+
+class InstrumentationMiddleware:
+    """
+    Records per-view metrics in smartcater.metrics.
+    Views are labelled by URL name (namespace:name), or 'unresolved'.
+    Works under both WSGI and ASGI.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        if getattr(settings, 'METRICS_TEMPLATE_TIMING', False):
+            install_template_timing()
+    
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        
+        # Connections opened before this module loaded miss connection_created
+        for connection in connections.all():
+            _install_wrapper(connection)
+            if connection.connection is not None:
+                # Kept open by CONN_MAX_AGE; health checks run on its first query
+                metrics.db_connections_reused.inc(connection.alias)
+        
+        measurement = _Measurement()
+        token = _current.set(measurement)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        
+        self._finish(request, measurement, time.perf_counter() - start)
+        return response
+    
+    async def __acall__(self, request):
+        measurement = _Measurement()
+        token = _current.set(measurement)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        
+        self._finish(request, measurement, time.perf_counter() - start)
+        return response
+    
+    def _finish(self, request, measurement, duration):
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = (resolver_match.view_name if resolver_match else None) or 'unresolved'
+        
+        metrics.record_request(
+            view_name,
+            measurement.queries,
+            measurement.db_seconds,
+            measurement.template_seconds,
+            duration
+        )
+        self._check_budget(request, resolver_match, view_name, measurement.queries)
+    
+    def _check_budget(self, request, resolver_match, view_name, queries):
+        budget = metrics.get_query_budget(resolver_match)
+        if budget is None or queries <= budget:
+            return
+        
+        metrics.budget_exceeded.inc(view_name)
+        message = f"{view_name} ran {queries} queries (budget {budget}) for {request.path}"
+        if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets GET/HEAD requests read from a replica (smartcater.db_router).
+    After a request writes, the client is pinned to the primary for
+    REPLICA_STICKY_SECONDS with a cookie, so it reads its own writes
+    (e.g. a new booking or review) even while the replicas lag behind.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+    
+    def _use_replica(self, request):
+        return (
+            bool(get_replicas())
+            and request.method in ('GET', 'HEAD')
+            and settings.REPLICA_PIN_COOKIE not in request.COOKIES
+        )
+    
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        
+        with routing(self._use_replica(request)) as state:
+            response = self.get_response(request)
+        return self._finish(response, state)
+    
+    async def __acall__(self, request):
+        with routing(self._use_replica(request)) as state:
+            response = await self.get_response(request)
+        return self._finish(response, state)
+    
+    def _finish(self, response, state):
+        if state.wrote and get_replicas():
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
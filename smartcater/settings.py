@@ -1,21 +1,32 @@
 """
 Django settings for SmartCater project.
 Catering Management System - Production Ready Configuration
+Deployment-specific values come from the environment or a .env file
+(see .env.example and smartcater.env).
 """
 
-import os
 from pathlib import Path
+from .env import ImproperEnvironment, env, env_bool, env_int, env_list
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# development, test or production; selects the defaults below
+DJANGO_ENV = env('DJANGO_ENV', 'development')
+
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-smartcater-secret-key-change-in-production-2024'
+# The fallback and the .env.example placeholder are public, so they are
+# refused in production and wherever they would sign session data
+# (SESSION_STORE below)
+SECRET_KEY_FROM_ENV = env('DJANGO_SECRET_KEY', '') not in ('', 'change-me')
+SECRET_KEY = env('DJANGO_SECRET_KEY', 'django-insecure-smartcater-secret-key-change-in-production-2024')
+if DJANGO_ENV == 'production' and not SECRET_KEY_FROM_ENV:
+    raise ImproperEnvironment('DJANGO_SECRET_KEY must be set when DJANGO_ENV=production')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env_bool('DJANGO_DEBUG', DJANGO_ENV != 'production')
 
-ALLOWED_HOSTS = ['*']
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', ['*'])
 
 # Application definition
 INSTALLED_APPS = [
@@ -34,6 +45,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Per-view query/latency metrics (first, so it sees every query)
+    'smartcater.middleware.InstrumentationMiddleware',
+    # Reads of GET/HEAD requests go to DATABASE_REPLICAS (smartcater.db_router)
+    'smartcater.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,22 +78,126 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'smartcater.wsgi.application'
 
+# Database connection defaults per environment.
+# CONN_MAX_AGE: seconds a connection is kept open and reused across requests
+# (0 closes it after every request). CONN_HEALTH_CHECKS: ping a reused
+# connection before its first query in a request, reconnecting if it died.
+# POOL_SIZE: persistent connections one process may hold. Django keeps one
+# connection per thread, so size server threads and job workers with it.
+DATABASE_PROFILES = {
+    'development': {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True, 'POOL_SIZE': 4},
+    'test': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'POOL_SIZE': 2},
+    'production': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True, 'POOL_SIZE': 16},
+}
+_db_profile = DATABASE_PROFILES.get(DJANGO_ENV, DATABASE_PROFILES['development'])
+DATABASE_POOL_SIZE = env_int('DB_POOL_SIZE', _db_profile['POOL_SIZE'])
+
 # Database Configuration - MySQL
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.mysql',
-        'NAME': 'smartcater',
-        'USER': 'root',
-        'PASSWORD': '123456',
-        'HOST': '127.0.0.1',
-        'PORT': '3306',
+        'NAME': env('DB_NAME', 'smartcater'),
+        'USER': env('DB_USER', 'root'),
+        'PASSWORD': env('DB_PASSWORD', '123456'),
+        'HOST': env('DB_HOST', '127.0.0.1'),
+        'PORT': env('DB_PORT', '3306'),
+        'CONN_MAX_AGE': env_int('DB_CONN_MAX_AGE', _db_profile['CONN_MAX_AGE']),
+        'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', _db_profile['CONN_HEALTH_CHECKS']),
         'OPTIONS': {
             'charset': 'utf8mb4',
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+            'connect_timeout': env_int('DB_CONNECT_TIMEOUT', 5),
         },
     }
 }
 
+# Read replicas: comma-separated hosts of MySQL replicas of 'default'.
+# Each becomes a 'replicaN' alias; GET/HEAD requests read from one of them.
+DATABASE_REPLICAS = []
+for index, host in enumerate(env_list('DB_REPLICA_HOSTS'), start=1):
+    alias = f'replica{index}'
+    DATABASES[alias] = {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['smartcater.db_router.ReplicaRouter']
+# After a request writes, its client reads from the primary for this long
+REPLICA_STICKY_SECONDS = 10
+REPLICA_PIN_COOKIE = 'smartcater_primary'
+
+# Cache Configuration
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'smartcater-default',
+    }
+}
+
+# Session storage, chosen with SESSION_STORE:
+#   db              django_session table; a SELECT per authenticated request
+#                   and an UPDATE whenever the session changes
+#   cached_db       read from the 'sessions' cache, written through to the
+#                   database, which serves cache misses (evictions, restarts)
+#   cache           'sessions' cache only; evicted or flushed sessions log out
+#   signed_cookies  no server-side storage; the data travels in a cookie
+#                   signed (not encrypted) with SECRET_KEY
+#   file            one file per session under SESSION_FILE_PATH
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'file': 'django.contrib.sessions.backends.file',
+}
+SESSION_STORE = env('SESSION_STORE', 'db')
+if SESSION_STORE not in SESSION_ENGINES:
+    raise ImproperEnvironment(f"SESSION_STORE must be one of {', '.join(SESSION_ENGINES)}, got {SESSION_STORE!r}")
+if SESSION_STORE == 'signed_cookies' and not SECRET_KEY_FROM_ENV:
+    # Anyone with the public fallback key could sign a session for any user
+    raise ImproperEnvironment('SESSION_STORE=signed_cookies needs DJANGO_SECRET_KEY to be set')
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STORE]
+SESSION_FILE_PATH = env('SESSION_FILE_PATH') or None
+# Refresh the session expiry on every request (writes on every request)
+SESSION_SAVE_EVERY_REQUEST = env_bool('SESSION_SAVE_EVERY_REQUEST')
+
+# Cache behind the cache and cached_db stores. Every process that serves
+# requests must see the same cache: a session deleted on logout by one
+# process stays valid in any other process that still holds its own copy.
+#   locmem  private to one process; only for a single server process
+#   file    shared by the processes of one node (SESSION_CACHE_LOCATION)
+#   redis   shared between nodes (SESSION_CACHE_LOCATION is the redis:// URL,
+#           needs the redis package)
+SESSION_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+SESSION_CACHE = env('SESSION_CACHE', 'locmem')
+if SESSION_CACHE not in SESSION_CACHE_BACKENDS:
+    raise ImproperEnvironment(f"SESSION_CACHE must be one of {', '.join(SESSION_CACHE_BACKENDS)}, got {SESSION_CACHE!r}")
+# Server processes per node (gunicorn and uvicorn read the same variable)
+WEB_CONCURRENCY = env_int('WEB_CONCURRENCY', 1)
+if SESSION_STORE in ('cache', 'cached_db') and SESSION_CACHE == 'locmem' and WEB_CONCURRENCY > 1:
+    raise ImproperEnvironment(
+        f"SESSION_STORE={SESSION_STORE} with SESSION_CACHE=locmem keeps sessions per process, "
+        f"so logouts would not reach the other {WEB_CONCURRENCY - 1} processes; use SESSION_CACHE=file or redis"
+    )
+if SESSION_CACHE == 'redis' and not env('SESSION_CACHE_LOCATION'):
+    raise ImproperEnvironment('SESSION_CACHE=redis needs SESSION_CACHE_LOCATION (a redis:// URL)')
+SESSION_CACHE_ALIAS = 'sessions'
+CACHES[SESSION_CACHE_ALIAS] = {
+    'BACKEND': SESSION_CACHE_BACKENDS[SESSION_CACHE],
+    'LOCATION': {
+        'locmem': 'smartcater-sessions',
+        'file': env('SESSION_CACHE_LOCATION', str(BASE_DIR / 'var' / 'session_cache')),
+        'redis': env('SESSION_CACHE_LOCATION'),
+    }[SESSION_CACHE],
+}
+if SESSION_CACHE != 'redis':
+    # Sessions expire by themselves; culling at the default 300 entries
+    # would log users out (or, with cached_db, send them to the database).
+    # Redis expires keys itself and has no MAX_ENTRIES.
+    CACHES[SESSION_CACHE_ALIAS]['OPTIONS'] = {'MAX_ENTRIES': env_int('SESSION_CACHE_MAX_ENTRIES', 100000)}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -121,6 +240,42 @@ LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'home'
 LOGOUT_REDIRECT_URL = 'home'
 
+# Pagination Settings (keyset pagination in catering.pagination)
+CATERING_PAGE_SIZE = 20
+CATERING_MAX_PAGE_SIZE = 100
+
+# Conditional GET (catering.conditional): seconds shared caches such as a
+# reverse proxy may serve anonymous home/caterer pages before revalidating
+CATERING_PUBLIC_CACHE_SECONDS = 60
+
+# Serve caterer dashboard statistics from materialized CatererStats rows.
+# Rows only track changes while this is on: run recompute_caterer_stats
+# after turning it back on.
+CATERING_MATERIALIZED_STATS = True
+
+# Serve home, caterer list/detail and my bookings from catering.async_views.
+# Enable when running under ASGI (smartcater.asgi), e.g. with uvicorn or daphne.
+CATERING_ASYNC_VIEWS = env_bool('CATERING_ASYNC_VIEWS')
+if CATERING_ASYNC_VIEWS:
+    ROOT_URLCONF = 'smartcater.urls_async'
+    # Persistent connections aren't safe under ASGI: every request may run in a new thread
+    for database in DATABASES.values():
+        database['CONN_MAX_AGE'] = 0
+
+# Instrumentation (smartcater.middleware / smartcater.metrics)
+# Per-view query budgets by URL name; these override @query_budget declarations
+VIEW_QUERY_BUDGETS = {}
+# Raise instead of logging when a view exceeds its budget (enable in CI)
+QUERY_BUDGET_STRICT = env_bool('QUERY_BUDGET_STRICT')
+# Time template rendering per view (patches Django's template backend)
+METRICS_TEMPLATE_TIMING = env_bool('METRICS_TEMPLATE_TIMING')
+# Scrapers allowed to read /metrics/ when DEBUG is off, besides staff users:
+# clients sending "Authorization: Bearer <METRICS_TOKEN>", or these addresses.
+# None by default: behind a reverse proxy on the same host every request
+# comes from 127.0.0.1.
+METRICS_TOKEN = env('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = env_list('METRICS_ALLOWED_IPS')
+
 # Crispy Forms Settings
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
@@ -137,3 +292,21 @@ MESSAGE_TAGS = {
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
+
+# Image variants (catering.images): widths in pixels of the generated WebP/JPEG copies.
+# Variant names contain a content hash, so serve MEDIA_URL with long-lived
+# "Cache-Control: public, max-age=31536000, immutable" headers.
+IMAGE_VARIANT_WIDTHS = [160, 320, 640, 1280]
+
+# Background jobs (catering.jobs, run by `manage.py run_workers`)
+JOB_MAX_ATTEMPTS = 5
+# Retry backoff in seconds: base * 2 ** (attempt - 1), capped at the maximum
+JOB_RETRY_BASE_DELAY = 5
+JOB_RETRY_MAX_DELAY = 3600
+# Running jobs older than this are assumed lost and requeued. Slow jobs are
+# requeued too and run twice, so keep it above the longest job's runtime.
+JOB_LOCK_TIMEOUT = 600
+# Finished jobs are deleted by the workers after this many days
+JOB_RETENTION_DAYS = 7
+# Run jobs in-process on commit instead of queueing them (development only)
+JOBS_RUN_INLINE = env_bool('JOBS_RUN_INLINE')
@@ -0,0 +1,21 @@
+"""
+Settings for trying out read-replica routing locally.
+Two SQLite files stand in for the MySQL primary and its replica; run
+`manage.py sync_replica` to "replicate" the primary into the replica.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_primary.sqlite3',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+DATABASE_REPLICAS = ['replica']
@@ -7,11 +7,15 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from .metrics import metrics_view
 
 urlpatterns = [
     # Django Admin
     path('admin/', admin.site.urls),
     
+    # Prometheus metrics
+    path('metrics/', metrics_view, name='metrics'),
+    
     # Accounts App URLs
     path('accounts/', include('accounts.urls')),
     
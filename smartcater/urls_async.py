@@ -0,0 +1,19 @@
+"""
+Async URL Configuration for SmartCater Project.
+Used as ROOT_URLCONF when CATERING_ASYNC_VIEWS is enabled.
+"""
+
+from django.urls import path, include
+from .urls import urlpatterns as sync_urlpatterns
+
+
+def _is_catering(pattern):
+    urlconf = getattr(pattern, 'urlconf_name', None)
+    return getattr(urlconf, '__name__', None) == 'catering.urls'
+
+
+# Same routes as smartcater.urls with the catering app served by its async URLconf
+urlpatterns = [
+    path('', include('catering.urls_async')) if _is_catering(pattern) else pattern
+    for pattern in sync_urlpatterns
+]